@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+import pathlib
+import sys
+import time
+
+import numpy as np
+
+from blastsight.model.bvh import BVH
+from blastsight.model.intersections import Intersections
+from blastsight.model.parsers.dxfparser import DXFParser
+from blastsight.model.parsers.offparser import OFFParser
+
+"""
+In this benchmark, ray picking with brute force (testing every triangle)
+is compared against ray picking with a BVH, using the caseron mesh and
+synthetic terrain meshes with millions of triangles.
+The batched traversal (all rays at once) is also compared against the BVH loop.
+
+Usage: python benchmarks/bench_bvh.py [num_rays] [grid_side ...]
+"""
+
+
+def terrain(side: int) -> tuple:
+    # Regular grid of (side x side) cells with a wavy height, 2 * side^2 triangles
+    xx, yy = np.meshgrid(np.arange(side + 1.0), np.arange(side + 1.0))
+    zz = 10.0 * np.sin(xx / 50.0) * np.cos(yy / 70.0)
+    vertices = np.column_stack((xx.ravel(), yy.ravel(), zz.ravel())).astype(np.float32)
+
+    corners = (np.arange(side)[:, None] * (side + 1) + np.arange(side)).ravel()
+    indices = np.vstack([np.column_stack((corners, corners + 1, corners + side + 1)),
+                         np.column_stack((corners + 1, corners + side + 2, corners + side + 1))])
+
+    return vertices, indices.astype(np.uint32)
+
+
+def random_rays(vertices: np.ndarray, num_rays: int) -> tuple:
+    rng = np.random.default_rng(42)
+    lo, hi = vertices.min(axis=0), vertices.max(axis=0)
+    extent = (hi - lo).max()
+
+    targets = rng.uniform(lo, hi, (num_rays, 3))
+    origins = targets + rng.normal(size=(num_rays, 3)) * extent
+    return origins, targets - origins
+
+
+def bench(name: str, vertices: np.ndarray, indices: np.ndarray, num_rays: int) -> None:
+    origins, rays = random_rays(vertices, num_rays)
+
+    start = time.perf_counter()
+    bvh = BVH(vertices, indices)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [Intersections.ray_with_triangles(o, r, vertices[indices]) for o, r in zip(origins, rays)]
+    brute_time = (time.perf_counter() - start) / num_rays
+
+    start = time.perf_counter()
+    actual = [bvh.intersect_with_ray(o, r) for o, r in zip(origins, rays)]
+    bvh_time = (time.perf_counter() - start) / num_rays
+
+    start = time.perf_counter()
+    distances = bvh.intersect_with_rays(origins, rays)
+    batch_time = (time.perf_counter() - start) / num_rays
+
+    assert all(e.shape == a.shape and np.allclose(e, a) for e, a in zip(expected, actual))
+    assert all(np.isinf(t) if a.size == 0 else np.isclose(np.linalg.norm(a - o, axis=1).min(), t * np.linalg.norm(r))
+               for a, o, r, t in zip(actual, origins, rays, distances))
+
+    print(f'{name:>24} | {len(indices):>10} triangles | build: {build_time * 1e3:9.2f} ms | '
+          f'brute force: {brute_time * 1e3:9.3f} ms/ray | BVH: {bvh_time * 1e3:7.3f} ms/ray | '
+          f'batch: {batch_time * 1e3:7.3f} ms/ray | speedup: {brute_time / bvh_time:8.1f}x')
+
+
+if __name__ == '__main__':
+    num_rays = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    sides = list(map(int, sys.argv[2:])) or [100, 710, 1580]
+
+    test_files = f'{pathlib.Path(__file__).parent.parent}/test_files'
+
+    for parser, path in [(OFFParser, f'{test_files}/caseron.off'), (DXFParser, f'{test_files}/caseron.dxf')]:
+        info = parser.load_file(path)
+        bench(pathlib.Path(path).name, np.array(info['data']['vertices'], np.float32),
+              np.array(info['data']['indices'], np.uint32).reshape((-1, 3)), num_rays)
+
+    for side in sides:
+        bench(f'terrain {side}x{side}', *terrain(side), num_rays)
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+
+import sys
+import timeit
+
+import numpy as np
+
+from blastsight.model.elements.meshelement import MeshElement
+from blastsight.view.drawables.meshgl import MeshGL
+
+"""
+In this benchmark, the cost of reading/writing attributes through a drawable
+is measured with the forwarding properties of GLDrawable, and with the
+previous delegation hooks (__getattribute__/__setattr__ in both GLDrawable
+and Element), replicated here. The last rows emulate the attribute reads
+done by ShaderProgram.set_drawables() and the selectors of GLCollection
+for every drawable of a frame.
+
+Usage: python benchmarks/bench_delegation.py [num_drawables ...]
+"""
+
+
+class LegacyMeshElement(MeshElement):
+    def __getattribute__(self, attr: str):
+        if hasattr(type(self), attr):
+            return super().__getattribute__(attr)
+
+        if attr in super().__getattribute__('properties').keys():
+            return super().__getattribute__('properties')[attr]
+
+        return super().__getattribute__(attr)
+
+
+class LegacyMeshGL:
+    def __init__(self, element):
+        super().__setattr__('element', element)
+        self._is_visible = True
+        self.num_vertices = 0
+
+    def __getattribute__(self, attr: str) -> any:
+        if hasattr(type(self), attr) or attr in super().__getattribute__('__dict__'):
+            return super().__getattribute__(attr)
+        return super().__getattribute__('element').__getattribute__(attr)
+
+    def __setattr__(self, key, value) -> None:
+        if key in dir(self.element):
+            self.element.__setattr__(key, value)
+        else:
+            super().__setattr__(key, value)
+
+    @property
+    def is_visible(self) -> bool:
+        return self._is_visible
+
+
+def mesh(element_class: type) -> MeshElement:
+    return element_class(vertices=np.eye(3), indices=[[0, 1, 2]], alpha=0.5, id=0)
+
+
+def per_access(statement: str, drawable, number: int = 100000) -> float:
+    # Nanoseconds per execution of the statement
+    return min(timeit.repeat(statement, globals={'d': drawable}, number=number, repeat=5)) / number * 1e9
+
+
+def bench(num_drawables: int) -> None:
+    current = MeshGL(mesh(MeshElement))
+    legacy = LegacyMeshGL(mesh(LegacyMeshElement))
+
+    rows = [
+        ('element attribute (get)', 'd.alpha'),
+        ('element attribute (set)', 'd.alpha = 0.5'),
+        ('element method', 'd.bounding_box'),
+        ('drawable attribute (get)', 'd.is_visible'),
+        ('drawable attribute (set)', 'd.num_vertices = 0'),
+    ]
+
+    print(f'{"":>28} | {"previous":>10} | {"current":>10} | speedup')
+    for label, statement in rows:
+        before = per_access(statement, legacy)
+        after = per_access(statement, current)
+        print(f'{label:>28} | {before:7.1f} ns | {after:7.1f} ns | {before / after:6.1f}x')
+
+    # Reads done for each drawable in a frame (program membership, opacity, visibility)
+    frame = 'for x in d: x.alpha >= 0.99 and x.is_visible and x.id'
+    currents = [MeshGL(mesh(MeshElement)) for _ in range(num_drawables)]
+    legacies = [LegacyMeshGL(mesh(LegacyMeshElement)) for _ in range(num_drawables)]
+
+    before = per_access(frame, legacies, number=20) / 1e6
+    after = per_access(frame, currents, number=20) / 1e6
+    print(f'{f"{num_drawables} drawables (frame)":>28} | {before:7.2f} ms | {after:7.2f} ms | {before / after:6.1f}x')
+
+
+if __name__ == '__main__':
+    sizes = list(map(int, sys.argv[1:])) or [2000]
+
+    for size in sizes:
+        bench(size)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from .spatialchunks import SpatialChunks
+
+
+class BlockOctree:
+    # Levels are added while they reduce the number of blocks to at least this fraction
+    MIN_REDUCTION = 0.75
+    MAX_LEVELS = 10
+
+    def __init__(self, vertices: np.ndarray, block_size: np.ndarray, chunks: SpatialChunks,
+                 values: np.ndarray = None, colors: np.ndarray = None):
+        """
+        BlockOctree precomputes the levels of detail of a block model, for each of its spatial chunks.
+
+        Level 0 has the original blocks (sorted by chunk), and each parent block in level k + 1
+        merges the (up to 8) blocks of level k inside it, so its size is 2 ** (k + 1) times the block size.
+        The value (and color) of a parent is the average of its original blocks, weighted by how many
+        blocks each child merged, and the parents never cross the border of their chunk.
+
+        Every level is concatenated in the same arrays, and the blocks of the chunk `c` in level `k`
+        go from starts[k] + offsets[k][c] to starts[k] + offsets[k][c + 1].
+        So, drawing a chunk in a coarser level only means drawing another range.
+        """
+        vertices = np.asarray(vertices, float).reshape((-1, 3))
+        self.block_size = np.asarray(block_size, float)
+        self.num_chunks = chunks.num_chunks
+
+        # Level 0 is sorted by chunk, as the drawables upload the original blocks
+        order = chunks.order
+        chunk_ids = np.repeat(np.arange(self.num_chunks), np.diff(chunks.offsets))
+        origin = vertices.min(axis=0) if len(vertices) else np.zeros(3)
+        cells = np.round((vertices[order] - origin) / self.block_size).astype(np.int64)
+
+        weights = np.ones(len(order))
+        level_values = None if values is None else np.asarray(values, float)[order]
+        level_colors = None if colors is None else np.asarray(colors, float).reshape((-1, 3))[order]
+
+        levels = [(cells, weights, level_values, level_colors, chunks.offsets)]
+        while len(levels) < self.MAX_LEVELS:
+            parent = self.merge(chunk_ids, *levels[-1][:4])
+            if len(parent[1]) == 0 or len(parent[1]) > self.MIN_REDUCTION * len(levels[-1][1]):
+                break
+
+            chunk_ids = parent[-1]
+            offsets = np.searchsorted(chunk_ids, np.arange(self.num_chunks + 1))
+            levels.append((*parent[:4], offsets))
+
+        # Everything concatenated, with the scale (relative to the block size) of each block
+        self.num_levels = len(levels)
+        self.scales = np.concatenate([np.full(len(w), 2.0 ** k, np.float32) for k, (_, w, *_) in enumerate(levels)])
+        # The original blocks keep their positions, and the parents are centered in their cells
+        parents = [origin + ((c + 0.5) * 2 ** k - 0.5) * self.block_size for k, (c, *_) in enumerate(levels[1:], 1)]
+        self.vertices = np.concatenate([vertices[order]] + parents)
+        self.values = None if values is None else np.concatenate([v for *_, v, _, _ in levels])
+        self.colors = None if colors is None else np.concatenate([c for *_, c, _ in levels])
+
+        self.starts = np.cumsum([0] + [len(w) for _, w, *_ in levels])[:-1]
+        self.offsets = np.array([level[-1] for level in levels], np.int64)
+
+        # The chunks of every level are culled with the same boxes, so they must contain all of them
+        self.chunks = SpatialChunks(chunks.order, chunks.offsets, *self.bounds(chunks))
+
+    @property
+    def num_blocks(self) -> int:
+        return len(self.scales)
+
+    @property
+    def level_sizes(self) -> np.ndarray:
+        # Size (in the world) of the blocks of each level
+        return self.block_size.max() * self.scales[self.starts]
+
+    def level_size(self, level: int) -> int:
+        return int(self.offsets[level][-1])
+
+    @staticmethod
+    def merge(chunk_ids, cells, weights, values, colors) -> tuple:
+        # Merges the blocks of each chunk that share the same parent cell (cells // 2).
+        # The blocks are already sorted by chunk, and their parents will be sorted by chunk too.
+        parents = cells // 2
+        lo = parents.min(axis=0) if len(parents) else np.zeros(3, np.int64)
+        dims = (parents.max(axis=0) - lo + 1) if len(parents) else np.ones(3, np.int64)
+
+        keys = chunk_ids * int(np.prod(dims)) + np.ravel_multi_index((parents - lo).T, dims)
+        unique_keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+
+        parent_weights = np.bincount(inverse, weights)
+
+        def average(array: np.ndarray) -> np.ndarray:
+            if array is None:
+                return None
+            if array.ndim == 1:
+                return np.bincount(inverse, array * weights) / parent_weights
+            return np.column_stack([np.bincount(inverse, a * weights) for a in array.T]) / parent_weights[:, None]
+
+        return parents[first], parent_weights, average(values), average(colors), chunk_ids[first]
+
+    def bounds(self, chunks: SpatialChunks) -> tuple:
+        # Axis-aligned boxes of the chunks that contain the blocks of every level
+        lo, hi = chunks.lo.copy(), chunks.hi.copy()
+
+        for level in range(1, self.num_levels):
+            offsets = self.offsets[level]
+            vertices = self.vertices[self.starts[level]:self.starts[level] + offsets[-1]]
+            half_size = 0.5 * self.block_size * 2.0 ** level
+            filled = np.diff(offsets) > 0
+
+            if filled.any():
+                lo[filled] = np.minimum(lo[filled], np.minimum.reduceat(vertices, offsets[:-1][filled]) - half_size)
+                hi[filled] = np.maximum(hi[filled], np.maximum.reduceat(vertices, offsets[:-1][filled]) + half_size)
+
+        return lo, hi
+
+    def ranges(self, mask: np.ndarray, levels: np.ndarray) -> tuple:
+        # Returns the (firsts, counts) of the chunks in the mask, each one in its level (see SpatialChunks)
+        return SpatialChunks.level_ranges(self.starts, self.offsets, mask, levels)
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+from .intersections import Intersections
+
+
+class BVH:
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray, leaf_size: int = 16):
+        """
+        BVH (Bounding Volume Hierarchy) is an acceleration structure for ray-triangle intersections.
+
+        The triangles are sorted by the Morton code of their centroids, so that close triangles
+        end up close in memory. Then, they're grouped in leaves of `leaf_size` triangles,
+        and a complete binary tree is built bottom-up over those leaves.
+
+        The tree is implicit: node `i` of level `k` has children `2i` and `2i + 1` in level `k + 1`,
+        and each level is stored as two arrays with the minimum/maximum bounds of its nodes.
+        Padding leaves (needed to complete the tree) have NaN bounds, so they're never hit.
+        """
+        self.vertices = np.asarray(vertices, np.float32).reshape((-1, 3))
+        self.leaf_size = leaf_size
+
+        indices = np.asarray(indices).reshape((-1, 3))
+        self.indices = indices[self.morton_order(self.vertices, indices)]
+
+        self.mins = []
+        self.maxs = []
+        self._build()
+
+    @property
+    def num_triangles(self) -> int:
+        return len(self.indices)
+
+    @property
+    def depth(self) -> int:
+        return len(self.mins)
+
+    @staticmethod
+    def morton_order(vertices: np.ndarray, indices: np.ndarray) -> np.ndarray:
+        # Returns the order of the triangles, sorted by the Morton code (Z-order curve) of their centroids
+        # Bit interleaving adapted from https://developer.nvidia.com/blog/thinking-parallel-part-iii-tree-construction-gpu/
+        centroids = vertices[indices].mean(axis=1)
+        lo = centroids.min(axis=0)
+        extent = np.maximum(centroids.max(axis=0) - lo, 1e-12)
+
+        def expand_bits(v: np.ndarray) -> np.ndarray:
+            # Inserts two zeros between each bit of a 10-bit integer
+            for multiplier, mask in [(0x00010001, 0xFF0000FF),
+                                     (0x00000101, 0x0F00F00F),
+                                     (0x00000011, 0xC30C30C3),
+                                     (0x00000005, 0x49249249)]:
+                v = (v * np.uint64(multiplier)) & np.uint64(mask)
+            return v
+
+        grid = ((centroids - lo) / extent * 1023).astype(np.uint64)
+        codes = (expand_bits(grid[:, 0]) << np.uint64(2)) \
+            | (expand_bits(grid[:, 1]) << np.uint64(1)) \
+            | expand_bits(grid[:, 2])
+
+        return np.argsort(codes, kind='stable')
+
+    def _build(self) -> None:
+        num_leaves = max(1, -(-self.num_triangles // self.leaf_size))
+        padded_leaves = 1 << int(np.ceil(np.log2(num_leaves)))
+        padded_triangles = padded_leaves * self.leaf_size
+
+        # Bounds of each triangle (NaN for padding triangles)
+        triangles = self.vertices[self.indices]
+        tri_mins = np.full((padded_triangles, 3), np.nan, np.float32)
+        tri_maxs = np.full((padded_triangles, 3), np.nan, np.float32)
+        tri_mins[:self.num_triangles] = triangles.min(axis=1)
+        tri_maxs[:self.num_triangles] = triangles.max(axis=1)
+        del triangles
+
+        # Inflate bounds a bit, so that float rounding doesn't discard triangles lying on the boundaries
+        epsilon = 1e-6 * max(1.0, float(np.abs(self.vertices).max(initial=0.0)))
+
+        # Leaves (np.fmin/np.fmax ignore NaNs)
+        mins = np.fmin.reduce(tri_mins.reshape((padded_leaves, self.leaf_size, 3)), axis=1) - epsilon
+        maxs = np.fmax.reduce(tri_maxs.reshape((padded_leaves, self.leaf_size, 3)), axis=1) + epsilon
+
+        # From leaves to root
+        levels = [(mins, maxs)]
+        while len(mins) > 1:
+            mins = np.fmin(mins[0::2], mins[1::2])
+            maxs = np.fmax(maxs[0::2], maxs[1::2])
+            levels.append((mins, maxs))
+
+        levels.reverse()
+        self.mins = [lvl[0] for lvl in levels]
+        self.maxs = [lvl[1] for lvl in levels]
+
+    def candidates(self, origin: np.ndarray, ray: np.ndarray) -> np.ndarray:
+        # Returns the indices (in self.indices) of the triangles whose leaves are hit by the ray.
+        # The traversal is level-synchronous, so each level is tested in a single vectorized step.
+        nodes = np.zeros(1, int)
+
+        for level in range(self.depth):
+            mask = Intersections.ray_with_aabbs(origin, ray, self.mins[level][nodes], self.maxs[level][nodes])
+            nodes = nodes[mask]
+
+            if nodes.size == 0:
+                return nodes
+
+            if level < self.depth - 1:
+                nodes = np.column_stack((2 * nodes, 2 * nodes + 1)).ravel()
+
+        triangles = (nodes.reshape((-1, 1)) * self.leaf_size + np.arange(self.leaf_size)).ravel()
+        return triangles[triangles < self.num_triangles]
+
+    def intersect_with_ray(self, origin: np.ndarray, ray: np.ndarray) -> np.ndarray:
+        candidates = self.candidates(origin, ray)
+
+        if candidates.size == 0:
+            return np.empty(0)
+
+        return Intersections.ray_with_triangles(origin, ray, self.vertices[self.indices[candidates]])
+
+    def intersect_with_rays(self, origins: np.ndarray, rays: np.ndarray) -> np.ndarray:
+        # Returns the ray parameter `t` of the first hit of each ray (origin + t * ray), or np.inf if there's none.
+        # Same traversal as candidates(), but every (ray, node) pair of a level is tested at once.
+        origins = np.asarray(origins, np.float64).reshape((-1, 3))
+        rays = np.asarray(rays, np.float64).reshape((-1, 3))
+        distances = np.full(len(origins), np.inf)
+
+        ray_ids = np.arange(len(origins))
+        nodes = np.zeros(len(origins), int)
+
+        for level in range(self.depth):
+            mask = Intersections.ray_with_aabbs(origins[ray_ids], rays[ray_ids],
+                                                self.mins[level][nodes], self.maxs[level][nodes])
+            ray_ids = ray_ids[mask]
+            nodes = nodes[mask]
+
+            if nodes.size == 0:
+                return distances
+
+            if level < self.depth - 1:
+                ray_ids = np.repeat(ray_ids, 2)
+                nodes = np.column_stack((2 * nodes, 2 * nodes + 1)).ravel()
+
+        # Every (ray, triangle) pair of the leaves that were hit
+        ray_ids = np.repeat(ray_ids, self.leaf_size)
+        triangles = (nodes.reshape((-1, 1)) * self.leaf_size + np.arange(self.leaf_size)).ravel()
+
+        valid = triangles < self.num_triangles
+        ray_ids = ray_ids[valid]
+        triangles = triangles[valid]
+
+        t = Intersections.rays_with_triangles(origins[ray_ids], rays[ray_ids],
+                                              self.vertices[self.indices[triangles]].astype(np.float64))
+        np.minimum.at(distances, ray_ids, t)
+
+        return distances
@@ -8,9 +8,12 @@
 from .elements.nullelement import NullElement
 from .elements.meshelement import MeshElement
 from .elements.blockelement import BlockElement
+from .elements.gridblockelement import GridBlockElement
 from .elements.pointelement import PointElement
+from .elements.pointcloudelement import PointCloudElement
 from .elements.lineelement import LineElement
 from .elements.tubeelement import TubeElement
+from .elements.drillholesetelement import DrillholeSetElement
 
 
 class ElementFactory:
@@ -24,10 +27,16 @@ class ElementFactory:
 
     @staticmethod
     def blocks(*args, **kwargs) -> BlockElement:
+        # Blocks with grid dimensions (or explicitly asked as a grid) are stored as a regular grid
+        if kwargs.get('grid', 'dimensions' in kwargs.keys()):
+            return GridBlockElement(*args, **kwargs)
         return BlockElement(*args, **kwargs)
 
     @staticmethod
     def points(*args, **kwargs) -> PointElement:
+        # Points in an octree (see PointOctree) are streamed instead of loaded
+        if 'octree' in kwargs.keys():
+            return PointCloudElement(*args, **kwargs)
         return PointElement(*args, **kwargs)
 
     @staticmethod
@@ -37,3 +46,7 @@ class ElementFactory:
     @staticmethod
     def tubes(*args, **kwargs) -> TubeElement:
         return TubeElement(*args, **kwargs)
+
+    @staticmethod
+    def drillholes(*args, **kwargs) -> DrillholeSetElement:
+        return DrillholeSetElement(*args, **kwargs)
@@ -8,7 +8,9 @@
 from .element import Element
 from .elementcollection import ElementCollection
 from .blockelement import BlockElement
+from .gridblockelement import GridBlockElement
 from .pointelement import PointElement
 from .lineelement import LineElement
 from .meshelement import MeshElement
 from .tubeelement import TubeElement
+from .drillholesetelement import DrillholeSetElement
@@ -7,6 +7,8 @@
 
 import numpy as np
 from .dfelement import DFElement
+from ..blockoctree import BlockOctree
+from ..spatialchunks import SpatialChunks
 
 
 class BlockElement(DFElement):
@@ -81,6 +83,22 @@ class BlockElement(DFElement):
         lo, hi = super().bounding_box
         return lo - (self.block_size / 2), hi + (self.block_size / 2)
 
+    @property
+    def chunks(self) -> SpatialChunks:
+        return self.cached('chunks', lambda: SpatialChunks.from_points(self.vertices, self.block_size / 2),
+                           tuple(self.block_size))
+
+    @property
+    def octree(self) -> BlockOctree:
+        # Levels of detail of each chunk, averaging the colors if they're explicit, or the values otherwise
+        def generate() -> BlockOctree:
+            colors = self.datasets.get('color')
+            if colors.size > 0:
+                return BlockOctree(self.vertices, self.block_size, self.chunks, colors=colors)
+            return BlockOctree(self.vertices, self.block_size, self.chunks, values=self.values)
+
+        return self.cached('octree', generate, tuple(self.block_size))
+
     """
     Utilities
     """
@@ -105,3 +123,10 @@ class BlockElement(DFElement):
         threshold = np.dot(np.abs(normal), half_block)
 
         return super().slice_with_plane_and_threshold(origin, normal, threshold)
+
+    def slice_with_planes(self, normal: np.ndarray, offsets: list) -> list:
+        # Same threshold as above, but every plane shares the same normal
+        normal = np.asarray(normal, float) / np.linalg.norm(normal)
+        threshold = np.dot(np.abs(normal), np.array(self.block_size) / 2)
+
+        return super().slice_with_planes_and_threshold(normal, offsets, threshold)
@@ -9,11 +9,13 @@ import numpy as np
 import pandas as pd
 
 from .element import Element
+from ..projectionindex import ProjectionIndex
+from ..spatialchunks import SpatialChunks
 from ...model import utils
 
 
 class DFElement(Element):
-    __slots__ = ['_mapper', 'datasets']
+    __slots__ = ['_mapper', 'datasets', '_auto_limits']
 
     def __init__(self, *args, **kwargs):
         """
@@ -51,7 +53,14 @@ class DFElement(Element):
         The 'datasets' dictionary was created because some properties
         might get too big to fit in an HDF5 attribute.
         It's expected to be used by children of this class.
+
+        self.vertices (and self.color, if it's generated from 'values') are cached derived arrays,
+        so they're read-only. To change them, use their setters (element.vertices = ...),
+        or modify a copy (element.vertices.copy()).
         """
+        # Derived data cache (see Element)
+        self._initialize_cache()
+
         # Base data
         self.data: pd.DataFrame = pd.DataFrame()
         self.datasets: dict = {}
@@ -59,6 +68,7 @@ class DFElement(Element):
         self.metadata: dict = {'id': -1}
 
         self._mapper: dict = {k: k for k in ['x', 'y', 'z', 'values']}
+        self._auto_limits: set = set()
         super()._initialize(*args, **kwargs)
 
     """
@@ -94,9 +104,30 @@ class DFElement(Element):
         self.vmin = kwargs.get('vmin', self.values.min())
         self.vmax = kwargs.get('vmax', self.values.max())
 
+        # Limits that weren't given are computed from the values, and they grow with appended values
+        self._auto_limits = {k for k in ['vmin', 'vmax'] if k not in kwargs.keys()}
+
     def recalculate_limits(self) -> None:
         self.vmin = self.values.min()
         self.vmax = self.values.max()
+        self._auto_limits = {'vmin', 'vmax'}
+
+    def append(self, data) -> None:
+        # Appends rows (with the same columns) to the data, as in files loaded by chunks (see Parser.load_chunks()).
+        # The limits computed from the values grow to include the new ones (limits set by the user are kept),
+        # but explicit colors can't be extended.
+        data = pd.DataFrame(data)
+        if self.datasets.get('color').size > 0:
+            raise ValueError('Elements with explicit colors can not be appended.')
+
+        self.data = pd.concat([self.data, data], ignore_index=True)
+
+        if len(data) > 0:
+            values = data[self._mapper.get('values')].to_numpy()
+            if 'vmin' in self._auto_limits:
+                self.properties['vmin'] = float(min(self.vmin, values.min()))
+            if 'vmax' in self._auto_limits:
+                self.properties['vmax'] = float(max(self.vmax, values.max()))
 
     """
     Data
@@ -117,21 +148,34 @@ class DFElement(Element):
     def values(self) -> np.ndarray:
         return self.data[self._mapper.get('values')].to_numpy()
 
+    @property
+    def vertices(self) -> np.ndarray:
+        # The coordinates live in the DataFrame, so we can only cache their (N, 3) version
+        return self.cached('vertices', lambda: np.column_stack((self.x, self.y, self.z)))
+
     @x.setter
     def x(self, _x: list) -> None:
         self.data[self._mapper.get('x')] = np.array(_x)
+        self.invalidate()
 
     @y.setter
     def y(self, _y: list) -> None:
         self.data[self._mapper.get('y')] = np.array(_y)
+        self.invalidate()
 
     @z.setter
     def z(self, _z: list) -> None:
         self.data[self._mapper.get('z')] = np.array(_z)
+        self.invalidate()
 
     @values.setter
     def values(self, _values) -> None:
         self.data[self._mapper.get('values')] = np.array(_values)
+        self.invalidate()
+
+    @vertices.setter
+    def vertices(self, vertex_list: list) -> None:
+        self.x, self.y, self.z = np.array(vertex_list).T
 
     """
     Properties
@@ -139,7 +183,8 @@ class DFElement(Element):
     @property
     def color(self) -> np.ndarray:
         if self.datasets.get('color').size == 0:
-            return utils.values_to_rgb(self.values, self.vmin, self.vmax, self.colormap)
+            return self.cached('color', lambda: utils.values_to_rgb(self.values, self.vmin, self.vmax, self.colormap),
+                               self.vmin, self.vmax, self.colormap)
         return self.datasets.get('color')
 
     @property
@@ -156,7 +201,9 @@ class DFElement(Element):
 
     @color.setter
     def color(self, _colors: list) -> None:
+        # Explicit colors are part of the derived data (e.g. BlockElement.octree), so they bump the version
         self.datasets['color'] = np.array(_colors)
+        self.invalidate()
 
     @property
     def all_headers(self) -> list:
@@ -178,14 +225,17 @@ class DFElement(Element):
     @vmin.setter
     def vmin(self, value: float) -> None:
         self.properties['vmin'] = float(value)
+        self._auto_limits.discard('vmin')
 
     @vmax.setter
     def vmax(self, value: float) -> None:
         self.properties['vmax'] = float(value)
+        self._auto_limits.discard('vmax')
 
     @headers.setter
     def headers(self, _headers: list) -> None:
         self._mapper['x'], self._mapper['y'], self._mapper['z'], self._mapper['values'] = _headers
+        self.invalidate()
 
     @is_slice.setter
     def is_slice(self, value: bool) -> None:
@@ -194,6 +244,19 @@ class DFElement(Element):
     """
     Utilities
     """
+    @property
+    def projection_index(self) -> ProjectionIndex:
+        return self.cached('projection_index', lambda: ProjectionIndex(self.vertices))
+
+    @property
+    def chunks(self) -> SpatialChunks:
+        # Spatial chunks of the vertices, so the drawables can cull them (see SpatialChunks)
+        return self.cached('chunks', lambda: SpatialChunks.from_points(self.vertices))
+
+    def inside_mesh(self, mesh) -> np.ndarray:
+        # Returns a mask of the vertices that are inside the (closed) mesh, ready to filter our data
+        return mesh.contains_points(self.vertices)
+
     def slice_with_plane_and_threshold(self, origin: np.ndarray, normal: np.ndarray, threshold: float):
         """
         *** Plane Equation: ax + by + cz + d = 0 ***
@@ -215,15 +278,17 @@ class DFElement(Element):
 
         The projection idea comes from
         https://gdbooks.gitbooks.io/3dcollisions/content/Chapter2/static_aabb_plane.html
+
+        If the plane is axis-aligned, we don't need to project every vertex.
+        The projection index keeps the vertices sorted by each axis, so the slab
+        is found with binary searches (see ProjectionIndex).
         """
         normal /= np.linalg.norm(normal)
-        vertices = self.vertices
 
-        plane_d = -np.dot(normal, origin)
+        return self.projection_index.slice_with_plane_and_threshold(origin, normal, threshold)
 
-        # In this context, np.inner(a, b) returns the same as (a * b).sum(axis=1), but it's faster.
-        # Luckily, we don't run out of memory like in vectorized_triangles_intersection.
-        mask = np.abs(np.inner(normal, vertices) + plane_d) <= threshold
+    def slice_with_planes_and_threshold(self, normal: np.ndarray, offsets: list, threshold: float) -> list:
+        # Same as above, but for every plane `dot(normal, x) = offset` at once, with the normal projected only once
+        normal = np.asarray(normal, float) / np.linalg.norm(normal)
 
-        # If mask = [True, False, True], then mask.nonzero()[-1] = [0, 2]
-        return mask.nonzero()[-1]
+        return self.projection_index.slice_with_planes_and_threshold(normal, offsets, threshold)
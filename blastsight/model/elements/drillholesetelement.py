@@ -0,0 +1,272 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from .element import Element
+from ..intersections import Intersections
+from .. import utils
+
+
+class DrillholeSetElement(Element):
+    def __init__(self, *args, **kwargs):
+        """
+        DrillholeSetElement is a class inheriting from Element, for a whole set of drillholes.
+
+        {
+            'data': {
+                'x': list[float],
+                'y': list[float],
+                'z': list[float],
+                'offsets': list[int],
+                'values': list[float]
+            }
+            'properties': {
+                'names': list[str],
+                'visibility': list[bool],
+                'radius': float,
+                'resolution': int,
+                'vmin': float,
+                'vmax': float,
+                'alpha': float,
+                'colormap': str
+            },
+            'metadata': {
+                'id': int,
+                'name': str | None,
+                'extension': str | None
+            }
+        }
+
+        The vertices of every hole are concatenated, where hole `i` goes from
+        offsets[i] to offsets[i + 1] (so there are num_holes + 1 offsets).
+        Each interval (the segment between two consecutive vertices of a hole) has a value,
+        so a hole with N vertices has N - 1 values, mapped to colors with the colormap.
+
+        The element can also be filled with 'holes' (a list of (N, 3) arrays),
+        and 'values' (a list with the values of each hole).
+        """
+        super().__init__(*args, **kwargs)
+
+    """
+    Element filling
+    """
+    def _fill_element(self, *args, **kwargs) -> None:
+        if 'holes' in kwargs.keys():
+            self._fill_as_holes(*args, **kwargs)
+        else:
+            super()._fill_element(*args, **kwargs)
+            source = kwargs.get('data', kwargs)
+            self.offsets = source.get('offsets', [0, self.x.size])
+            self.values = source.get('values', np.zeros(max(self.x.size - 1, 0)))
+
+    def _fill_as_holes(self, *args, **kwargs) -> None:
+        holes = [np.array(hole, np.float32).reshape((-1, 3)) for hole in kwargs.get('holes')]
+        sizes = [len(hole) for hole in holes]
+
+        self.vertices = np.concatenate(holes) if holes else np.empty((0, 3), np.float32)
+        self.offsets = np.concatenate(([0], np.cumsum(sizes)))
+
+        values = kwargs.get('values', [np.zeros(max(size - 1, 0)) for size in sizes])
+        self.values = np.concatenate([np.ravel(v) for v in values]) if values else []
+
+    def _fill_properties(self, *args, **kwargs) -> None:
+        super()._fill_properties(*args, **kwargs)
+        self.names = kwargs.get('names', [str(i) for i in range(self.num_holes)])
+        self.visibility = kwargs.get('visibility', np.ones(self.num_holes, bool))
+        self.radius = kwargs.get('radius', 0.15)
+        self.resolution = kwargs.get('resolution', 15)
+        self.colormap = kwargs.get('colormap', '#FF0000-#0000FF')  # red-blue (min is red, max is blue)
+
+        self.vmin = kwargs.get('vmin', self.values.min() if self.values.size else 0.0)
+        self.vmax = kwargs.get('vmax', self.values.max() if self.values.size else 0.0)
+
+    def _check_integrity(self) -> None:
+        super()._check_integrity()
+        if self.num_holes == 0:
+            raise ValueError("Not enough data to create this element.")
+
+        if self.offsets[0] != 0 or self.offsets[-1] != self.x.size:
+            raise ValueError(f'Offsets must go from 0 to {self.x.size}, got {self.offsets[0]} to {self.offsets[-1]}.')
+
+        if np.diff(self.offsets).min() < 2:
+            raise ValueError('Every hole must have at least 2 vertices.')
+
+        if self.values.size != self.num_intervals:
+            raise ValueError(f'Expected {self.num_intervals} values (one per interval), got {self.values.size}.')
+
+        if len(self.names) != self.num_holes or len(self.visibility) != self.num_holes:
+            raise ValueError(f'Expected {self.num_holes} names and visibility flags.')
+
+    """
+    Data
+    """
+    @property
+    def offsets(self) -> np.ndarray:
+        return self.data.get('offsets')
+
+    @property
+    def values(self) -> np.ndarray:
+        return self.data.get('values')
+
+    @offsets.setter
+    def offsets(self, _offsets: list) -> None:
+        self.data['offsets'] = np.array(_offsets, np.int64)
+        self.invalidate()
+
+    @values.setter
+    def values(self, _values: list) -> None:
+        self.data['values'] = np.array(_values, float).ravel()
+        self.invalidate()
+
+    @property
+    def num_holes(self) -> int:
+        return max(len(self.offsets) - 1, 0)
+
+    @property
+    def num_intervals(self) -> int:
+        return self.x.size - self.num_holes
+
+    @property
+    def interval_starts(self) -> np.ndarray:
+        # Index of the first vertex of each interval (every vertex, except the last one of each hole)
+        def generate() -> np.ndarray:
+            mask = np.ones(self.x.size, bool)
+            mask[self.offsets[1:] - 1] = False
+            return np.flatnonzero(mask)
+
+        return self.cached('interval_starts', generate)
+
+    def hole(self, index: int) -> np.ndarray:
+        return self.vertices[self.offsets[index]:self.offsets[index + 1]]
+
+    def hole_values(self, index: int) -> np.ndarray:
+        # Hole `i` has offsets[i + 1] - offsets[i] - 1 intervals, and `i` intervals less than vertices before it
+        return self.values[self.offsets[index] - index:self.offsets[index + 1] - index - 1]
+
+    def hole_of(self, vertex_indices: np.ndarray) -> np.ndarray:
+        # Returns the hole of each vertex
+        return np.searchsorted(self.offsets, vertex_indices, side='right') - 1
+
+    """
+    Properties
+    """
+    @property
+    def names(self) -> list:
+        return self.properties.get('names')
+
+    @property
+    def visibility(self) -> np.ndarray:
+        return self.properties.get('visibility')
+
+    @property
+    def radius(self) -> float:
+        return self.properties.get('radius')
+
+    @property
+    def resolution(self) -> int:
+        return self.properties.get('resolution')
+
+    @property
+    def colormap(self) -> str:
+        return self.properties.get('colormap')
+
+    @property
+    def vmin(self) -> float:
+        return self.properties.get('vmin')
+
+    @property
+    def vmax(self) -> float:
+        return self.properties.get('vmax')
+
+    @property
+    def color(self) -> np.ndarray:
+        # Color of each interval
+        return self.cached('color', lambda: utils.values_to_rgb(self.values, self.vmin, self.vmax, self.colormap),
+                           self.vmin, self.vmax, self.colormap)
+
+    @property
+    def vertex_colors(self) -> np.ndarray:
+        # Color of each vertex, where each interval takes the color of its first vertex
+        def generate() -> np.ndarray:
+            colors = np.empty((self.x.size, 3), np.float32)
+            colors[self.interval_starts] = self.color
+            colors[self.offsets[1:] - 1] = colors[self.offsets[1:] - 2]
+            return colors
+
+        return self.cached('vertex_colors', generate, self.vmin, self.vmax, self.colormap)
+
+    @names.setter
+    def names(self, _names: list) -> None:
+        self.properties['names'] = list(_names)
+
+    @visibility.setter
+    def visibility(self, _visibility: list) -> None:
+        self.properties['visibility'] = np.array(_visibility, bool)
+
+    @radius.setter
+    def radius(self, _radius: float) -> None:
+        self.properties['radius'] = _radius
+
+    @resolution.setter
+    def resolution(self, _resolution: int) -> None:
+        self.properties['resolution'] = _resolution
+
+    @colormap.setter
+    def colormap(self, _colormap: str) -> None:
+        if utils.parse_colormap(_colormap):  # Empty list interpreted as False
+            self.properties['colormap'] = _colormap
+
+    @vmin.setter
+    def vmin(self, value: float) -> None:
+        self.properties['vmin'] = float(value)
+
+    @vmax.setter
+    def vmax(self, value: float) -> None:
+        self.properties['vmax'] = float(value)
+
+    @color.setter
+    def color(self, _color: list) -> None:
+        # Colors come from the colormap, but Element sets a default one
+        self.properties['color'] = np.array(_color)
+
+    def recalculate_limits(self) -> None:
+        self.vmin = self.values.min()
+        self.vmax = self.values.max()
+
+    def set_hole_visibility(self, indices, status: bool) -> None:
+        self.visibility[indices] = status
+
+    @property
+    def visible_holes(self) -> np.ndarray:
+        return np.flatnonzero(self.visibility)
+
+    """
+    Utilities
+    """
+    def pick(self, origin: np.ndarray, ray: np.ndarray) -> tuple:
+        # Returns the closest visible hole hit by the ray (or -1), and the ray parameter of the hit (or np.inf)
+        starts = self.interval_starts
+        visible = self.visibility[self.hole_of(starts)]
+        starts = starts[visible]
+
+        t, distances = Intersections.ray_with_segments(origin, ray, self.vertices[starts], self.vertices[starts + 1])
+        hits = np.flatnonzero(distances <= self.radius)
+
+        if hits.size == 0:
+            return -1, np.inf
+
+        closest = hits[np.argmin(t[hits])]
+        return int(self.hole_of(starts[closest])), float(t[closest])
+
+    def intersect_with_ray(self, origin: np.ndarray, ray: np.ndarray) -> np.ndarray:
+        # Points of the ray that hit the visible holes (within their radius)
+        starts = self.interval_starts[self.visibility[self.hole_of(self.interval_starts)]]
+        t, distances = Intersections.ray_with_segments(origin, ray, self.vertices[starts], self.vertices[starts + 1])
+        t = t[distances <= self.radius]
+
+        return origin + t.reshape((-1, 1)) * ray
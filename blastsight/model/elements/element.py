@@ -9,7 +9,7 @@ import numpy as np
 
 
 class Element:
-    __slots__ = ['data', 'properties', 'metadata']
+    __slots__ = ['_data', 'properties', 'metadata', '_xyz', '_version', '_cache', '_cache_stats']
 
     def __init__(self, *args, **kwargs):
         """
@@ -32,14 +32,34 @@ class Element:
                 'extension': str
             }
         }
+
+        The coordinates are stored in a single contiguous (N, 3) float32 array,
+        and 'x', 'y' and 'z' are strided views of its columns, so self.vertices
+        can be uploaded to OpenGL without copies. If any of 'x', 'y' or 'z'
+        is replaced, the (N, 3) array is rebuilt on the next access to self.vertices.
+
+        Derived arrays (bounding box, centroid, etc.) are cached, and tagged with
+        the data version that generated them. The data setters bump that version,
+        so the cache is only regenerated when the data actually changes.
+        If you modify the data in-place, call self.invalidate() afterwards.
         """
+        # Derived data cache
+        self._initialize_cache()
+
         # Base data
+        self._xyz: np.ndarray = np.empty((0, 3), np.float32)
         self.data: dict = {}
         self.properties: dict = {}
         self.metadata: dict = {}
 
         self._initialize(*args, **kwargs)
 
+    def _initialize_cache(self) -> None:
+        # Shared with children that don't call Element.__init__() (see DFElement)
+        self._version: int = 0
+        self._cache: dict = {}
+        self._cache_stats: dict = {'hits': 0, 'misses': 0}
+
     def _initialize(self, *args, **kwargs) -> None:
         self._fill_element(*args, **kwargs)
         self._fill_metadata(*args, **kwargs)
@@ -98,17 +118,13 @@ class Element:
         # We need both our methods/attributes, and the keys of the _properties dict
         return list(set(super().__dir__() + list(self.properties.keys())))
 
-    def __getattribute__(self, attr: str):
-        # Do we have the desired attribute/property?
-        if hasattr(type(self), attr):
-            return super().__getattribute__(attr)
-
+    def __getattr__(self, attr: str):
+        # Only called when the regular lookup fails (so our methods/attributes don't pay for it).
         # Does self.properties have it?
-        if attr in super().__getattribute__('properties').keys():
-            return super().__getattribute__('properties')[attr]
-
-        # If everything fails, just raise the original exception
-        return super().__getattribute__(attr)
+        try:
+            return object.__getattribute__(self, 'properties')[attr]
+        except (AttributeError, KeyError):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attr}'") from None
 
     """
     Properties accessors
@@ -122,9 +138,63 @@ class Element:
     def delete_property(self, key: str) -> None:
         self.properties.pop(key)
 
+    """
+    Derived data cache
+    """
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def cache_stats(self) -> dict:
+        return {**self._cache_stats, 'version': self.version, 'size': len(self._cache)}
+
+    def invalidate(self) -> None:
+        # Bumps the data version, so every derived array will be regenerated on its next access
+        self._version += 1
+
+    def cached(self, key: str, generator: callable, *params) -> any:
+        # Returns the derived data saved as `key`, only calling generator() if
+        # the data version (or any of the extra params) changed since the last call
+        version, cached_params, value = self._cache.get(key, (-1, None, None))
+
+        if version == self.version and cached_params == params:
+            self._cache_stats['hits'] += 1
+            return value
+
+        # The version is read before generating, so data that changes meanwhile (in another thread) isn't hidden
+        self._cache_stats['misses'] += 1
+        version = self.version
+        value = generator()
+
+        # Cached arrays are shared between callers, so they must not be modified in-place
+        for array in value if isinstance(value, tuple) else [value]:
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+
+        self._cache[key] = (version, params, value)
+        return value
+
+    def cached_value(self, key: str, *params) -> any:
+        # Returns the derived data saved as `key` only if it's up-to-date, without generating it
+        version, cached_params, value = self._cache.get(key, (-1, None, None))
+        return value if version == self.version and cached_params == params else None
+
+    def clear_cache(self) -> None:
+        self._cache.clear()
+
     """
     Data accessors
     """
+    @property
+    def data(self):
+        return self._data
+
+    @data.setter
+    def data(self, _data) -> None:
+        self._data = _data
+        self.invalidate()
+
     @property
     def x(self) -> np.ndarray:
         return self.data.get('x')
@@ -139,23 +209,53 @@ class Element:
 
     @property
     def vertices(self) -> np.ndarray:
-        return np.column_stack((self.x, self.y, self.z))
+        # Pack x/y/z again only if any of them isn't a view of self._xyz anymore
+        if not all(self.data.get(k) is not None and self.data.get(k).base is self._xyz for k in 'xyz'):
+            self._set_vertices(np.column_stack((self.x, self.y, self.z)).astype(np.float32, copy=False))
+
+        return self._xyz
 
     @x.setter
     def x(self, val: list) -> None:
         self.data['x'] = np.array(val, np.float32)
+        self.invalidate()
 
     @y.setter
     def y(self, val: list) -> None:
         self.data['y'] = np.array(val, np.float32)
+        self.invalidate()
 
     @z.setter
     def z(self, val: list) -> None:
         self.data['z'] = np.array(val, np.float32)
+        self.invalidate()
 
     @vertices.setter
     def vertices(self, vertex_list: list) -> None:
-        self.x, self.y, self.z = np.array(vertex_list).T
+        vertices = np.atleast_2d(self.as_array(vertex_list, np.float32))
+
+        if vertices.ndim != 2 or vertices.shape[1] != 3:
+            raise ValueError(f'Vertices must have (N, 3) shape, got {vertices.shape}.')
+
+        self._set_vertices(vertices)
+        self.invalidate()
+
+    def _set_vertices(self, vertices: np.ndarray) -> None:
+        # The columns of `vertices` are exposed as x/y/z without copying them.
+        # self._xyz must own its memory (or map it), since self.vertices checks if x/y/z are still views of it.
+        owns_memory = (vertices.base is None or isinstance(vertices, np.memmap)) and vertices.flags.c_contiguous
+        self._xyz = vertices if owns_memory else np.array(vertices, order='C')
+        self.data['x'] = self._xyz[:, 0]
+        self.data['y'] = self._xyz[:, 1]
+        self.data['z'] = self._xyz[:, 2]
+
+    @staticmethod
+    def as_array(values, dtype) -> np.ndarray:
+        # Memory-mapped arrays (see BSXParser) that already have the right type are kept as they are,
+        # so they're only read from the disk when they're used. Anything else is copied.
+        if isinstance(values, np.memmap) and values.dtype == dtype and values.flags.c_contiguous:
+            return values
+        return np.array(values, dtype)
 
     """
     Properties
@@ -194,7 +294,7 @@ class Element:
     """
     @property
     def centroid(self) -> np.ndarray:
-        return self.vertices.mean(axis=0)
+        return self.cached('centroid', lambda: self.vertices.mean(axis=0))
 
     @property
     def center(self) -> np.ndarray:
@@ -204,8 +304,8 @@ class Element:
     def bounding_box(self) -> tuple:
         # We could return self.vertices.min(axis=0), self.vertices.max(axis=0),
         # but I found this to be noticeable faster (speedup of 5.2 approx.)
-        return (np.array([self.x.min(), self.y.min(), self.z.min()]),
-                np.array([self.x.max(), self.y.max(), self.z.max()]))
+        return self.cached('bounding_box', lambda: (np.array([self.x.min(), self.y.min(), self.z.min()]),
+                                                    np.array([self.x.max(), self.y.max(), self.z.max()])))
 
     """
     Metadata
@@ -0,0 +1,333 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+import pandas as pd
+
+from .blockelement import BlockElement
+from ..projectionindex import GridIndex
+
+
+class GridBlockElement(BlockElement):
+    def __init__(self, *args, **kwargs):
+        """
+        GridBlockElement is a class inheriting from BlockElement, for blocks that sit on a regular grid.
+
+        {
+            'data': {
+                'i': list[int],
+                'j': list[int],
+                'k': list[int],
+                'values: list[float],
+            },
+            'datasets': {
+                'color': list[list[float]] (Optional, auto-generated from 'values' if None)
+            },
+            'properties': {
+                'headers': list[str],
+                'vmin': float,
+                'vmax': float,
+                'alpha': float,
+                'size': float,
+                'origin': list[float],
+                'spacing': list[float],
+                'dimensions': list[int],
+                'colormap': str (Optional, used from 'values')
+            }
+            'metadata': {
+                'id': int,
+                'name': str | None,
+                'extension': str | None
+            }
+        }
+
+        The element can be filled with IJK indices ('i', 'j', 'k'), or with coordinates like a BlockElement.
+        In the latter case, 'origin', 'spacing' (or 'block_size') and 'dimensions' are detected if they're
+        not specified, and the coordinates are replaced by compact integer indices, where the coordinates
+        of a block are `origin + spacing * [i, j, k]`.
+
+        Since the grid geometry is known, the block size, bounding box, slices and neighbours
+        don't need to traverse the coordinates.
+        """
+        super().__init__(*args, **kwargs)
+
+    """
+    Element filling
+    """
+    def _fill_element(self, *args, **kwargs) -> None:
+        if all(k in kwargs.keys() for k in 'ijk'):
+            indices = {k: np.array(kwargs.get(k)) for k in 'ijk'}
+            values = kwargs.get('values', np.zeros(indices.get('i').size))
+            kwargs['data'] = pd.DataFrame({**indices, 'values': values})
+
+        if 'data' in kwargs.keys() and all(k in kwargs.get('data').keys() for k in 'ijk'):
+            self._fill_as_data(*args, **kwargs)
+            self._fill_as_indices(kwargs.get('headers', list(self.data.keys())[:4]), *args, **kwargs)
+        else:
+            super()._fill_element(*args, **kwargs)
+            self._fill_as_grid(kwargs.get('headers', list(self.data.keys())[:4]), *args, **kwargs)
+
+    def _fill_as_indices(self, headers: list, *args, **kwargs) -> None:
+        indices = self.data[headers[:3]].to_numpy()
+
+        if indices.min() < 0:
+            raise ValueError('Grid indices must be non-negative.')
+
+        self.origin = kwargs.get('origin', [0.0, 0.0, 0.0])
+        self.spacing = kwargs.get('spacing', kwargs.get('block_size', [1.0, 1.0, 1.0]))
+        self.dimensions = kwargs.get('dimensions', indices.max(axis=0) + 1)
+        self._set_indices(indices, headers)
+
+    def _fill_as_grid(self, headers: list, *args, **kwargs) -> None:
+        coordinates = self.data[headers[:3]].to_numpy(float)
+
+        if 'spacing' in kwargs.keys() or 'block_size' in kwargs.keys():
+            self.spacing = kwargs.get('spacing', kwargs.get('block_size'))
+        else:
+            self.spacing = self.detect_spacing(coordinates)
+
+        self.origin = kwargs.get('origin', coordinates.min(axis=0))
+
+        indices = self.snap(coordinates)
+        if indices.min() < 0:
+            raise ValueError('Coordinates are outside the grid.')
+
+        self.dimensions = kwargs.get('dimensions', indices.max(axis=0) + 1)
+        self._set_indices(indices, headers)
+
+    def _set_indices(self, indices: np.ndarray, headers: list) -> None:
+        if (indices.max(axis=0) >= self.dimensions).any():
+            raise ValueError(f'Grid indices must be lower than the dimensions {self.dimensions.tolist()}.')
+
+        ijk = pd.DataFrame(indices.astype(self.index_type(self.dimensions)), columns=['i', 'j', 'k'])
+        others = self.data.drop(columns=headers[:3]).reset_index(drop=True)
+
+        self.data = pd.concat([ijk, others], axis=1)
+        self._mapper = {'x': 'i', 'y': 'j', 'z': 'k', 'values': headers[3]}
+
+        # Columns that had the coordinates (or indices) in the original data, to snap appended rows
+        self._source_headers = list(headers[:3])
+
+    def snap(self, coordinates: np.ndarray) -> np.ndarray:
+        # Coordinates are snapped to the grid, as long as they're close enough to it
+        indices = np.rint((coordinates - self.origin) / self.spacing)
+        if indices.size > 0 and np.abs(self.origin + self.spacing * indices - coordinates).max() > \
+                1e-3 * self.spacing.min():
+            raise ValueError('Coordinates are not in a regular grid.')
+
+        return indices
+
+    def _grow(self, axis: int, indices: np.ndarray) -> int:
+        # Grows the grid along `axis` to include `indices`, moving its origin back if some of them are negative.
+        # Returns how much the indices of that axis have to be shifted to match the new origin.
+        if indices.size == 0:
+            return 0
+
+        shift = max(-int(indices.min()), 0)
+        origin, dimensions = self.origin.copy(), self.dimensions.copy()
+        origin[axis] -= shift * self.spacing[axis]
+        dimensions[axis] = max(dimensions[axis] + shift, int(indices.max()) + shift + 1)
+
+        self.origin, self.dimensions = origin, dimensions
+        return shift
+
+    @staticmethod
+    def index_type(dimensions: np.ndarray) -> type:
+        # The smallest unsigned type that can hold the indices
+        return np.uint16 if np.max(dimensions) <= np.iinfo(np.uint16).max else np.uint32
+
+    @staticmethod
+    def detect_spacing(coordinates: np.ndarray) -> np.ndarray:
+        # The spacing of each axis is the minimum distance between two different coordinates
+        spacing = []
+
+        for column in coordinates.T:
+            delta = np.diff(np.unique(column))
+            spacing.append(float(delta.min()) if delta.size > 0 else 1.0)
+
+        return np.array(spacing)
+
+    def get_autosize(self) -> np.ndarray:
+        # The grid already knows its block size
+        return np.array(self.spacing)
+
+    def append(self, data) -> None:
+        # New rows (with the columns of the original data) are snapped to the grid as in _fill_as_grid(),
+        # and the grid grows to include them, as the first chunk of a file may not have the whole grid
+        data = pd.DataFrame(data).reset_index(drop=True)
+        if self.datasets.get('color').size > 0:
+            raise ValueError('Elements with explicit colors can not be appended.')
+
+        if self._source_headers == ['i', 'j', 'k']:
+            indices = data[self._source_headers].to_numpy()
+            if indices.size > 0 and indices.min() < 0:
+                raise ValueError('Grid indices must be non-negative.')
+        else:
+            indices = self.snap(data[self._source_headers].to_numpy(float))
+
+        shifts = np.array([self._grow(axis, indices[:, axis]) for axis in range(3)])
+        index_type = self.index_type(self.dimensions)
+
+        # The indices of the current blocks move with the origin (or need a bigger type)
+        if shifts.any() or self.data['i'].dtype != index_type:
+            current = self.data[['i', 'j', 'k']].to_numpy().astype(np.int64) + shifts
+            self.data = pd.concat([pd.DataFrame(current.astype(index_type), columns=['i', 'j', 'k']),
+                                   self.data.drop(columns=['i', 'j', 'k'])], axis=1)
+
+        ijk = pd.DataFrame((indices + shifts).astype(index_type), columns=['i', 'j', 'k'])
+        super().append(pd.concat([ijk, data.drop(columns=self._source_headers)], axis=1))
+
+    """
+    Data
+    """
+    @property
+    def ijk(self) -> np.ndarray:
+        return self.cached('ijk', lambda: self.data[[self._mapper.get(k) for k in 'xyz']].to_numpy())
+
+    @property
+    def x(self) -> np.ndarray:
+        return self._get_coordinate('x')
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._get_coordinate('y')
+
+    @property
+    def z(self) -> np.ndarray:
+        return self._get_coordinate('z')
+
+    @property
+    def vertices(self) -> np.ndarray:
+        # Computed on each access (the indices are the only copy of the coordinates), so keep it while it's used
+        return (self.origin + self.spacing * self.ijk).astype(np.float32)
+
+    @x.setter
+    def x(self, _x: list) -> None:
+        self._set_coordinate('x', _x)
+
+    @y.setter
+    def y(self, _y: list) -> None:
+        self._set_coordinate('y', _y)
+
+    @z.setter
+    def z(self, _z: list) -> None:
+        self._set_coordinate('z', _z)
+
+    @vertices.setter
+    def vertices(self, vertex_list: list) -> None:
+        self.x, self.y, self.z = np.array(vertex_list).T
+
+    def _get_coordinate(self, key: str) -> np.ndarray:
+        column = self.data[self._mapper.get(key)].to_numpy()
+
+        # While the element is being filled, the grid doesn't exist yet, so we have the raw coordinates
+        if self.get_property('spacing') is None:
+            return column
+
+        axis = 'xyz'.index(key)
+        return self.origin[axis] + self.spacing[axis] * column
+
+    def _set_coordinate(self, key: str, values: list) -> None:
+        if self.get_property('spacing') is None:
+            self.data[key] = np.array(values)
+        else:
+            axis = 'xyz'.index(key)
+            indices = np.rint((np.array(values) - self.origin[axis]) / self.spacing[axis])
+            shift = self._grow(axis, indices)
+            self.data[self._mapper.get(key)] = (indices + shift).astype(self.index_type(self.dimensions))
+
+        self.invalidate()
+
+    """
+    Properties
+    """
+    @property
+    def origin(self) -> np.ndarray:
+        return self.properties.get('origin')
+
+    @property
+    def spacing(self) -> np.ndarray:
+        return self.properties.get('spacing')
+
+    @property
+    def dimensions(self) -> np.ndarray:
+        return self.properties.get('dimensions')
+
+    @property
+    def headers(self) -> list:
+        return list(self._mapper.values())
+
+    @origin.setter
+    def origin(self, _origin: list) -> None:
+        self.properties['origin'] = np.broadcast_to(np.array(_origin, float), 3).copy()
+        self.invalidate()
+
+    @spacing.setter
+    def spacing(self, _spacing: list) -> None:
+        self.properties['spacing'] = np.broadcast_to(np.array(_spacing, float), 3).copy()
+        self.invalidate()
+
+    @dimensions.setter
+    def dimensions(self, _dimensions: list) -> None:
+        self.properties['dimensions'] = np.broadcast_to(np.array(_dimensions, int), 3).copy()
+        self.invalidate()
+
+    @headers.setter
+    def headers(self, _headers: list) -> None:
+        # The coordinates are always the grid indices, only the values can be changed
+        if list(_headers[:3]) != self.headers[:3]:
+            raise ValueError(f'Coordinates of a grid must be {self.headers[:3]}, got {list(_headers[:3])}.')
+
+        self._mapper['values'] = _headers[3]
+        self.invalidate()
+
+    @property
+    def bounding_box(self) -> tuple:
+        # The bounding box of the grid, not of the blocks
+        lo = self.origin
+        hi = self.origin + self.spacing * (self.dimensions - 1)
+        return lo - (self.block_size / 2), hi + (self.block_size / 2)
+
+    """
+    Utilities
+    """
+    @property
+    def projection_index(self) -> GridIndex:
+        return self.cached('projection_index',
+                           lambda: GridIndex(self.ijk, self.origin, self.spacing, self.dimensions))
+
+    @property
+    def lookup(self) -> tuple:
+        # Linear indices of the cells that have blocks (sorted), and the index of the block of each one.
+        # Empty cells take no memory, unlike a dense array with the shape of the grid.
+        def generate() -> tuple:
+            index_type = np.int32 if len(self.ijk) < np.iinfo(np.int32).max else np.int64
+            cells = np.ravel_multi_index(tuple(self.ijk.T.astype(np.int64)), tuple(self.dimensions))
+            order = np.argsort(cells, kind='stable').astype(index_type, copy=False)
+            return cells[order], order
+
+        return self.cached('lookup', generate)
+
+    def block_at(self, i: int, j: int, k: int) -> int:
+        # Returns the index of the block in the cell (i, j, k), or -1 if there's no block there
+        # (if many blocks share the cell, the last one)
+        if not all(0 <= v < d for v, d in zip((i, j, k), self.dimensions)):
+            return -1
+
+        cells, order = self.lookup
+        cell = np.ravel_multi_index((i, j, k), tuple(self.dimensions))
+        position = np.searchsorted(cells, cell, side='right') - 1
+
+        return int(order[position]) if position >= 0 and cells[position] == cell else -1
+
+    def neighbours(self, index: int) -> np.ndarray:
+        # Returns the indices of the blocks that share a face with the block in `index`
+        i, j, k = self.ijk[index].astype(int)
+        offsets = [(-1, 0, 0), (1, 0, 0), (0, -1, 0), (0, 1, 0), (0, 0, -1), (0, 0, 1)]
+        candidates = [self.block_at(i + di, j + dj, k + dk) for di, dj, dk in offsets]
+
+        return np.array([c for c in candidates if c >= 0], int)
@@ -22,6 +22,7 @@ class LineElement(Element):
                 'x': list[float],
                 'y': list[float],
                 'z': list[float],
+                'offsets': list[int] (Optional)
             }
             'properties': {
                 'thickness': int,
@@ -34,9 +35,32 @@ class LineElement(Element):
                 'extension': str | None
             }
         }
+
+        A LineElement can hold several polylines in the same vertex array,
+        where polyline `i` goes from offsets[i] to offsets[i + 1].
+        It can also be filled with 'polylines' (a list of (N, 3) arrays).
+        Without offsets, the whole vertex array is a single polyline.
         """
         super().__init__(*args, **kwargs)
 
+    """
+    Element filling
+    """
+    def _fill_element(self, *args, **kwargs) -> None:
+        if 'polylines' in kwargs.keys():
+            self._fill_as_polylines(*args, **kwargs)
+        else:
+            super()._fill_element(*args, **kwargs)
+            source = kwargs.get('data', kwargs)
+            if 'offsets' in source.keys():
+                self.offsets = source.get('offsets')
+
+    def _fill_as_polylines(self, *args, **kwargs) -> None:
+        polylines = [np.array(p, np.float32).reshape((-1, 3)) for p in kwargs.get('polylines')]
+
+        self.vertices = np.concatenate(polylines) if polylines else np.empty((0, 3), np.float32)
+        self.offsets = np.concatenate(([0], np.cumsum([len(p) for p in polylines])))
+
     def _fill_properties(self, *args, **kwargs) -> None:
         super()._fill_properties(*args, **kwargs)
         self.thickness = kwargs.get('thickness', 1.0)
@@ -47,10 +71,45 @@ class LineElement(Element):
         if len(self.vertices) < 2:
             raise ValueError("Not enough data to create this element.")
 
-        # Append first vertex to self.vertices if a loop was enabled
+        offsets = self.offsets
+        if offsets[0] != 0 or offsets[-1] != self.x.size or np.any(np.diff(offsets) < 1):
+            raise ValueError(f'Offsets must increase from 0 to {self.x.size}, got {offsets.tolist()}.')
+
+        # Append the first vertex of each polyline to itself if a loop was enabled
         if self.loop:
-            self.vertices = np.append(self.vertices, [self.vertices[0, :]], axis=0)
+            self.vertices = np.insert(self.vertices, offsets[1:], self.vertices[offsets[:-1]], axis=0)
+            if self.is_multiple:
+                self.offsets = offsets + np.arange(len(offsets))
 
+    """
+    Polylines
+    """
+    @property
+    def offsets(self) -> np.ndarray:
+        # A single polyline doesn't need offsets, so the vertices can be replaced freely
+        if 'offsets' not in self.data.keys():
+            return np.array([0, self.x.size])
+        return self.data.get('offsets')
+
+    @offsets.setter
+    def offsets(self, _offsets: list) -> None:
+        self.data['offsets'] = np.array(_offsets, np.int64)
+        self.invalidate()
+
+    @property
+    def is_multiple(self) -> bool:
+        return 'offsets' in self.data.keys()
+
+    @property
+    def num_polylines(self) -> int:
+        return len(self.offsets) - 1
+
+    def polyline(self, index: int) -> np.ndarray:
+        return self.vertices[self.offsets[index]:self.offsets[index + 1]]
+
+    """
+    Properties
+    """
     @property
     def loop(self) -> bool:
         return self.properties.get('loop')
@@ -75,4 +134,4 @@ class LineElement(Element):
         if not Intersections.aabb_intersection(origin, ray, *self.bounding_box):
             return np.empty(0)
 
-        return Intersections.ray_with_lines(origin, ray, self.vertices)
+        return Intersections.ray_with_lines(origin, ray, self.vertices, offsets=self.offsets)
@@ -5,10 +5,14 @@
 #  Distributed under the MIT License.
 #  See LICENSE for more info.
 
-import meshcut
 import numpy as np
 
+from ..bvh import BVH
 from ..intersections import Intersections
+from ..meshclassifier import MeshClassifier
+from ..meshlod import MeshLOD
+from ..meshslicer import MeshSlicer
+from ..spatialchunks import SpatialChunks
 from .element import Element
 
 
@@ -34,6 +38,16 @@ class MeshElement(Element):
                 'extension': str | None
             }
         }
+
+        The BVH (see bvh.py) used in ray intersections, the MeshClassifier
+        (see meshclassifier.py) used to detect points inside the mesh, and the
+        MeshSlicer (see meshslicer.py) used in cross-sections, are built
+        on demand, and cached until the vertices or indices change.
+
+        The levels of detail (see meshlod.py) are slower to build, so they're only
+        built when build_lod() is called (usually in the background), and the
+        drawables use them only if they're ready. Picking and slicing always use
+        the full resolution.
         """
         super().__init__(*args, **kwargs)
 
@@ -91,11 +105,12 @@ class MeshElement(Element):
     @indices.setter
     def indices(self, indices) -> None:
         # GL_UNSIGNED_INT = np.uint32
-        self.data['indices'] = np.array(indices, np.uint32)
+        self.data['indices'] = self.as_array(indices, np.uint32)
+        self.invalidate()
 
     @property
     def triangles(self) -> np.ndarray:
-        return self.vertices[self.indices].flatten().reshape((-1, 3))
+        return self.cached('triangles', lambda: self.vertices[self.indices].flatten().reshape((-1, 3)))
 
     @triangles.setter
     def triangles(self, values) -> None:
@@ -104,6 +119,31 @@ class MeshElement(Element):
         self.vertices = vertices.reshape((-1, 3))
         self.indices = indices.reshape((-1, 3))
 
+    @property
+    def bvh(self) -> BVH:
+        return self.cached('bvh', lambda: BVH(self.vertices, self.indices))
+
+    @property
+    def classifier(self) -> MeshClassifier:
+        return self.cached('classifier', lambda: MeshClassifier(self.vertices, self.indices))
+
+    @property
+    def slicer(self) -> MeshSlicer:
+        return self.cached('slicer', lambda: MeshSlicer(self.vertices, self.indices))
+
+    @property
+    def chunks(self) -> SpatialChunks:
+        # Spatial chunks of the triangles, so the drawables can cull them (see SpatialChunks)
+        return self.cached('chunks', lambda: SpatialChunks.from_triangles(self.vertices, self.indices))
+
+    @property
+    def lod(self) -> MeshLOD:
+        # Levels of detail of the mesh, or None if they weren't built yet (see build_lod())
+        return self.cached_value('lod')
+
+    def build_lod(self) -> MeshLOD:
+        return self.cached('lod', lambda: MeshLOD(self.vertices, self.indices, self.chunks))
+
     """
     Utilities
     """
@@ -130,46 +170,23 @@ class MeshElement(Element):
 
     def slice_with_plane(self, origin: np.ndarray, normal: np.ndarray) -> list:
         # Returns a list with the slices (in case we have a concave mesh)
+        return self.slicer.slice_with_plane(origin, normal)
 
-        def intersect_edges(vertices_a: np.ndarray, vertices_b: np.ndarray) -> np.ndarray:
-            # Returns a mask of all edges that *might* be sliced by the plane
-            # Adapted from https://en.wikipedia.org/wiki/Line%E2%80%93plane_intersection
-            epsilon = 1e-6
-
-            diff_dot_n = np.dot(origin - vertices_a, normal)
-            l_dot_n = np.dot(vertices_b - vertices_a, normal)
-            t = diff_dot_n / l_dot_n
-
-            # Edge is completely contained in plane
-            mask_full = abs(l_dot_n) < epsilon
-            mask_full &= abs(diff_dot_n) < epsilon
-
-            # One intersection
-            mask_point = 0.0 <= t
-            mask_point &= t <= 1.0
+    def slice_with_planes(self, normal: np.ndarray, offsets: list) -> list:
+        # Returns a list with the slices of each plane `dot(normal, x) = offset`
+        return self.slicer.slice_with_planes(normal, offsets)
 
-            return mask_full | mask_point
-
-        def preprocess_triangles(triangles: np.ndarray) -> np.ndarray:
-            # Pre-processes the triangles by each of their edges
-            mask_a = intersect_edges(triangles[0::3], triangles[1::3])
-            mask_b = intersect_edges(triangles[1::3], triangles[2::3])
-            mask_c = intersect_edges(triangles[2::3], triangles[0::3])
-
-            return mask_a | mask_b | mask_c
-
-        mask = preprocess_triangles(self.triangles)
-
-        try:
-            return meshcut.cross_section(self.vertices, self.indices[mask], np.array(origin), np.array(normal))
-        except AssertionError:
-            # Meshcut doesn't want to slice
-            print(f'WARNING: Mesh {self.name} (id = {self.id}) cannot be sliced, fix your mesh!')
-            return []
+    def contains_points(self, points: np.ndarray) -> np.ndarray:
+        # Returns a mask of the points that are inside the mesh (assuming it's closed)
+        return self.classifier.contains(points)
 
     def intersect_with_ray(self, origin: np.ndarray, ray: np.ndarray) -> np.ndarray:
         # Early AABB detection test
         if not Intersections.aabb_intersection(origin, ray, *self.bounding_box):
             return np.empty(0)
 
-        return Intersections.ray_with_triangles(origin, ray, self.triangles)
+        return self.bvh.intersect_with_ray(origin, ray)
+
+    def intersect_with_rays(self, origins: np.ndarray, rays: np.ndarray) -> np.ndarray:
+        # Returns the ray parameter `t` of the first hit of each ray (origin + t * ray), or np.inf if there's none
+        return self.bvh.intersect_with_rays(origins, rays)
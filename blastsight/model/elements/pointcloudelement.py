@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from .pointelement import PointElement
+from ..pointoctree import PointOctree
+
+
+class PointCloudElement(PointElement):
+    def __init__(self, *args, **kwargs):
+        """
+        PointCloudElement is a class inheriting from PointElement, for point clouds that don't fit in memory.
+
+        {
+            'octree': PointOctree,
+            'properties': {
+                (Same as PointElement)
+            }
+            'metadata': {
+                'id': int,
+                'name': str | None,
+                'extension': str | None
+            }
+        }
+
+        The points live in a PointOctree (see pointoctree.py), and only its root node
+        (a random subsample of the whole point cloud) is loaded as the data of the element,
+        so slices and intersections work with that subsample.
+        The drawables stream the rest of the nodes (see PointCloudGL).
+        """
+        super().__init__(*args, **kwargs)
+
+    """
+    Element filling
+    """
+    def _fill_element(self, *args, **kwargs) -> None:
+        self._octree = kwargs.get('octree')
+        if not isinstance(self._octree, PointOctree):
+            raise KeyError(f'Data must contain "octree", got {list(kwargs.keys())}.')
+
+        vertices, values = self._octree.read(0) if self._octree.num_nodes > 0 else (np.empty((0, 3)), np.empty(0))
+        super()._fill_element(vertices=vertices, values=values)
+
+    def _fill_properties(self, *args, **kwargs) -> None:
+        # The limits are the ones of the whole point cloud, not only the ones of the subsample
+        kwargs['vmin'] = kwargs.get('vmin', self._octree.vmin)
+        kwargs['vmax'] = kwargs.get('vmax', self._octree.vmax)
+        super()._fill_properties(*args, **kwargs)
+
+    """
+    Data
+    """
+    @property
+    def octree(self) -> PointOctree:
+        return self._octree
+
+    @property
+    def num_points(self) -> int:
+        return self._octree.num_points
+
+    @property
+    def bounding_box(self) -> tuple:
+        return np.array(self._octree.lo), np.array(self._octree.hi)
@@ -7,6 +7,7 @@
 
 import numpy as np
 from .dfelement import DFElement
+from ..spatialchunks import SpatialChunks
 
 
 class PointElement(DFElement):
@@ -55,6 +56,12 @@ class PointElement(DFElement):
         self.marker = kwargs.get('marker', 'square')
         self.point_size = kwargs.get('point_size', float(kwargs.get('avg_size', 1.0)))
 
+    def append(self, data) -> None:
+        # New points get the average size of the current ones
+        size = self.avg_size
+        super().append(data)
+        self.point_size = np.append(self.point_size, np.full(self.x.size - self.point_size.size, size))
+
     """
     Properties
     """
@@ -66,6 +73,14 @@ class PointElement(DFElement):
     def point_size(self) -> np.ndarray:
         return self.datasets.get('size')
 
+    @property
+    def chunks(self) -> SpatialChunks:
+        # Each point has its own size, so the chunks grow by the biggest point of each one
+        def generate() -> SpatialChunks:
+            return SpatialChunks.from_points(self.vertices, self.point_size[:, np.newaxis] / 2)
+
+        return self.cached('chunks', generate)
+
     @property
     def marker_num(self) -> int:
         return self.marker_dict.get(self.marker, 0)
@@ -80,10 +95,12 @@ class PointElement(DFElement):
 
     @point_size.setter
     def point_size(self, _size) -> None:
+        # The chunks depend on the sizes, so they bump the version like the data
         if '__len__' in dir(_size):
             self.datasets['size'] = np.array(_size, np.float32)
         else:
             self.datasets['size'] = np.tile(_size, self.x.size).astype(np.float32)
+        self.invalidate()
 
     @marker.setter
     def marker(self, _marker: str) -> None:
@@ -95,3 +112,7 @@ class PointElement(DFElement):
     def slice_with_plane(self, origin: np.ndarray, normal: np.ndarray) -> np.ndarray:
         # Implementation abstracted in dfelement.py
         return super().slice_with_plane_and_threshold(origin, normal, threshold=self.avg_size / 2)
+
+    def slice_with_planes(self, normal: np.ndarray, offsets: list) -> list:
+        # Implementation abstracted in dfelement.py
+        return super().slice_with_planes_and_threshold(normal, offsets, threshold=self.avg_size / 2)
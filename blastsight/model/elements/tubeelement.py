@@ -82,14 +82,5 @@ class TubeElement(Element):
     Utilities
     """
     def as_mesh(self) -> tuple:
-        vertices = []
-        indices = []
-        delta = 0
-
-        for v0, v1 in zip(self.vertices[:-1], self.vertices[1:]):
-            c_vertices, c_faces = tubeutils.cylinder(self.radius, self.resolution, [v0, v1])
-            vertices.append(c_vertices)
-            indices.append(c_faces + delta)
-            delta += (c_faces.max() + 1)
-
-        return np.concatenate(vertices), np.concatenate(indices)
+        # One cylinder per segment, all of them generated at once
+        return tubeutils.cylinders(self.radius, self.resolution, self.vertices[:-1], self.vertices[1:])
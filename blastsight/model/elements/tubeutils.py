@@ -12,55 +12,86 @@ import numpy as np
 
 
 def cylinder(radius: float, resolution: int, segment: tuple) -> tuple:
-    Z = np.array([0.0, 0.0, 1.0])
     p0, p1 = segment
 
-    axis = p1 - p0
-    length = np.linalg.norm(axis)
+    return cylinders(radius, resolution, np.array([p0], float), np.array([p1], float))
+
 
-    if length <= 1e-12:
-        axis = Z
+def cylinders(radius: float, resolution: int, starts: np.ndarray, ends: np.ndarray) -> tuple:
+    # Batched version of cylinder(), for the segments (starts[i], ends[i]).
+    # Each cylinder has the same layout of cylinder(), and its indices are shifted by its vertices.
+    Z = np.array([0.0, 0.0, 1.0])
+    starts = np.asarray(starts, float).reshape((-1, 3))
+    ends = np.asarray(ends, float).reshape((-1, 3))
+
+    axes = ends - starts
+    lengths = np.linalg.norm(axes, axis=1)
+    axes[lengths <= 1e-12] = Z
 
     angles = np.linspace(0, 2 * np.pi, resolution + 1)[:-1]
     rim = np.column_stack((np.sin(angles), np.cos(angles), np.zeros(angles.size)))
-    rot = to_matrix(quat_from_data(Z, axis))
+    rots = to_matrices(quats_from_z(axes))
+
+    # Rim of each cylinder, as rows of (resolution, 3)
+    rims = np.einsum('nij,rj->nri', rots, rim) * radius
+
+    vertices = np.concatenate([starts[:, np.newaxis], ends[:, np.newaxis],
+                               rims + starts[:, np.newaxis], rims + ends[:, np.newaxis]], axis=1)
+
+    faces = cylinder_indices(resolution)
+    shift = np.arange(len(starts)) * (2 * resolution + 2)
+    indices = faces[np.newaxis] + shift[:, np.newaxis, np.newaxis]
+
+    return vertices.reshape((-1, 3)), indices.reshape((-1, 3))
+
 
-    bottom_rim = np.dot(rot, rim.T).T * radius + p0
-    top_rim = np.dot(rot, rim.T).T * radius + p1
+def tubes(radius: float, resolution: int, polylines: list) -> tuple:
+    # One cylinder for each segment of every polyline, all of them in the same mesh
+    starts = np.concatenate([np.asarray(p, float).reshape((-1, 3))[:-1] for p in polylines])
+    ends = np.concatenate([np.asarray(p, float).reshape((-1, 3))[1:] for p in polylines])
 
-    vertices = np.vstack([[p0, p1], bottom_rim, top_rim])
+    return cylinders(radius, resolution, starts, ends)
 
+
+def cylinder_indices(resolution: int) -> np.ndarray:
     vec_resolution = np.arange(resolution)
+    next_resolution = np.remainder(vec_resolution + 1, resolution)
 
     # Bottom fan
-    bottom_fan = np.zeros((resolution, 3))
-    bottom_fan[:, 0] = np.zeros(resolution)
-    bottom_fan[:, 1] = np.remainder(vec_resolution + 1, resolution) + 2
-    bottom_fan[:, 2] = vec_resolution + 2
+    bottom_fan = np.column_stack((np.zeros(resolution, int), next_resolution + 2, vec_resolution + 2))
 
     # Top fan
-    top_fan = np.zeros((resolution, 3))
-    top_fan[:, 0] = np.ones(resolution)
-    top_fan[:, 1] = vec_resolution + resolution + 2
-    top_fan[:, 2] = np.remainder(vec_resolution + 1, resolution) + resolution + 2
+    top_fan = np.column_stack((np.ones(resolution, int), vec_resolution + resolution + 2,
+                               next_resolution + resolution + 2))
 
     # Sides
-    side_a = np.zeros((resolution, 3))
-    side_a[:, 0] = vec_resolution + 2
-    side_a[:, 1] = np.remainder(vec_resolution + 1, resolution) + 2
-    side_a[:, 2] = vec_resolution + 2 + resolution
+    side_a = np.column_stack((vec_resolution + 2, next_resolution + 2, vec_resolution + 2 + resolution))
+    side_b = np.column_stack((vec_resolution + 2 + resolution, next_resolution + 2,
+                              next_resolution + 2 + resolution))
+
+    return np.vstack([bottom_fan, top_fan, side_a, side_b])
+
+
+def quats_from_z(axes: np.ndarray) -> np.ndarray:
+    # Batched version of quat_from_data(Z, axis), for every axis at once
+    eps = 1e-12
+    axes = axes / np.linalg.norm(axes, axis=1, keepdims=True)
+    c = axes[:, 2]
 
-    side_b = np.zeros((resolution, 3))
-    side_b[:, 0] = vec_resolution + 2 + resolution
-    side_b[:, 1] = np.remainder(vec_resolution + 1, resolution) + 2
-    side_b[:, 2] = np.remainder(vec_resolution + 1, resolution) + 2 + resolution
+    # cross(Z, axis), or Z itself for parallel vectors
+    rot_axes = np.column_stack((-axes[:, 1], axes[:, 0], np.zeros(len(axes))))
+    l = np.linalg.norm(rot_axes, axis=1)
+    rot_axes[l > 0.0] /= l[l > 0.0, np.newaxis]
+    rot_axes[l <= 0.0] = [0.0, 0.0, 1.0]
 
-    side = np.append(side_a, side_b).astype(int)
-    side = side.reshape((-1, 3), order='C')
+    w_sq = 0.5 * (1.0 + c)
+    quats = np.column_stack((np.sqrt(w_sq), np.sqrt(1.0 - w_sq)[:, np.newaxis] * rot_axes))
 
-    indices = np.vstack([bottom_fan, top_fan, side])
+    # Opposite vectors (rare) need a SVD each
+    for i in np.flatnonzero(c < -1.0 + eps):
+        quats[i] = quat_from_data(np.array([0.0, 0.0, 1.0]), axes[i].copy())
 
-    return vertices, indices
+    return quats
 
 
 def quat_from_data(v1: np.ndarray, v2: np.ndarray) -> np.ndarray:
@@ -97,3 +128,8 @@ def to_matrix(a: np.ndarray) -> np.ndarray:
         [2 * a[1] * a[3] - 2 * a[2] * a[0], 2 * a[2] * a[3] + 2 * a[1] * a[0],
          1 - 2 * a[1] * a[1] - 2 * a[2] * a[2]],
     ])
+
+
+def to_matrices(a: np.ndarray) -> np.ndarray:
+    # Batched version of to_matrix(), for quaternions as rows of (N, 4)
+    return to_matrix(a.T).transpose((2, 0, 1))
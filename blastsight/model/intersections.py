@@ -35,6 +35,25 @@ class Intersections:
 
         return tmax > max(tmin, 0.0)
 
+    @staticmethod
+    def ray_with_aabbs(origin: np.ndarray,
+                       ray: np.ndarray,
+                       b_mins: np.ndarray,
+                       b_maxs: np.ndarray) -> np.ndarray:
+        # Vectorized version of aabb_intersection, for multiple boxes at once.
+        # Returns a mask of the boxes that are hit by the ray.
+        # Also works with one ray per box, if origin and ray have the same shape as the boxes.
+        # NaNs (0 * inf) are ignored by np.fmin/np.fmax, so flat boxes are still detected.
+        with np.errstate(divide='ignore', invalid='ignore'):
+            ray_inv = 1.0 / ray
+            t1 = (b_mins - origin) * ray_inv
+            t2 = (b_maxs - origin) * ray_inv
+
+        tmin = np.fmax.reduce(np.fmin(t1, t2), axis=1)
+        tmax = np.fmin.reduce(np.fmax(t1, t2), axis=1)
+
+        return tmax >= np.maximum(tmin, 0.0)
+
     @staticmethod
     def ray_with_plane(origin: np.ndarray,
                        ray: np.ndarray,
@@ -92,12 +111,48 @@ class Intersections:
         intersections = origin + ray * t[mask].reshape(-1, 1)
         return np.unique(intersections, axis=0) if intersections.size > 0 else np.array(list())
 
+    @staticmethod
+    def rays_with_triangles(origins: np.ndarray,
+                            rays: np.ndarray,
+                            triangles: np.ndarray) -> np.ndarray:
+        # Pairwise version of ray_with_triangles: ray `i` is only tested against triangle `i`.
+        # Returns the ray parameter `t` of each intersection (origin + t * ray), or np.inf if there's none.
+        vertex0 = triangles[:, 0]
+        edge1 = triangles[:, 1] - vertex0
+        edge2 = triangles[:, 2] - vertex0
+
+        h = np.cross(rays, edge2)
+        a = (edge1 * h).sum(axis=1)
+
+        mask = abs(a) > 1e-12  # False => Ray is parallel to triangle.
+
+        # Result of division by zero used deliberately
+        with np.errstate(divide='ignore', invalid='ignore'):
+            f = 1.0 / a
+            s = origins - vertex0
+            u = f * (s * h).sum(axis=1)
+
+            mask = (0.0 <= u) & (u <= 1.0) & mask
+
+            q = np.cross(s, edge1)
+            v = f * (rays * q).sum(axis=1)
+
+            mask = (v >= 0.0) & (u + v <= 1.0) & mask
+
+            t = f * (edge2 * q).sum(axis=1)
+
+            mask = (t > 1e-12) & mask  # Ray intersections
+
+        return np.where(mask, t, np.inf)
+
     @staticmethod
     def ray_with_lines(origin: np.ndarray,
                        ray: np.ndarray,
                        vertices: np.ndarray,
-                       threshold: float = 1e-2) -> np.ndarray:
+                       threshold: float = 1e-2,
+                       offsets: np.ndarray = None) -> np.ndarray:
         # Adapted from https://www.codefull.net/2015/06/intersection-of-a-ray-and-a-line-segment-in-3d/
+        # If `offsets` is given, `vertices` has several polylines, so the segments between them are skipped
 
         ba = np.diff(vertices, axis=0)
         ao = vertices[:-1] - origin
@@ -121,4 +176,38 @@ class Intersections:
         # Mask is True if the ray is between the start and end of each segment
         mask_inside = length_ai + length_ib <= length_ab + threshold
 
+        if offsets is not None:
+            mask_inside[np.asarray(offsets)[1:-1] - 1] = False
+
         return intersections[mask_threshold & mask_inside]
+
+    @staticmethod
+    def ray_with_segments(origin: np.ndarray,
+                          ray: np.ndarray,
+                          starts: np.ndarray,
+                          ends: np.ndarray) -> tuple:
+        # Returns the ray parameter `t` (origin + t * ray) of the point closest to each segment, and their distances.
+        # Adapted from "Real-Time Collision Detection" (Christer Ericson), section 5.1.9
+        d = ends - starts
+        r = origin - starts
+
+        a = np.dot(ray, ray)
+        b = d @ ray
+        c = r @ ray
+        e = utils.magnitude2_by_row(d)
+        f = utils.dot_by_row(d, r)
+
+        # Closest point of each segment to the (infinite) line, or its start if they're parallel
+        denominator = a * e - b * b
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = np.where(denominator > 1e-12 * a * e, (a * f - b * c) / denominator, 0.0)
+        s = np.clip(s, 0.0, 1.0)
+
+        # Closest point of the ray to that point, and the closest point of the segment to it again
+        t = np.maximum((b * s - c) / a, 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            s = np.clip(np.where(e > 0.0, (b * t + f) / e, 0.0), 0.0, 1.0)
+
+        distances = utils.magnitude_by_row(origin + t.reshape((-1, 1)) * ray - (starts + s.reshape((-1, 1)) * d))
+
+        return t, distances
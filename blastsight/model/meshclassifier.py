@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+class MeshClassifier:
+    # Points classified by each thread in contains()
+    CHUNK_SIZE = 1 << 16
+
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray):
+        """
+        MeshClassifier detects which points are inside a closed mesh, with a rasterized parity test.
+
+        From each point, a vertical ray is cast upwards (+Z), and the point is inside the mesh
+        if the ray crosses the surface an odd number of times. Since every ray is vertical,
+        the triangles are projected over the XY plane and binned in a uniform 2D grid,
+        so each point is only tested against the triangles of its cell.
+
+        The edges are tested like a rasterizer does (with a top-left rule, and with shared edges
+        evaluated in the same direction), so a ray passing exactly through an edge or a vertex
+        is counted only once.
+        """
+        vertices = np.asarray(vertices, np.float64).reshape((-1, 3))
+        indices = np.asarray(indices, np.int64).reshape((-1, 3))
+
+        # Vertical triangles are invisible to vertical rays
+        triangles = vertices[indices]
+        area = self.edge_function(triangles[:, 0], triangles[:, 1], triangles[:, 2])
+        indices = indices[area != 0.0]
+        area = area[area != 0.0]
+
+        # Every triangle is stored counter-clockwise (seen from above)
+        clockwise = area < 0.0
+        indices[clockwise] = indices[clockwise][:, [0, 2, 1]]
+
+        self.vertices = vertices
+        self.indices = indices
+        self.area = np.abs(area)
+
+        self.lo = vertices[:, :2].min(axis=0, initial=np.inf)
+        self.hi = vertices[:, :2].max(axis=0, initial=-np.inf)
+        self.top = vertices[:, 2].max(initial=-np.inf)
+
+        self.shape = np.ones(2, int)
+        self.cell_size = np.ones(2)
+        self.offsets = np.zeros(2, int)
+        self.cell_triangles = np.empty(0, int)
+        self._build_grid()
+
+    @property
+    def num_triangles(self) -> int:
+        return len(self.indices)
+
+    @staticmethod
+    def edge_function(a: np.ndarray, b: np.ndarray, p: np.ndarray) -> np.ndarray:
+        # Twice the signed area of (a, b, p) in the XY plane (positive if p is at the left of a -> b)
+        return (b[..., 0] - a[..., 0]) * (p[..., 1] - a[..., 1]) - (b[..., 1] - a[..., 1]) * (p[..., 0] - a[..., 0])
+
+    def _build_grid(self) -> None:
+        if self.num_triangles == 0:
+            return
+
+        # Roughly one cell per triangle, following the proportions of the mesh
+        extent = np.maximum(self.hi - self.lo, 1e-9)
+        nx = int(np.clip(np.ceil(np.sqrt(self.num_triangles * extent[0] / extent[1])), 1, self.num_triangles))
+        ny = int(np.clip(np.ceil(self.num_triangles / nx), 1, self.num_triangles))
+
+        self.shape = np.array([nx, ny])
+        self.cell_size = extent / self.shape
+
+        # Cells covered by the bounding box of each triangle
+        triangles = self.vertices[self.indices][:, :, :2]
+        first = self.cell_of(triangles.min(axis=1))
+        last = self.cell_of(triangles.max(axis=1))
+        del triangles
+
+        width = last[:, 0] - first[:, 0] + 1
+        counts = width * (last[:, 1] - first[:, 1] + 1)
+
+        # One (cell, triangle) pair per covered cell, grouped by cell
+        triangle_ids = np.repeat(np.arange(self.num_triangles), counts)
+        local = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cx = first[triangle_ids, 0] + local % width[triangle_ids]
+        cy = first[triangle_ids, 1] + local // width[triangle_ids]
+        cells = cy * nx + cx
+
+        self.cell_triangles = triangle_ids[np.argsort(cells, kind='stable')]
+        self.offsets = np.concatenate(([0], np.cumsum(np.bincount(cells, minlength=nx * ny))))
+
+    def cell_of(self, points: np.ndarray) -> np.ndarray:
+        # Returns the (clamped) cell of each point, as [column, row]
+        cells = np.floor((points[..., :2] - self.lo) / self.cell_size).astype(int)
+        return np.clip(cells, 0, self.shape - 1)
+
+    def crossings(self, points: np.ndarray) -> np.ndarray:
+        # Returns how many triangles are crossed by the vertical ray of each point
+        points = np.asarray(points, np.float64).reshape((-1, 3))
+        result = np.zeros(len(points), int)
+
+        # Points outside of the projection (or above the mesh) can't hit anything
+        candidates = np.flatnonzero(np.all((points[:, :2] >= self.lo) & (points[:, :2] <= self.hi), axis=1)
+                                    & (points[:, 2] <= self.top))
+        if candidates.size == 0 or self.num_triangles == 0:
+            return result
+
+        # Every (point, triangle) pair to be tested
+        cx, cy = self.cell_of(points[candidates]).T
+        cells = cy * self.shape[0] + cx
+        counts = self.offsets[cells + 1] - self.offsets[cells]
+        starts = np.repeat(self.offsets[cells] - (np.cumsum(counts) - counts), counts)
+
+        point_ids = np.repeat(candidates, counts)
+        triangle_ids = self.cell_triangles[starts + np.arange(counts.sum())]
+
+        p = points[point_ids]
+        triangle_indices = self.indices[triangle_ids]
+        inside = np.ones(len(p), bool)
+        weights = []
+
+        # Edges (b, c), (c, a) and (a, b), where the weight of each edge belongs to its opposite vertex
+        for i, j in [(1, 2), (2, 0), (0, 1)]:
+            start, end = triangle_indices[:, i], triangle_indices[:, j]
+
+            # Shared edges are evaluated from the lowest vertex index, so both sides get the same (negated) result
+            flip = start > end
+            u = self.vertices[np.where(flip, end, start)]
+            v = self.vertices[np.where(flip, start, end)]
+            w = np.where(flip, -1.0, 1.0) * self.edge_function(u, v, p)
+
+            # Top-left rule: points exactly on an edge belong to only one of its triangles
+            dx = np.where(flip, u[:, 0] - v[:, 0], v[:, 0] - u[:, 0])
+            dy = np.where(flip, u[:, 1] - v[:, 1], v[:, 1] - u[:, 1])
+            owner = (dy < 0.0) | ((dy == 0.0) & (dx > 0.0))
+
+            inside &= (w > 0.0) | ((w == 0.0) & owner)
+            weights.append(w)
+
+        # Height of the hit, interpolated with barycentric coordinates
+        z = self.vertices[triangle_indices, 2]
+        height = (weights[0] * z[:, 0] + weights[1] * z[:, 1] + weights[2] * z[:, 2]) / self.area[triangle_ids]
+        hits = inside & (height > p[:, 2])
+
+        return result + np.bincount(point_ids[hits], minlength=len(points))
+
+    def contains(self, points: np.ndarray) -> np.ndarray:
+        # Returns a mask of the points that are inside the mesh
+        points = np.asarray(points, np.float64).reshape((-1, 3))
+        mask = np.empty(len(points), bool)
+
+        def classify_chunk(start: int) -> None:
+            end = start + self.CHUNK_SIZE
+            mask[start:end] = self.crossings(points[start:end]) % 2 == 1
+
+        # Numpy releases the GIL in most of the work, so big arrays are split between threads
+        if len(points) <= self.CHUNK_SIZE:
+            classify_chunk(0)
+        else:
+            with ThreadPoolExecutor() as pool:
+                list(pool.map(classify_chunk, range(0, len(points), self.CHUNK_SIZE)))
+
+        return mask
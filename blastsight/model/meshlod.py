@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from .spatialchunks import SpatialChunks
+
+
+class MeshLOD:
+    # Levels are added while they reduce the number of triangles to at least this fraction
+    MIN_REDUCTION = 0.75
+    MAX_LEVELS = 8
+
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray, chunks: SpatialChunks):
+        """
+        MeshLOD precomputes a chain of decimated index buffers of a mesh, for each of its spatial chunks.
+
+        Every level is made by vertex clustering with quadric error metrics (Lindstrom, 2000):
+        the vertices are grouped by the cells of a grid, and each group collapses into the vertex
+        that minimizes the sum of the quadrics (the squared distances to the planes of the triangles)
+        of the group. Triangles that become degenerate (or duplicated) are removed.
+        Each level doubles the side of the cells, and vertices in the boundary of the mesh are never moved,
+        so the holes and borders of the mesh are preserved.
+
+        As the vertices are only replaced by other vertices, every level uses the same vertex buffer.
+        Level 0 has the original triangles (sorted by chunk), and the triangles of the chunk `c` in level `k`
+        go from starts[k] + offsets[k][c] to starts[k] + offsets[k][c + 1] (like BlockOctree).
+        """
+        vertices = np.asarray(vertices, float).reshape((-1, 3))
+        self.num_chunks = chunks.num_chunks
+
+        # Level 0 is sorted by chunk, as the drawables upload the original triangles
+        triangles = np.asarray(indices, np.int64).reshape((-1, 3))[chunks.order]
+        chunk_ids = np.repeat(np.arange(self.num_chunks), np.diff(chunks.offsets))
+
+        quadrics = self.vertex_quadrics(vertices, triangles)
+        boundary = self.boundary_vertices(triangles, len(vertices))
+
+        lo, hi = (vertices.min(axis=0), vertices.max(axis=0)) if len(vertices) else (np.zeros(3), np.zeros(3))
+        edges = vertices[triangles] - vertices[np.roll(triangles, 1, axis=1)]
+        cell = 2.0 * np.linalg.norm(edges, axis=2).mean() if len(triangles) else np.inf
+        del edges
+
+        # Coarser levels only cluster the vertices left by the previous level (with the quadrics of their clusters),
+        # starting by the vertices that belong to a triangle
+        active = np.unique(triangles)
+        quadrics = quadrics[active]
+        levels = [(triangles, chunk_ids)]
+        sizes = [0.0]
+        while len(levels) < self.MAX_LEVELS and cell < np.linalg.norm(hi - lo):
+            clusters, representatives, cluster_quadrics = self.cluster(vertices[active], quadrics,
+                                                                       boundary[active], lo, cell)
+            remap = np.arange(len(vertices))
+            remap[active] = active[representatives[clusters]]
+            parent = self.collapse(remap, *levels[-1])
+
+            if len(parent[0]) == 0:
+                break
+            if len(parent[0]) <= self.MIN_REDUCTION * len(levels[-1][0]):
+                levels.append(parent)
+                sizes.append(cell)
+
+                active, quadrics = active[representatives], cluster_quadrics
+
+            cell *= 2.0
+
+        # Everything concatenated, with the size of the cells (the geometric error) of each level
+        self.num_levels = len(levels)
+        self.level_sizes = np.array(sizes)
+        self.indices = np.concatenate([t for t, _ in levels]).astype(np.uint32)
+
+        self.starts = np.cumsum([0] + [len(t) for t, _ in levels])[:-1]
+        self.offsets = np.array([np.searchsorted(ids, np.arange(self.num_chunks + 1)) for _, ids in levels], np.int64)
+
+        # The chunks of every level are culled with the same boxes, so they must contain all of them
+        self.chunks = SpatialChunks(chunks.order, chunks.offsets, *self.bounds(vertices, chunks))
+
+    @property
+    def num_triangles(self) -> int:
+        return len(self.indices)
+
+    def level_size(self, level: int) -> int:
+        return int(self.offsets[level][-1])
+
+    """
+    Decimation
+    """
+    @staticmethod
+    def vertex_quadrics(vertices: np.ndarray, triangles: np.ndarray) -> np.ndarray:
+        # Sum of the quadrics (weighted by area) of the triangles around each vertex, as the 10 unique
+        # coefficients of the symmetric 4x4 matrix: aa, ab, ac, ad, bb, bc, bd, cc, cd, dd
+        corners = vertices[triangles]
+        crosses = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])
+        areas = np.linalg.norm(crosses, axis=1) / 2
+
+        normals = crosses / np.where(areas > 0.0, 2 * areas, 1.0)[:, np.newaxis]
+        planes = np.column_stack((normals, -np.einsum('ij,ij->i', normals, corners[:, 0])))
+
+        rows, cols = np.triu_indices(4)
+        coefficients = planes[:, rows] * planes[:, cols] * areas[:, np.newaxis]
+
+        return np.column_stack([np.bincount(triangles.ravel(), np.repeat(c, 3), len(vertices))
+                                for c in coefficients.T])
+
+    @staticmethod
+    def quadric_errors(quadrics: np.ndarray, vertices: np.ndarray) -> np.ndarray:
+        # Evaluates v^T Q v for each (quadric, vertex) pair, where v = (x, y, z, 1)
+        homogeneous = np.column_stack((vertices, np.ones(len(vertices))))
+        rows, cols = np.triu_indices(4)
+        factors = np.where(rows == cols, 1.0, 2.0)
+
+        return np.einsum('ij,ij->i', quadrics * factors, homogeneous[:, rows] * homogeneous[:, cols])
+
+    @staticmethod
+    def boundary_vertices(triangles: np.ndarray, num_vertices: int) -> np.ndarray:
+        # Vertices of the edges that only belong to one triangle
+        edges = np.sort(np.stack((triangles, np.roll(triangles, 1, axis=1)), axis=2).reshape((-1, 2)), axis=1)
+        keys, counts = np.unique(edges[:, 0] * num_vertices + edges[:, 1], return_counts=True)
+
+        boundary = np.zeros(num_vertices, bool)
+        boundary[keys[counts == 1] // num_vertices] = True
+        boundary[keys[counts == 1] % num_vertices] = True
+
+        return boundary
+
+    @classmethod
+    def cluster(cls, vertices: np.ndarray, quadrics: np.ndarray, boundary: np.ndarray,
+                origin: np.ndarray, cell: float) -> tuple:
+        # Groups the vertices by the cells of the grid (boundary vertices stay in their own cluster), and returns
+        # the cluster of each vertex, the representative of each cluster (the vertex with the smallest error
+        # for the quadric of its whole cluster), and the quadric of each cluster
+        cells = np.floor((vertices - origin) / cell).astype(np.int64)
+        dims = cells.max(axis=0) + 1
+        keys = np.ravel_multi_index(cells.T, dims)
+        keys[boundary] = np.prod(dims) + np.arange(boundary.sum())
+
+        _, clusters = np.unique(keys, return_inverse=True)
+        clusters = clusters.ravel()
+        cluster_quadrics = np.column_stack([np.bincount(clusters, q) for q in quadrics.T])
+        errors = cls.quadric_errors(cluster_quadrics[clusters], vertices)
+
+        # The first vertex (sorted by cluster) with the minimum error of its cluster
+        order = np.argsort(clusters, kind='stable')
+        sorted_clusters, sorted_errors = clusters[order], errors[order]
+        starts = np.flatnonzero(np.diff(sorted_clusters, prepend=-1))
+
+        minimums = np.minimum.reduceat(sorted_errors, starts)
+        candidates = np.flatnonzero(sorted_errors <= minimums[sorted_clusters])
+        firsts = candidates[np.diff(sorted_clusters[candidates], prepend=-1) != 0]
+
+        return clusters, order[firsts], cluster_quadrics
+
+    @staticmethod
+    def collapse(remap: np.ndarray, triangles: np.ndarray, chunk_ids: np.ndarray) -> tuple:
+        # Replaces the vertices of the triangles, and removes the degenerate and duplicated ones
+        # (keeping their order, so they're still sorted by chunk)
+        triangles = remap[triangles]
+        valid = (triangles[:, 0] != triangles[:, 1]) & (triangles[:, 1] != triangles[:, 2]) \
+            & (triangles[:, 2] != triangles[:, 0])
+        triangles, chunk_ids = triangles[valid], chunk_ids[valid]
+
+        _, first = np.unique(np.sort(triangles, axis=1), axis=0, return_index=True)
+        first.sort()
+
+        return triangles[first], chunk_ids[first]
+
+    def bounds(self, vertices: np.ndarray, chunks: SpatialChunks) -> tuple:
+        # Axis-aligned boxes of the chunks that contain the triangles of every level
+        lo, hi = chunks.lo.copy(), chunks.hi.copy()
+
+        for level in range(1, self.num_levels):
+            offsets = self.offsets[level]
+            triangles = vertices[self.indices[self.starts[level]:self.starts[level] + offsets[-1]]]
+            filled = np.diff(offsets) > 0
+
+            if filled.any():
+                lo[filled] = np.minimum(lo[filled], np.minimum.reduceat(triangles.min(axis=1), offsets[:-1][filled]))
+                hi[filled] = np.maximum(hi[filled], np.maximum.reduceat(triangles.max(axis=1), offsets[:-1][filled]))
+
+        return lo, hi
+
+    def ranges(self, mask: np.ndarray, levels: np.ndarray) -> tuple:
+        # Returns the (firsts, counts) of the chunks in the mask, each one in its level (see SpatialChunks)
+        return SpatialChunks.level_ranges(self.starts, self.offsets, mask, levels)
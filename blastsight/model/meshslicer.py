@@ -0,0 +1,200 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+
+class MeshSlicer:
+    def __init__(self, vertices: np.ndarray, indices: np.ndarray):
+        """
+        MeshSlicer computes the cross-sections of a mesh with planes.
+
+        Every triangle is tested against the plane at once: the vertices are classified by the sign
+        of their distance to the plane (a vertex lying on the plane counts as positive, so each triangle
+        has either zero or two crossed edges), and each crossed triangle adds a segment between the
+        crossing points of its two edges.
+
+        Neighbour triangles share their crossed edges, so the segments are linked into polylines
+        by hashing the edges with their vertex indices, without comparing the crossing points.
+        """
+        # The crossings are computed in double precision, but returned with the precision of the vertices
+        self.dtype = np.result_type(np.asarray(vertices).dtype, np.float32)
+        self.vertices = np.asarray(vertices, np.float64).reshape((-1, 3))
+        self.indices = np.asarray(indices, np.int64).reshape((-1, 3))
+
+        # Distances smaller than this are snapped to the plane
+        self.tolerance = 1e-9 * max(1.0, float(np.abs(self.vertices).max(initial=0.0)))
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.vertices)
+
+    def project(self, normal: np.ndarray) -> np.ndarray:
+        # Projection of each vertex over the normal (expected to be normalized)
+        return np.inner(self.vertices, normal)
+
+    def snap(self, distances: np.ndarray) -> np.ndarray:
+        # Distances close enough to the plane are replaced by zero (in-place)
+        distances[np.abs(distances) <= self.tolerance] = 0.0
+        return distances
+
+    def edge_keys(self, start: np.ndarray, end: np.ndarray) -> np.ndarray:
+        # Hashes each edge by its vertex indices, regardless of its direction
+        return np.minimum(start, end) * self.num_vertices + np.maximum(start, end)
+
+    def crossing_points(self, start: np.ndarray, end: np.ndarray,
+                        start_distances: np.ndarray, end_distances: np.ndarray) -> np.ndarray:
+        # The crossing point of each edge is computed from its (sorted) vertices, so it's the same for both triangles
+        swap = start > end
+        lo, hi = np.where(swap, end, start), np.where(swap, start, end)
+        d_lo = np.where(swap, end_distances, start_distances)
+        d_hi = np.where(swap, start_distances, end_distances)
+
+        t = d_lo / (d_lo - d_hi)
+        points = self.vertices[lo] + t.reshape((-1, 1)) * (self.vertices[hi] - self.vertices[lo])
+
+        # Vertices lying on the plane are copied as they are, so every edge crossing them gets the same point
+        on_plane = d_hi == 0.0
+        points[on_plane] = self.vertices[hi[on_plane]]
+
+        return points
+
+    def slice_with_plane(self, origin: np.ndarray, normal: np.ndarray) -> list:
+        # Returns a list of polylines (one per disconnected portion of the cross-section)
+        norm = np.linalg.norm(normal)
+        if norm == 0.0 or len(self.indices) == 0:
+            return []
+
+        normal = np.asarray(normal, float) / norm
+        distances = self.snap(self.project(normal) - np.dot(origin, normal))
+
+        # Summing the columns is much faster than sides.sum(axis=1)
+        sides = (distances >= 0.0).view(np.uint8)[self.indices]
+        count = sides[:, 0] + sides[:, 1] + sides[:, 2]
+        triangles = self.indices[np.flatnonzero((count == 1) | (count == 2))]
+
+        return self.slice_triangles(triangles, distances[triangles])
+
+    def slice_with_planes(self, normal: np.ndarray, offsets: list) -> list:
+        """
+        Returns a list with the polylines of each plane `dot(normal, x) = offset`, in the same order of `offsets`.
+
+        The vertices are projected over the normal only once, and each triangle is bucketed
+        in the planes that cross its projected range, so each plane only visits its triangles.
+        """
+        offsets = np.asarray(offsets, float).ravel()
+        norm = np.linalg.norm(normal)
+        if norm == 0.0 or len(self.indices) == 0:
+            return [[] for _ in offsets]
+
+        normal = np.asarray(normal, float) / norm
+        projections = self.project(normal)
+
+        ranges = projections[self.indices]
+        order = np.argsort(offsets, kind='stable')
+        first = np.searchsorted(offsets[order], ranges.min(axis=1) - self.tolerance, side='left')
+        last = np.searchsorted(offsets[order], ranges.max(axis=1) + self.tolerance, side='right')
+        del ranges
+
+        # One (plane, triangle) pair for each plane that crosses the range of a triangle, grouped by plane
+        counts = last - first
+        triangle_ids = np.repeat(np.arange(len(self.indices)), counts)
+        plane_ids = np.repeat(first, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        groups = np.argsort(plane_ids, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(np.bincount(plane_ids, minlength=len(offsets))))).tolist()
+        triangle_ids = triangle_ids[groups]
+
+        result = [[] for _ in offsets]
+        for plane, offset_id in enumerate(order.tolist()):
+            triangles = self.indices[triangle_ids[bounds[plane]:bounds[plane + 1]]]
+            distances = self.snap(projections[triangles] - offsets[offset_id])
+            result[offset_id] = self.slice_triangles(triangles, distances)
+
+        return result
+
+    def slice_triangles(self, triangles: np.ndarray, distances: np.ndarray) -> list:
+        # Slices the triangles (as vertex indices), given the distances of their vertices to the plane
+        sides = distances >= 0.0
+        count = sides.sum(axis=1)
+        crossed = np.flatnonzero((count == 1) | (count == 2))
+
+        if crossed.size == 0:
+            return []
+
+        # The lone vertex is the one that is alone at its side of the plane, so (a, b) and (a, c) are crossed
+        lone = np.argmax(sides[crossed] == (count[crossed] == 1).reshape((-1, 1)), axis=1)
+        a, b, c = [(crossed, (lone + k) % 3) for k in range(3)]
+
+        # Each crossed edge becomes a node of the graph, and each crossed triangle becomes an edge between two nodes
+        keys = np.concatenate((self.edge_keys(triangles[a], triangles[b]), self.edge_keys(triangles[a], triangles[c])))
+        points = np.concatenate((self.crossing_points(triangles[a], triangles[b], distances[a], distances[b]),
+                                 self.crossing_points(triangles[a], triangles[c], distances[a], distances[c])))
+
+        keys, first, nodes = np.unique(keys, return_index=True, return_inverse=True)
+        points = points[first].astype(self.dtype, copy=False)
+
+        starts, ends = nodes.reshape((2, -1))
+        polylines = [self.remove_duplicates(points[path], closed)
+                     for path, closed in self.link(starts, ends, len(keys))]
+
+        return [polyline for polyline in polylines if len(polyline) > 1]
+
+    @staticmethod
+    def link(starts: np.ndarray, ends: np.ndarray, num_nodes: int) -> list:
+        # Walks the graph of segments, returning a list of (path, closed) tuples, where `path` is a list of nodes
+        num_segments = len(starts)
+        endpoints = np.concatenate((starts, ends))
+        order = np.argsort(endpoints, kind='stable')
+
+        # Incident segments of each node, in CSR format
+        offsets = np.concatenate(([0], np.cumsum(np.bincount(endpoints, minlength=num_nodes)))).tolist()
+        incidence = (order % num_segments).tolist()
+        starts = starts.tolist()
+        ends = ends.tolist()
+        visited = [False] * num_segments
+
+        def walk(node: int) -> list:
+            path = [node]
+            while True:
+                for k in range(offsets[node], offsets[node + 1]):
+                    segment = incidence[k]
+                    if not visited[segment]:
+                        break
+                else:
+                    return path
+
+                visited[segment] = True
+                node = ends[segment] if starts[segment] == node else starts[segment]
+                path.append(node)
+
+        result = []
+
+        # Open polylines start at the boundary of the mesh (nodes with an odd number of segments)
+        for node in np.flatnonzero(np.diff(offsets) % 2 == 1).tolist():
+            path = walk(node)
+            if len(path) > 1:
+                result.append((path, False))
+
+        # Every segment left belongs to a closed polyline
+        for segment in range(num_segments):
+            if not visited[segment]:
+                path = walk(starts[segment])
+                result.append((path[:-1], True) if path[-1] == path[0] else (path, False))
+
+        return result
+
+    @staticmethod
+    def remove_duplicates(polyline: np.ndarray, closed: bool) -> np.ndarray:
+        # Vertices lying on the plane are shared by several crossed edges, so their points are repeated
+        keep = np.ones(len(polyline), bool)
+        keep[1:] = np.any(polyline[1:] != polyline[:-1], axis=1)
+
+        if closed and len(polyline) > 1:
+            keep[0] = np.any(polyline[0] != polyline[-1])
+
+        return polyline[keep]
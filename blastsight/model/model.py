@@ -7,6 +7,7 @@
 
 import functools
 import numpy as np
+import pandas as pd
 
 from . import utils
 
@@ -17,15 +18,19 @@ from qtpy.QtCore import QMutex
 from qtpy.QtCore import QMutexLocker
 
 from .elementfactory import ElementFactory
+from .parsecache import ParseCache
+from .pointoctree import PointOctree
 
 from .elements.element import Element
 from .elements.elementcollection import ElementCollection
 from .elements.blockelement import BlockElement
 from .elements.pointelement import PointElement
+from .elements.pointcloudelement import PointCloudElement
 from .elements.lineelement import LineElement
 from .elements.meshelement import MeshElement
 from .elements.nullelement import NullElement
 from .elements.tubeelement import TubeElement
+from .elements.drillholesetelement import DrillholeSetElement
 
 from .parsers.parser import Parser
 from .parsers.parsercollection import ParserCollection
@@ -35,6 +40,7 @@ from .parsers.h5mparser import H5MParser
 from .parsers.h5pparser import H5PParser
 from .parsers.csvparser import CSVParser
 from .parsers.gslibparser import GSLibParser
+from .parsers.bsxparser import BSXParser
 
 
 class Model:
@@ -43,6 +49,7 @@ class Model:
         self.parser_collection = ParserCollection()
         self.element_collection = ElementCollection()
         self.factory = ElementFactory()
+        self.parse_cache = None
 
         self.add_parser('dxf', DXFParser())
         self.add_parser('off', OFFParser())
@@ -50,6 +57,7 @@ class Model:
         self.add_parser('h5p', H5PParser())
         self.add_parser('csv', CSVParser())
         self.add_parser('out', GSLibParser())
+        self.add_parser('bsx', BSXParser())
 
     @property
     def last_id(self) -> int:
@@ -64,6 +72,14 @@ class Model:
     def get_parser(self, extension: str) -> Parser:
         return self.parser_collection.get(extension)
 
+    def set_parse_cache(self, directory: str, *args, **kwargs) -> ParseCache:
+        # Files of cacheable parsers (see Parser.CACHEABLE) will be parsed once, and then loaded from the cache
+        self.parse_cache = ParseCache(directory, *args, **kwargs)
+        return self.parse_cache
+
+    def unset_parse_cache(self) -> None:
+        self.parse_cache = None
+
     @staticmethod
     def get_paths_from_directory(path: str) -> list:
         it = QDirIterator(path, QDirIterator.Subdirectories)
@@ -89,7 +105,26 @@ class Model:
 
     def register_element_by_path(self, path: str, generator, *args, **kwargs):
         ext = path.split('.')[-1]
-        info = self.get_parser(ext).load_file(path, *args, **kwargs)
+        parser = self.get_parser(ext)
+
+        if self.parse_cache is not None and parser.CACHEABLE:
+            info = self.parse_cache.load_file(path, parser, *args, **kwargs)
+        else:
+            info = parser.load_file(path, *args, **kwargs)
+
+        return self.register_element(generator(*args, **self.merge_info(info, kwargs)))
+
+    def register_element_by_chunks(self, path: str, generator, *args, **kwargs) -> tuple:
+        # Same as above, but only the first chunk of the file is loaded (see Parser.load_chunks()).
+        # Returns the element and an iterator of the rest of the data, to be given to element.append()
+        ext = path.split('.')[-1]
+        chunks = self.get_parser(ext).load_chunks(path, *args, **kwargs)
+        element = self.register_element(generator(*args, **self.merge_info(next(chunks, {}), kwargs)))
+
+        return element, self.batches((chunk.get('data') for chunk in chunks), element.data.shape[0])
+
+    @staticmethod
+    def merge_info(info: dict, kwargs: dict) -> dict:
         data = info.get('data', {})
         properties = info.get('properties', {})
         metadata = info.get('metadata', {})
@@ -102,7 +137,24 @@ class Model:
         for k, v in metadata.items():
             kwargs[k] = kwargs.get(k, v)
 
-        return self.register_element(generator(*args, **kwargs))
+        return kwargs
+
+    @staticmethod
+    def batches(frames: iter, num_rows: int) -> iter:
+        # Joins the frames until they have as many rows as the ones already loaded, so appending every batch
+        # (which copies the data) costs as much as copying the whole data twice, instead of once per frame
+        pending, pending_rows = [], 0
+        for frame in frames:
+            pending.append(frame)
+            pending_rows += len(frame)
+
+            if pending_rows >= num_rows:
+                yield pd.concat(pending, ignore_index=True)
+                num_rows += pending_rows
+                pending, pending_rows = [], 0
+
+        if pending:
+            yield pd.concat(pending, ignore_index=True)
 
     """
     Load methods by arguments
@@ -126,6 +178,9 @@ class Model:
     def tubes(self, *args, **kwargs) -> TubeElement:
         return self.register_element(self.factory.tubes(*args, **kwargs))
 
+    def drillholes(self, *args, **kwargs) -> DrillholeSetElement:
+        return self.register_element(self.factory.drillholes(*args, **kwargs))
+
     def text(self, *args, **kwargs) -> NullElement:
         return self.register_element(self.factory.null(*args, **kwargs))
 
@@ -147,6 +202,18 @@ class Model:
     def load_tubes(self, path: str, *args, **kwargs) -> TubeElement:
         return self.register_element_by_path(path, self.factory.tubes, hint='tubes', *args, **kwargs)
 
+    def load_blocks_by_chunks(self, path: str, *args, **kwargs) -> tuple:
+        return self.register_element_by_chunks(path, self.factory.blocks, hint='blocks', *args, **kwargs)
+
+    def load_points_by_chunks(self, path: str, *args, **kwargs) -> tuple:
+        return self.register_element_by_chunks(path, self.factory.points, hint='points', *args, **kwargs)
+
+    def load_point_cloud(self, path: str, *args, **kwargs) -> PointCloudElement:
+        # The path is a folder made by PointOctree.build()
+        kwargs['name'] = kwargs.get('name', QFileInfo(path).fileName())
+        kwargs['extension'] = kwargs.get('extension', 'octree')
+        return self.register_element(self.factory.points(octree=PointOctree(path), *args, **kwargs))
+
     """
     Element handling
     """
@@ -199,6 +266,33 @@ class Model:
 
         return result
 
+    @staticmethod
+    def slice_elements_with_planes(normal: np.ndarray, offsets: list, elements: list, name: str) -> list:
+        """
+        Returns a list with the slices of each plane `dot(normal, x) = offset` (in the same order of `offsets`),
+        where the slices of each plane are a list of dicts, like in slice_elements()
+
+        Every element is sliced by all the planes in a single pass (useful for contours and section sets).
+
+        :param normal: Normal shared by all the planes
+        :param offsets: Offsets of the planes along the (normalized) normal
+        :param elements: A list of elements ready to be sliced
+        :param name: The name of the key in the return dictionary ('vertices' or 'indices')
+        :return: list[list[dict]]
+        """
+
+        result = [[] for _ in offsets]
+
+        for element in elements:
+            for plane_result, data in zip(result, element.slice_with_planes(normal, offsets)):
+                if len(data) > 0:
+                    plane_result.append({
+                        'element_id': element.id,
+                        name: data,
+                    })
+
+        return result
+
     @staticmethod
     def slice_meshes(origin: np.ndarray, normal: np.ndarray, meshes: list) -> list:
         """
@@ -220,6 +314,27 @@ class Model:
         """
         return Model.slice_elements(origin, normal, point_list, 'indices')
 
+    @staticmethod
+    def slice_meshes_with_planes(normal: np.ndarray, offsets: list, meshes: list) -> list:
+        """
+        Returns a list with the slices of each plane, where each slice is the mesh ID and its sliced vertices
+        """
+        return Model.slice_elements_with_planes(normal, offsets, meshes, 'vertices')
+
+    @staticmethod
+    def slice_blocks_with_planes(normal: np.ndarray, offsets: list, block_list: list) -> list:
+        """
+        Returns a list with the slices of each plane, where each slice is the block ID and its sliced indices
+        """
+        return Model.slice_elements_with_planes(normal, offsets, block_list, 'indices')
+
+    @staticmethod
+    def slice_points_with_planes(normal: np.ndarray, offsets: list, point_list: list) -> list:
+        """
+        Returns a list with the slices of each plane, where each slice is the point ID and its sliced indices
+        """
+        return Model.slice_elements_with_planes(normal, offsets, point_list, 'indices')
+
     @staticmethod
     def measure_from_rays(origin_list: list, ray_list: list, meshes: list) -> dict:
         """
@@ -307,3 +422,71 @@ class Model:
     @staticmethod
     def intersect_lines(origin: np.ndarray, ray: np.ndarray, lines: list) -> list:
         return Model.intersect_elements(origin, ray, lines)
+
+    @staticmethod
+    def intersect_drillholes(origin: np.ndarray, ray: np.ndarray, drillholes: list) -> list:
+        """
+        Detects the closest hole hit by the ray in each drillhole set, sorted by distance
+        """
+        attributes_list = []
+
+        for element in drillholes:
+            hole, t = element.pick(origin, ray)
+            if hole < 0:
+                continue
+
+            attributes = element.attributes
+            attributes['hole'] = hole
+            attributes['hole_name'] = element.names[hole]
+            attributes['closest_point'] = origin + t * ray
+            attributes['intersections'] = element.intersect_with_ray(origin, ray)
+            attributes_list.append(attributes)
+
+        return sorted(attributes_list, key=lambda x: utils.magnitude(x.get('closest_point') - origin))
+
+    @staticmethod
+    def intersect_rays(origins: np.ndarray, rays: np.ndarray, elements: list, chunk_size: int = 1 << 12) -> dict:
+        """
+        Detects the first hit of each ray against the elements (meshes), using their BVHs.
+
+        Returns a dict with the following structure (N = number of rays):
+
+        {
+            'points': np.ndarray (N, 3), NaN if the ray doesn't hit anything,
+            'distances': np.ndarray (N,), np.inf if the ray doesn't hit anything,
+            'element_ids': np.ndarray (N,), -1 if the ray doesn't hit anything
+        }
+        """
+        origins = np.asarray(origins, np.float64).reshape((-1, 3))
+        rays = np.asarray(rays, np.float64).reshape((-1, 3))
+
+        params = np.full(len(origins), np.inf)
+        element_ids = np.full(len(origins), -1)
+
+        def intersect_chunk(start: int) -> None:
+            chunk = slice(start, start + chunk_size)
+
+            for element in elements:
+                t = element.intersect_with_rays(origins[chunk], rays[chunk])
+                closer = t < params[chunk]
+
+                params[chunk][closer] = t[closer]
+                element_ids[chunk][closer] = element.id
+
+        # The BVHs are built before, otherwise every thread would build its own copy
+        for element in elements:
+            element.bvh
+
+        # Rays are intersected in chunks, split between threads
+        with ThreadPoolExecutor() as pool:
+            list(pool.map(intersect_chunk, range(0, len(origins), chunk_size)))
+
+        hits = element_ids >= 0
+        points = np.full((len(origins), 3), np.nan)
+        points[hits] = origins[hits] + params[hits].reshape((-1, 1)) * rays[hits]
+
+        return {
+            'points': points,
+            'distances': params * np.linalg.norm(rays, axis=1),
+            'element_ids': element_ids,
+        }
@@ -0,0 +1,284 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+from qtpy.QtCore import QMutex
+from qtpy.QtCore import QMutexLocker
+
+
+class ParseCache:
+    INDEX = 'index.json'
+
+    def __init__(self, directory: str, max_size: int = 1 << 30, hash_content: bool = False):
+        """
+        ParseCache saves what the parsers return (data, properties and metadata) in a directory,
+        so files that were already parsed can be loaded again without parsing them.
+
+        Each entry is a .npz file, with the arrays of the data and a JSON header with the properties,
+        the metadata and the layout of the data (the keys of a dict, or the columns of a DataFrame).
+        Text columns are saved as fixed-size unicode strings (and a mask of their missing values),
+        and entries are loaded without pickle, so the directory can't be used to run code.
+        Results that can't be saved that way (e.g. columns with mixed objects) are not cached.
+
+        The keys of the entries are made with the absolute path, size and modification time of the file,
+        the parser, the hint, and the versions of numpy and pandas (that parsed the file), and if `hash_content`
+        is enabled, with a hash of the contents of the file too.
+        Files that change will have new keys, and their old entries will be evicted eventually.
+
+        When the entries take more than `max_size` bytes, the least recently used ones are deleted.
+        The order of use is kept in an index (INDEX), since modification times may tie in some filesystems.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self.hash_content = hash_content
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._mutex = QMutex()
+        os.makedirs(self.directory, exist_ok=True)
+
+        self._index = self.read_index()
+        self._clock = max(self._index.values(), default=0)
+
+    @property
+    def entries(self) -> list:
+        # Paths of the entries, from the least to the most recently used
+        with QMutexLocker(self._mutex):
+            return self._entries()
+
+    @property
+    def size(self) -> int:
+        with QMutexLocker(self._mutex):
+            return sum(self._sizes(self._entries()))
+
+    @property
+    def stats(self) -> dict:
+        with QMutexLocker(self._mutex):
+            entries = self._entries()
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(entries),
+                'size': sum(self._sizes(entries)),
+            }
+
+    """
+    Cache methods
+    """
+    def key(self, path: str, parser, *args, **kwargs) -> str:
+        stat = os.stat(path)
+        description = {
+            'path': os.path.abspath(path),
+            'size': stat.st_size,
+            'mtime': stat.st_mtime_ns,
+            'parser': type(parser).__name__,
+            'hint': kwargs.get('hint'),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+        }
+
+        if self.hash_content:
+            content = hashlib.blake2b()
+            with open(path, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    content.update(block)
+            description['content'] = content.hexdigest()
+
+        return hashlib.blake2b(json.dumps(description, sort_keys=True).encode(), digest_size=20).hexdigest()
+
+    def load_file(self, path: str, parser, *args, **kwargs) -> dict:
+        # Same as parser.load_file(), but the result comes from the cache if the file was already parsed
+        entry = os.path.join(self.directory, f'{self.key(path, parser, *args, **kwargs)}.cache')
+
+        try:
+            info = self.read(entry)
+
+            with QMutexLocker(self._mutex):
+                self.hits += 1
+                self.touch(entry)
+            return info
+
+        # Missing or damaged entries are replaced (random bytes can fail in the zip, the arrays or the header)
+        except Exception:
+            pass
+
+        info = parser.load_file(path, *args, **kwargs)
+        self.store(entry, info)
+
+        with QMutexLocker(self._mutex):
+            self.misses += 1
+        return info
+
+    def store(self, entry: str, info: dict) -> None:
+        arrays = self.pack(info)
+        if arrays is None:
+            return
+
+        # The entry is written with a temporary name first, so other threads never read it incomplete
+        temp = f'{entry}.{os.getpid()}.{id(info)}.tmp'
+        with open(temp, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(temp, entry)
+
+        with QMutexLocker(self._mutex):
+            self.touch(entry)
+        self.evict()
+
+    def evict(self) -> None:
+        with QMutexLocker(self._mutex):
+            entries = self._entries()
+            sizes = self._sizes(entries)
+            total = sum(sizes)
+
+            for path, size in zip(entries, sizes):
+                if total <= self.max_size:
+                    break
+
+                self._remove(path)
+                total -= size
+                self.evictions += 1
+
+            self.write_index()
+
+    def clear(self) -> None:
+        with QMutexLocker(self._mutex):
+            for path in self._entries():
+                self._remove(path)
+
+            self.write_index()
+
+    """
+    Entries
+    """
+    @staticmethod
+    def pack(info: dict):
+        # Arrays of the entry (with its header as bytes), or None if the info can't be saved without pickle
+        data = info.get('data')
+        header = {
+            'properties': info.get('properties', {}),
+            'metadata': info.get('metadata', {}),
+        }
+        arrays = {}
+
+        if isinstance(data, pd.DataFrame):
+            header['columns'] = []
+            for i, (name, column) in enumerate(data.items()):
+                values = column.to_numpy()
+                description = {'name': name, 'dtype': str(column.dtype), 'text': values.dtype.kind not in 'biufc'}
+
+                if description.get('text'):
+                    if pd.api.types.infer_dtype(values, skipna=True) not in ['string', 'empty']:
+                        return None
+
+                    missing = pd.isna(values)
+                    values = np.where(missing, '', values).astype(str)
+                    arrays[f'missing_{i}'] = missing
+
+                arrays[f'column_{i}'] = values
+                header['columns'].append(description)
+        else:
+            header['keys'] = list(data.keys())
+            for i, values in enumerate(data.values()):
+                values = np.asarray(values)
+                if values.dtype.hasobject:
+                    return None
+
+                arrays[f'array_{i}'] = values
+
+        try:
+            arrays['header'] = np.frombuffer(json.dumps(header).encode(), np.uint8)
+        except TypeError:
+            return None
+
+        return arrays
+
+    @staticmethod
+    def read(entry: str) -> dict:
+        with np.load(entry, allow_pickle=False) as arrays:
+            header = json.loads(arrays['header'].tobytes())
+
+            if 'columns' in header.keys():
+                columns = {}
+                for i, description in enumerate(header.get('columns')):
+                    values = arrays[f'column_{i}']
+
+                    if description.get('text'):
+                        values = values.astype(object)
+                        values[arrays[f'missing_{i}']] = np.nan
+
+                    columns[i] = pd.Series(values, dtype=description.get('dtype'))
+
+                # Columns are added by position, as their names may repeat
+                data = pd.DataFrame(columns)
+                data.columns = [description.get('name') for description in header.get('columns')]
+            else:
+                data = {k: arrays[f'array_{i}'] for i, k in enumerate(header.get('keys'))}
+
+        return {
+            'data': data,
+            'properties': header.get('properties'),
+            'metadata': header.get('metadata'),
+        }
+
+    """
+    Index (callers must hold the mutex)
+    """
+    def read_index(self) -> dict:
+        try:
+            with open(os.path.join(self.directory, self.INDEX), 'r') as f:
+                index = json.load(f)
+            return {k: int(v) for k, v in index.items()}
+
+        # A damaged index only loses the order of use
+        except (OSError, ValueError, TypeError, AttributeError):
+            return {}
+
+    def write_index(self) -> None:
+        path = os.path.join(self.directory, self.INDEX)
+        with open(f'{path}.{os.getpid()}.tmp', 'w') as f:
+            json.dump(self._index, f)
+        os.replace(f'{path}.{os.getpid()}.tmp', path)
+
+    def touch(self, entry: str) -> None:
+        self._clock += 1
+        self._index[os.path.basename(entry)] = self._clock
+        self.write_index()
+
+    def _entries(self) -> list:
+        # Entries missing from the index (e.g. stored by other processes) are considered the oldest ones
+        names = [entry.name for entry in os.scandir(self.directory) if entry.name.endswith('.cache')]
+        names.sort(key=lambda name: self._index.get(name, 0))
+
+        return [os.path.join(self.directory, name) for name in names]
+
+    @staticmethod
+    def _sizes(entries: list) -> list:
+        # Entries may be deleted by other processes while we look at them
+        sizes = []
+        for path in entries:
+            try:
+                sizes.append(os.path.getsize(path))
+            except FileNotFoundError:
+                sizes.append(0)
+
+        return sizes
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+        self._index.pop(os.path.basename(path), None)
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 
+from .bsxparser import BSXParser
 from .csvparser import CSVParser
 from .dxfparser import DXFParser
 from .gslibparser import GSLibParser
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import json
+import os
+import numpy as np
+import pandas as pd
+from qtpy.QtCore import QFileInfo
+from .parser import Parser
+
+
+class BSXParser(Parser):
+    """
+    BSX is the native binary format of BlastSight. It has:
+        b'BSX1', the size of the header (uint32), and the header (JSON)
+        The arrays, each one aligned to ALIGNMENT bytes (from the end of the header, also aligned)
+
+    The header has the properties of the element, and the name, dtype, shape and offset of each array.
+    Meshes (and lines/tubes) are saved as 'vertices' (N, 3) float32 and 'indices' (M, 3) uint32,
+    the same layout that the drawables upload, while blocks and points are saved as the columns of their data.
+    Every array is little-endian.
+
+    The arrays are memory-mapped (copy-on-write) when loaded, so opening a file doesn't read its data,
+    and the elements keep them without copies (see Element.as_array()).
+    """
+    MAGIC = b'BSX1'
+    ALIGNMENT = 64
+
+    @staticmethod
+    def align(offset: int) -> int:
+        return -(-offset // BSXParser.ALIGNMENT) * BSXParser.ALIGNMENT
+
+    @staticmethod
+    def load_file(path: str, *args, **kwargs) -> dict:
+        with open(path, 'rb') as f:
+            if f.read(4) != BSXParser.MAGIC:
+                raise ValueError(f'{path} is not a BSX file.')
+
+            header_size = int(np.frombuffer(f.read(4), '<u4')[0])
+            header = json.loads(f.read(header_size))
+
+        # Data (empty arrays can't be mapped)
+        start = BSXParser.align(8 + header_size)
+        arrays = {}
+        for array in header.get('arrays'):
+            dtype, shape = np.dtype(array.get('dtype')), tuple(array.get('shape'))
+            arrays[array.get('name')] = np.memmap(path, dtype, 'c', start + array.get('offset'), shape) \
+                if np.prod(shape) > 0 else np.empty(shape, dtype)
+
+        data = pd.DataFrame(arrays, copy=False) if header.get('layout') == 'columns' else arrays
+
+        # Properties
+        properties = header.get('properties', {})
+
+        # Metadata
+        metadata = {
+            'name': QFileInfo(path).completeBaseName(),
+            'extension': QFileInfo(path).suffix(),
+        }
+
+        return {
+            'data': data,
+            'properties': properties,
+            'metadata': metadata,
+        }
+
+    @staticmethod
+    def save_file(*args, **kwargs) -> None:
+        path = kwargs.get('path')
+
+        if path is None:
+            raise KeyError('Path missing.')
+
+        data = kwargs.get('data', {})
+        properties = kwargs.get('properties', {})
+
+        # Arrays (text columns are saved as fixed-size unicode strings)
+        if isinstance(data, pd.DataFrame):
+            layout = 'columns'
+            arrays = {}
+            for k in data.keys():
+                column = data[k].to_numpy()
+                column = column.astype(str) if column.dtype == object else column
+                arrays[str(k)] = column.astype(column.dtype.newbyteorder('<'), copy=False)
+        else:
+            layout = 'vertices'
+            vertices = data.get('vertices')
+            if vertices is None:
+                vertices = np.column_stack((data.get('x', []), data.get('y', []), data.get('z', [])))
+
+            arrays = {'vertices': np.asarray(vertices, '<f4').reshape((-1, 3))}
+            if 'indices' in data.keys():
+                arrays['indices'] = np.asarray(data.get('indices'), '<u4')
+
+        entries = []
+        offset = 0
+        for name, array in arrays.items():
+            entries.append({'name': name, 'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset})
+            offset = BSXParser.align(offset + array.nbytes)
+
+        # Numpy arrays and scalars in the properties are saved as lists and numbers
+        header = json.dumps({'layout': layout, 'properties': properties, 'arrays': entries},
+                            default=lambda x: x.tolist()).encode()
+
+        # The file is replaced at the end, as it may be mapped by an element that we're saving
+        with open(f'{path}.tmp', 'wb') as f:
+            f.write(BSXParser.MAGIC)
+            f.write(np.uint32(len(header)).astype('<u4').tobytes())
+            f.write(header)
+
+            start = BSXParser.align(8 + len(header))
+            for entry, array in zip(entries, arrays.values()):
+                f.seek(start + entry.get('offset'))
+                f.write(np.ascontiguousarray(array).data.cast('B'))
+
+        os.replace(f'{path}.tmp', path)
@@ -11,6 +11,8 @@ from .parser import Parser
 
 
 class CSVParser(Parser):
+    CACHEABLE = True
+
     @staticmethod
     def load_file(path: str, *args, **kwargs) -> dict:
         assert path.lower().endswith('csv')
@@ -34,6 +36,25 @@ class CSVParser(Parser):
             'metadata': metadata,
         }
 
+    @staticmethod
+    def load_chunks(path: str, *args, **kwargs) -> iter:
+        assert path.lower().endswith('csv')
+
+        # Metadata
+        metadata = {
+            'name': QFileInfo(path).completeBaseName(),
+            'extension': QFileInfo(path).suffix()
+        }
+
+        # Data (the file is read while the chunks are consumed)
+        with open(path, 'r') as f:
+            for data in pd.read_csv(f, chunksize=kwargs.get('chunk_size', Parser.CHUNK_SIZE)):
+                yield {
+                    'data': data,
+                    'properties': {},
+                    'metadata': metadata,
+                }
+
     @staticmethod
     def save_file(*args, **kwargs) -> None:
         path = kwargs.get('path')
@@ -11,6 +11,8 @@ from .parser import Parser
 
 
 class GSLibParser(Parser):
+    CACHEABLE = True
+
     @staticmethod
     def load_file(path: str, *args, **kwargs) -> dict:
         assert path.lower().endswith('out')
@@ -38,6 +40,35 @@ class GSLibParser(Parser):
             'metadata': metadata,
         }
 
+    @staticmethod
+    def load_chunks(path: str, *args, **kwargs) -> iter:
+        assert path.lower().endswith('out')
+
+        # Headers (if this "GSLib" file doesn't have them, the columns are numbered)
+        try:
+            header_count, headers = GSLibParser.get_header_info(path)
+            options = {'names': headers, 'skiprows': header_count + 2}
+        except Exception:
+            print(f'*** WARNING: We can read {path}, but keep in mind that this not a real GSLib file. ***')
+            options = {}
+
+        # Metadata
+        metadata = {
+            'name': QFileInfo(path).completeBaseName(),
+            'extension': QFileInfo(path).suffix()
+        }
+
+        # Data (the file is read while the chunks are consumed)
+        with open(path, 'r') as f:
+            chunks = pd.read_csv(f, sep=' ', header=None, chunksize=kwargs.get('chunk_size', Parser.CHUNK_SIZE),
+                                 **options)
+            for data in chunks:
+                yield {
+                    'data': data if options else data.add_prefix('col_'),
+                    'properties': {},
+                    'metadata': metadata,
+                }
+
     @staticmethod
     def get_header_info(path: str) -> tuple:
         with open(path, 'r') as gslib_file:
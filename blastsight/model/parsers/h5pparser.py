@@ -35,6 +35,34 @@ class H5PParser(Parser):
             'metadata': metadata,
         }
 
+    @staticmethod
+    def load_chunks(path: str, *args, **kwargs) -> iter:
+        chunk_size = kwargs.get('chunk_size', Parser.CHUNK_SIZE)
+
+        # Metadata
+        metadata = {
+            'name': QFileInfo(path).completeBaseName(),
+            'extension': QFileInfo(path).suffix(),
+        }
+
+        with pd.HDFStore(path, 'r') as store:
+            storer = store.get_storer('data')
+
+            # Properties
+            try:
+                properties = storer.attrs.metadata
+            except AttributeError:
+                properties = {}
+
+            # Data (both fixed and table stores can read a range of rows)
+            num_rows = storer.nrows if storer.is_table else storer.shape[0]
+            for start in range(0, max(num_rows, 1), chunk_size):
+                yield {
+                    'data': store.select('data', start=start, stop=start + chunk_size),
+                    'properties': properties,
+                    'metadata': metadata,
+                }
+
     @staticmethod
     def save_file(*args, **kwargs) -> None:
         path = kwargs.get('path')
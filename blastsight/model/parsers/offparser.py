@@ -13,6 +13,8 @@ from .parser import Parser
 
 
 class OFFParser(Parser):
+    CACHEABLE = True
+
     @staticmethod
     def load_file(path: str, *args, **kwargs) -> dict:
         assert path.lower().endswith('off')
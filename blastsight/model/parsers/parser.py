@@ -7,10 +7,23 @@
 
 
 class Parser:
+    # Rows of each chunk of load_chunks()
+    CHUNK_SIZE = 1 << 20
+
+    # Whether Model can keep what load_file() returns in its ParseCache (useful for text formats, slow to parse)
+    CACHEABLE = False
+
     @staticmethod
     def load_file(path: str, *args, **kwargs) -> dict:
         raise NotImplementedError
 
+    @classmethod
+    def load_chunks(cls, path: str, *args, **kwargs) -> iter:
+        # Yields the file as many dicts like the one of load_file(), with the same properties and metadata,
+        # but only `chunk_size` rows of the data in each one, so big files can be loaded progressively.
+        # Parsers that can't read their files by parts yield the whole file as a single chunk.
+        yield cls.load_file(path, *args, **kwargs)
+
     @staticmethod
     def save_file(path: str, *args, **kwargs) -> None:
         raise NotImplementedError
@@ -0,0 +1,323 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import heapq
+import os
+import numpy as np
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .spatialchunks import SpatialChunks
+
+
+class PointOctree:
+    # Maximum number of points of each node (inner nodes keep a random subsample of about that size)
+    NODE_CAPACITY = 65536
+    MAX_DEPTH = 10
+    BATCH_SIZE = 1 << 20
+
+    def __init__(self, path: str):
+        """
+        PointOctree is a point cloud saved in a folder, too big to be loaded at once.
+
+        Each node of the octree has a random subsample of the points inside its cube
+        (the points that its ancestors didn't take), and the leaves have the remaining points.
+        So drawing the nodes down to some depth is a coarser version of the point cloud,
+        and each node only adds detail to the nodes above it.
+
+        The folder has the points sorted by node, so node `i` goes from offsets[i] to offsets[i + 1]:
+            vertices.npy: (N, 3) float32
+            values.npy: (N,) float32
+            hierarchy.npz: the depth and cell of each node, plus the bounds of the point cloud
+
+        The points are memory-mapped, so only the nodes that are read are loaded (see read() and PointStreamer).
+        Use build() to generate the folder.
+        """
+        self.path = path
+        hierarchy = np.load(os.path.join(path, 'hierarchy.npz'))
+
+        self.origin, self.side = hierarchy['origin'], float(hierarchy['side'])
+        self.lo, self.hi = hierarchy['lo'], hierarchy['hi']
+        self.vmin, self.vmax = hierarchy['value_range']
+        self.capacity = int(hierarchy['capacity'])
+        self.depths, self.keys = hierarchy['depths'], hierarchy['keys']
+
+        self.vertices = np.load(os.path.join(path, 'vertices.npy'), mmap_mode='r')
+        self.values = np.load(os.path.join(path, 'values.npy'), mmap_mode='r')
+
+        # The nodes are chunks of the point files, with the boxes of their cubes
+        cells = np.zeros((len(self.keys), 3), np.int64)
+        for depth in np.unique(self.depths):
+            at_depth = self.depths == depth
+            cells[at_depth] = np.column_stack(np.unravel_index(self.keys[at_depth], (1 << int(depth),) * 3))
+
+        sizes = self.side / (1 << self.depths.astype(np.int64))[:, np.newaxis]
+        lo, hi = self.origin + cells * sizes, self.origin + (cells + 1) * sizes
+        self.chunks = SpatialChunks(None, hierarchy['offsets'], lo, hi)
+
+        # The children of node `i` are children[child_offsets[i]:child_offsets[i + 1]]
+        parents = self.find_parents(self.depths, self.keys)
+        self.children = np.argsort(parents[1:], kind='stable') + 1
+        self.child_offsets = np.searchsorted(parents[self.children], np.arange(self.num_nodes + 1))
+
+    @property
+    def num_nodes(self) -> int:
+        return self.chunks.num_chunks
+
+    @property
+    def num_points(self) -> int:
+        return self.chunks.num_items
+
+    @property
+    def counts(self) -> np.ndarray:
+        return np.diff(self.chunks.offsets)
+
+    def read(self, node: int) -> tuple:
+        # Returns the (vertices, values) of a node, copied from the files
+        first, last = self.chunks.offsets[node], self.chunks.offsets[node + 1]
+        return np.array(self.vertices[first:last]), np.array(self.values[first:last])
+
+    """
+    Selection
+    """
+    def select(self, frustum, budget: int, min_pixels: float = 1.0) -> np.ndarray:
+        # Returns the visible nodes with the biggest projected spacing between points (so the nearest ones first),
+        # until `budget` points. The children of a node are skipped if its spacing looks smaller than min_pixels.
+        visible = self.chunks.cull(frustum.planes)
+        spacing = self.side / (1 << self.depths.astype(np.int64)) / np.sqrt(self.capacity)
+        pixels = frustum.pixel_size(self.chunks.lo, self.chunks.hi, spacing)
+        counts = self.counts
+
+        selected = []
+        total = 0
+        heap = [(-pixels[0], 0)] if self.num_nodes > 0 and visible[0] else []
+
+        while heap:
+            priority, node = heapq.heappop(heap)
+            if total + counts[node] > budget:
+                break
+
+            selected.append(node)
+            total += counts[node]
+
+            if -priority > min_pixels:
+                for child in self.children[self.child_offsets[node]:self.child_offsets[node + 1]]:
+                    if visible[child]:
+                        heapq.heappush(heap, (-pixels[child], child))
+
+        return np.array(selected, np.int64)
+
+    """
+    Building
+    """
+    @staticmethod
+    def array_batches(vertices, values=None, batch_size: int = None) -> callable:
+        # Batches of arrays that can be sliced without loading them (np.memmap, h5py datasets, etc.)
+        batch_size = batch_size or PointOctree.BATCH_SIZE
+
+        def batches():
+            for start in range(0, len(vertices), batch_size):
+                batch = np.asarray(vertices[start:start + batch_size], float).reshape((-1, 3))
+                yield batch, np.zeros(len(batch)) if values is None else np.asarray(values[start:start + batch_size])
+
+        return batches
+
+    @staticmethod
+    def find_parents(depths: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        # Index of the parent of each node (the nodes are sorted by depth and key), or -1 for the root
+        parents = np.full(len(keys), -1, np.int64)
+        for depth in np.unique(depths)[1:]:
+            at_depth = np.flatnonzero(depths == depth)
+            above = np.flatnonzero(depths == depth - 1)
+
+            cells = np.column_stack(np.unravel_index(keys[at_depth], (1 << int(depth),) * 3)) >> 1
+            parent_keys = np.ravel_multi_index(cells.T, (1 << int(depth - 1),) * 3)
+            parents[at_depth] = above[np.searchsorted(keys[above], parent_keys)]
+
+        return parents
+
+    @classmethod
+    def build(cls, path: str, batches: callable, capacity: int = None, max_depth: int = None, seed: int = 0):
+        """
+        Builds the folder of a point cloud, where batches() returns an iterator of (vertices, values).
+        The batches are read 4 times (bounds, counts per cell, counts per node, and writing),
+        so only a batch (and the counts of the cells) is in memory.
+
+        Each point gets a random rank in [0, 1), and it's kept in the first node of its path from the root
+        where rank < capacity / (points inside the node), so each node keeps about `capacity` points.
+        """
+        capacity = capacity or cls.NODE_CAPACITY
+        depth_limit = max_depth if max_depth is not None else cls.MAX_DEPTH
+
+        # Bounds
+        lo, hi = np.full(3, np.inf), np.full(3, -np.inf)
+        vmin, vmax = np.inf, -np.inf
+        for vertices, values in batches():
+            if len(vertices) > 0:
+                lo, hi = np.minimum(lo, vertices.min(axis=0)), np.maximum(hi, vertices.max(axis=0))
+                vmin, vmax = min(vmin, float(np.min(values))), max(vmax, float(np.max(values)))
+
+        side = float(np.max(hi - lo)) if np.all(np.isfinite(lo)) else 0.0
+        side = side if side > 0.0 else 1.0
+
+        def leaf_cells(vertices: np.ndarray) -> np.ndarray:
+            cells = np.floor((vertices - lo) / side * (1 << depth_limit)).astype(np.int64)
+            return np.clip(cells, 0, (1 << depth_limit) - 1)
+
+        def ravel(cells: np.ndarray, depth: int) -> np.ndarray:
+            return np.ravel_multi_index(cells.T, (1 << depth,) * 3)
+
+        # Points per cell of the deepest level
+        leaf_keys, leaf_counts = np.empty(0, np.int64), np.empty(0)
+        for vertices, _ in batches():
+            keys = np.concatenate((leaf_keys, ravel(leaf_cells(vertices), depth_limit)))
+            weights = np.concatenate((leaf_counts, np.ones(len(vertices))))
+            leaf_keys, inverse = np.unique(keys, return_inverse=True)
+            leaf_counts = np.bincount(inverse.ravel(), weights)
+
+        # Nodes of each depth: (keys, points inside, is leaf, node index), where the children of leaves don't exist
+        cells = np.column_stack(np.unravel_index(leaf_keys, (1 << depth_limit,) * 3))
+        levels = []
+        num_nodes = 0
+        for depth in range(depth_limit + 1):
+            keys, inverse = np.unique(ravel(cells >> (depth_limit - depth), depth), return_inverse=True)
+            counts = np.bincount(inverse.ravel(), leaf_counts)
+
+            exists = np.ones(len(keys), bool)
+            if depth > 0:
+                above_keys, _, above_leaf, above_index = levels[-1]
+                parent_keys = ravel(np.column_stack(np.unravel_index(keys, (1 << depth,) * 3)) >> 1, depth - 1)
+                parents = np.searchsorted(above_keys, parent_keys)
+                exists = (above_index[parents] >= 0) & ~above_leaf[parents]
+
+            index = np.full(len(keys), -1, np.int64)
+            index[exists] = num_nodes + np.arange(exists.sum())
+            num_nodes += int(exists.sum())
+
+            levels.append((keys, counts, (counts <= capacity) | (depth == depth_limit), index))
+            if not exists.any():
+                break
+
+        def assign(vertices: np.ndarray, batch: int) -> np.ndarray:
+            # Node of each point of a batch (the ranks are the same in every pass)
+            ranks = np.random.default_rng([seed, batch]).random(len(vertices))
+            cells = leaf_cells(vertices)
+            nodes = np.full(len(vertices), -1, np.int64)
+
+            for depth, (keys, counts, is_leaf, index) in enumerate(levels):
+                pending = np.flatnonzero(nodes < 0)
+                if len(pending) == 0:
+                    break
+
+                found = np.searchsorted(keys, ravel(cells[pending] >> (depth_limit - depth), depth))
+                taken = is_leaf[found] | (ranks[pending] < capacity / counts[found])
+                nodes[pending[taken]] = index[found[taken]]
+
+            return nodes
+
+        # Points per node, and then the points sorted by node
+        sizes = np.zeros(num_nodes, np.int64)
+        for batch, (vertices, _) in enumerate(batches()):
+            sizes += np.bincount(assign(vertices, batch), minlength=num_nodes)
+
+        offsets = np.concatenate(([0], np.cumsum(sizes)))
+        num_points = int(offsets[-1])
+        os.makedirs(path, exist_ok=True)
+        out_vertices = np.lib.format.open_memmap(os.path.join(path, 'vertices.npy'), 'w+', np.float32, (num_points, 3))
+        out_values = np.lib.format.open_memmap(os.path.join(path, 'values.npy'), 'w+', np.float32, (num_points,))
+
+        cursors = offsets[:-1].copy()
+        for batch, (vertices, values) in enumerate(batches()):
+            nodes = assign(vertices, batch)
+            order = np.argsort(nodes, kind='stable')
+            sorted_nodes = nodes[order]
+
+            # Position of each point inside the points of its node in this batch
+            starts = np.flatnonzero(np.diff(sorted_nodes, prepend=-1))
+            ranks = np.arange(len(order)) - np.repeat(starts, np.diff(np.append(starts, len(order))))
+            positions = cursors[sorted_nodes] + ranks
+
+            out_vertices[positions] = vertices[order]
+            out_values[positions] = np.asarray(values)[order]
+            cursors += np.bincount(nodes, minlength=num_nodes)
+
+        out_vertices.flush()
+        out_values.flush()
+        del out_vertices, out_values
+
+        depths = np.concatenate([np.full((index >= 0).sum(), d, np.int8) for d, (_, _, _, index) in enumerate(levels)])
+        keys = np.concatenate([keys[index >= 0] for keys, _, _, index in levels])
+
+        np.savez(os.path.join(path, 'hierarchy.npz'), origin=lo, side=side, lo=lo, hi=hi,
+                 value_range=np.array([vmin, vmax]), capacity=capacity, depths=depths, keys=keys, offsets=offsets)
+
+        return cls(path)
+
+
+class PointStreamer:
+    # Nodes being read at the same time (the rest are requested in later frames, if they're still needed)
+    MAX_PENDING = 8
+
+    def __init__(self, octree: PointOctree, capacity: int):
+        """
+        PointStreamer keeps track of the nodes of a PointOctree that are loaded (usually in the GPU),
+        reading the missing ones in a background thread.
+
+        Every frame, update() receives the nodes that should be drawn (sorted by priority, see PointOctree.select()),
+        and returns the nodes that finished reading (to be uploaded) and the ones to be evicted.
+        Loaded nodes are evicted in least-recently-used order, when there are more than `capacity` points loaded.
+        """
+        self.octree = octree
+        self.capacity = capacity
+
+        self.loaded = OrderedDict()  # node -> number of points, in least-recently-used order
+        self.pending = OrderedDict()  # node -> future of octree.read(node)
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    @property
+    def num_loaded(self) -> int:
+        return sum(self.loaded.values())
+
+    @property
+    def is_streaming(self) -> bool:
+        return len(self.pending) > 0
+
+    def update(self, nodes: np.ndarray) -> tuple:
+        # Returns the [(node, (vertices, values))] that were read, and the [node] to evict
+        wanted = set(nodes.tolist())
+
+        ready = []
+        for node, future in list(self.pending.items()):
+            if future.done():
+                self.pending.pop(node)
+                if node in wanted:
+                    ready.append((node, future.result()))
+                    self.loaded[node] = len(ready[-1][1][0])
+
+        # Nodes in use are the most recently used, and missing nodes are requested by priority
+        for node in nodes.tolist():
+            if node in self.loaded:
+                self.loaded.move_to_end(node)
+            elif node not in self.pending and len(self.pending) < self.MAX_PENDING:
+                self.pending[node] = self.executor.submit(self.octree.read, node)
+
+        evicted = []
+        total = self.num_loaded
+        for node in list(self.loaded.keys()):
+            if total <= self.capacity or node in wanted:
+                break
+            total -= self.loaded.pop(node)
+            evicted.append(node)
+
+        return ready, evicted
+
+    def clear(self) -> None:
+        self.loaded.clear()
+        for future in self.pending.values():
+            future.cancel()
+        self.pending.clear()
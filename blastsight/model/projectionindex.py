@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+
+class ProjectionIndex:
+    def __init__(self, vertices: np.ndarray):
+        """
+        ProjectionIndex is an acceleration structure for slicing points/blocks with planes.
+
+        For each axis, it keeps the order of the vertices sorted by that coordinate,
+        so an axis-aligned slab can be found with two binary searches, instead of
+        projecting every vertex over the plane normal.
+
+        The axes are sorted lazily, so only the axes that are actually sliced pay the sorting cost.
+        Planes that aren't axis-aligned fall back to the full projection.
+        """
+        self.vertices = np.asarray(vertices).reshape((-1, 3))
+
+        self.orders = [None, None, None]
+        self.coordinates = [None, None, None]
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.vertices)
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        # Returns the coordinates of the vertices in `rows`
+        return self.vertices[rows]
+
+    @staticmethod
+    def aligned_axis(normal: np.ndarray) -> int:
+        # Returns the axis of an axis-aligned normal, or -1 if the normal isn't axis-aligned
+        nonzero = np.flatnonzero(normal)
+        return int(nonzero[0]) if nonzero.size == 1 else -1
+
+    def sort_axis(self, axis: int) -> None:
+        if self.orders[axis] is not None:
+            return
+
+        index_type = np.int32 if self.num_vertices < np.iinfo(np.int32).max else np.int64
+        order = np.argsort(self.vertices[:, axis], kind='stable').astype(index_type, copy=False)
+
+        self.orders[axis] = order
+        self.coordinates[axis] = self.vertices[order, axis]
+
+    def range_along_axis(self, axis: int, lo: float, hi: float) -> np.ndarray:
+        # Returns the indices of the vertices whose coordinate in `axis` is between `lo` and `hi` (inclusive)
+        self.sort_axis(axis)
+
+        start = np.searchsorted(self.coordinates[axis], lo, side='left')
+        end = np.searchsorted(self.coordinates[axis], hi, side='right')
+
+        return self.orders[axis][start:end]
+
+    def slice_with_plane_and_threshold(self, origin: np.ndarray, normal: np.ndarray, threshold: float) -> np.ndarray:
+        # Returns the sorted indices of the vertices that satisfy abs(dot(normal, vertex) + plane_d) <= threshold.
+        # The normal is expected to be normalized.
+        plane_d = -np.dot(normal, origin)
+        axis = self.aligned_axis(normal)
+
+        if axis < 0:
+            # General fallback: project every vertex.
+            # In this context, np.inner(a, b) returns the same as (a * b).sum(axis=1), but it's faster.
+            mask = np.abs(np.inner(normal, self.vertices) + plane_d) <= threshold
+            return mask.nonzero()[-1]
+
+        # The slab is searched with a small margin, and the candidates are tested again
+        # with the general inequation, so the result is the same as in the fallback
+        center = -plane_d / normal[axis]
+        margin = 1e-6 * (abs(center) + abs(threshold) + 1.0)
+        candidates = self.range_along_axis(axis, center - threshold - margin, center + threshold + margin)
+
+        mask = np.abs(np.inner(normal, self.take(candidates)) + plane_d) <= threshold
+        return np.sort(candidates[mask]).astype(int, copy=False)
+
+    def slice_with_planes_and_threshold(self, normal: np.ndarray, offsets: list, threshold: float) -> list:
+        # Returns a list with the sorted indices of each plane `dot(normal, x) = offset`, in the same order of `offsets`.
+        # The normal is expected to be normalized.
+        if self.aligned_axis(normal) >= 0:
+            return [self.slice_with_plane_and_threshold(normal * offset, normal, threshold) for offset in offsets]
+
+        # The vertices are projected and sorted only once, then every plane is a slab of the sorted projections
+        projections = np.inner(normal, self.vertices)
+        order = np.argsort(projections, kind='stable')
+        projections = projections[order]
+
+        offsets = np.asarray(offsets, float).ravel()
+        margin = 1e-6 * (np.abs(offsets) + abs(threshold) + 1.0)
+        starts = np.searchsorted(projections, offsets - threshold - margin, side='left').tolist()
+        ends = np.searchsorted(projections, offsets + threshold + margin, side='right').tolist()
+
+        result = []
+        for offset, start, end in zip(offsets, starts, ends):
+            mask = np.abs(projections[start:end] - offset) <= threshold
+            result.append(np.sort(order[start:end][mask]).astype(int, copy=False))
+
+        return result
+
+
+class GridIndex(ProjectionIndex):
+    def __init__(self, indices: np.ndarray, origin: np.ndarray, spacing: np.ndarray, dimensions: np.ndarray):
+        """
+        GridIndex is a ProjectionIndex for blocks that sit on a regular grid.
+
+        The vertices are sorted by their integer index in each axis (stable argsort), and the size of each layer
+        is counted, so the blocks of a slab are found directly from the grid geometry, without binary searches.
+        The coordinates aren't stored, they're computed from the indices of the blocks that are tested.
+        """
+        self.indices = np.asarray(indices).reshape((-1, 3))
+        self.origin = np.asarray(origin, float)
+        self.spacing = np.asarray(spacing, float)
+        self.dimensions = np.asarray(dimensions, int)
+
+        self.orders = [None, None, None]
+        self.offsets = [None, None, None]
+
+    @property
+    def vertices(self) -> np.ndarray:
+        return self.origin + self.spacing * self.indices
+
+    @property
+    def num_vertices(self) -> int:
+        return len(self.indices)
+
+    def take(self, rows: np.ndarray) -> np.ndarray:
+        return self.origin + self.spacing * self.indices[rows]
+
+    def sort_axis(self, axis: int) -> None:
+        if self.orders[axis] is not None:
+            return
+
+        index_type = np.int32 if self.num_vertices < np.iinfo(np.int32).max else np.int64
+        layers = self.indices[:, axis]
+        counts = np.bincount(layers, minlength=self.dimensions[axis])
+
+        self.orders[axis] = np.argsort(layers, kind='stable').astype(index_type, copy=False)
+        self.offsets[axis] = np.concatenate(([0], np.cumsum(counts)))
+
+    def range_along_axis(self, axis: int, lo: float, hi: float) -> np.ndarray:
+        # Returns the indices of the vertices of every layer between `lo` and `hi` (inclusive)
+        self.sort_axis(axis)
+
+        first = max(int(np.ceil((lo - self.origin[axis]) / self.spacing[axis])), 0)
+        last = min(int(np.floor((hi - self.origin[axis]) / self.spacing[axis])), self.dimensions[axis] - 1)
+
+        if first > last:
+            return self.orders[axis][:0]
+
+        return self.orders[axis][self.offsets[axis][first]:self.offsets[axis][last + 1]]
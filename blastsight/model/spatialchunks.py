@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+
+class SpatialChunks:
+    # Approximate number of items (points, blocks or triangles) of each chunk
+    CHUNK_SIZE = 32768
+
+    def __init__(self, order: np.ndarray, offsets: np.ndarray, lo: np.ndarray, hi: np.ndarray):
+        """
+        SpatialChunks partitions the items of an element (points, blocks or triangles) in chunks,
+        that is, the cells of a regular grid over its bounding box, so each chunk can be culled by itself.
+
+        The drawables upload their items sorted by chunk (`order`), so chunk `i` is the range
+        from offsets[i] to offsets[i + 1], and its axis-aligned bounding box goes from lo[i] to hi[i].
+        Before drawing, the chunks are tested against the view frustum, and only
+        the ranges of the visible ones are drawn (adjacent ranges are merged).
+        """
+        self.order = order
+        self.offsets = offsets
+        self.lo = lo
+        self.hi = hi
+
+    @property
+    def num_chunks(self) -> int:
+        return len(self.offsets) - 1
+
+    @property
+    def num_items(self) -> int:
+        return int(self.offsets[-1])
+
+    """
+    Partitioning
+    """
+    @staticmethod
+    def grid_cells(centers: np.ndarray, chunk_size: int) -> np.ndarray:
+        # Assigns a cell of a regular grid to each center, with roughly `chunk_size` centers per cell
+        # (the cells are almost cubes, so flat elements are split only in their longest axes)
+        num_cells = int(np.ceil(len(centers) / chunk_size))
+        if num_cells <= 1:
+            return np.zeros(len(centers), np.int64)
+
+        lo, hi = centers.min(axis=0), centers.max(axis=0)
+        extent = np.maximum(hi - lo, 1e-12)
+
+        active = extent > extent.max() * 1e-3
+        cell_side = (np.prod(extent[active]) / num_cells) ** (1.0 / active.sum())
+
+        dims = np.where(active, np.maximum(np.ceil(extent / cell_side), 1), 1).astype(np.int64)
+        cells = np.minimum(((centers - lo) / extent * dims).astype(np.int64), dims - 1)
+
+        return np.ravel_multi_index(cells.T, dims)
+
+    @classmethod
+    def partition(cls, centers: np.ndarray, chunk_size: int = None) -> tuple:
+        # Returns the order of the items (sorted by chunk), and the index of the first item of each chunk
+        cells = cls.grid_cells(centers, chunk_size or cls.CHUNK_SIZE)
+        if cells.max() <= np.iinfo(np.uint16).max:
+            cells = cells.astype(np.uint16)  # Stable sorts of 16-bit integers are radix sorts
+
+        index_type = np.int32 if len(centers) < np.iinfo(np.int32).max else np.int64
+        order = np.argsort(cells, kind='stable').astype(index_type, copy=False)
+        starts = np.flatnonzero(np.diff(cells[order].astype(np.int64), prepend=-1))
+
+        return order, starts
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0, np.int64), np.zeros(1, np.int64), np.empty((0, 3)), np.empty((0, 3)))
+
+    @classmethod
+    def from_points(cls, points: np.ndarray, margin=0.0, chunk_size: int = None):
+        # Points (or blocks), where margin is half of their sizes (a scalar, a 3D size, or a column with one per point)
+        points = np.asarray(points).reshape((-1, 3))
+        if len(points) == 0:
+            return cls.empty()
+
+        order, starts = cls.partition(points, chunk_size)
+        margin = np.asarray(margin, float)
+        if margin.ndim == 2:
+            margin = np.maximum.reduceat(margin[order], starts)
+
+        points = points[order]
+        lo = np.minimum.reduceat(points, starts) - margin
+        hi = np.maximum.reduceat(points, starts) + margin
+
+        return cls(order, np.append(starts, len(order)), lo, hi)
+
+    @classmethod
+    def from_triangles(cls, vertices: np.ndarray, indices: np.ndarray, chunk_size: int = None):
+        # Triangles, assigned to a chunk by their centroid
+        triangles = np.asarray(vertices)[np.asarray(indices).reshape((-1, 3))]
+        if len(triangles) == 0:
+            return cls.empty()
+
+        order, starts = cls.partition(triangles.mean(axis=1), chunk_size)
+        lo = np.minimum.reduceat(triangles.min(axis=1)[order], starts)
+        hi = np.maximum.reduceat(triangles.max(axis=1)[order], starts)
+
+        return cls(order, np.append(starts, len(order)), lo, hi)
+
+    """
+    Culling
+    """
+    @staticmethod
+    def frustum_planes(matrix: np.ndarray) -> np.ndarray:
+        # Planes (a, b, c, d) of the frustum of a projection matrix (usually proj * model_view),
+        # where ax + by + cz + d >= 0 is inside (Gribb & Hartmann)
+        m = np.asarray(matrix, float).reshape((4, 4))
+        planes = np.array([m[3] + m[0], m[3] - m[0],
+                           m[3] + m[1], m[3] - m[1],
+                           m[3] + m[2], m[3] - m[2]])
+
+        norms = np.linalg.norm(planes[:, :3], axis=1, keepdims=True)
+        return planes / np.where(norms > 0.0, norms, 1.0)
+
+    def cull(self, planes: np.ndarray) -> np.ndarray:
+        # Returns a mask of the chunks that intersect the frustum (conservatively).
+        # A chunk is outside if its corner that goes the furthest in the direction of a plane is outside it.
+        normals, d = planes[:, :3], planes[:, 3]
+        farthest = np.where(normals[:, np.newaxis] >= 0.0, self.hi, self.lo)  # (planes, chunks, 3)
+
+        return np.all(np.einsum('pcj,pj->pc', farthest, normals) + d[:, np.newaxis] >= 0.0, axis=0)
+
+    def ranges(self, mask: np.ndarray) -> tuple:
+        # Returns the (firsts, counts) of the ranges of the chunks in the mask, merging adjacent chunks
+        padded = np.concatenate(([False], mask, [False]))
+        edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+        starts, ends = self.offsets[edges[0::2]], self.offsets[edges[1::2]]
+
+        return starts.astype(np.int32), (ends - starts).astype(np.int32)
+
+    @staticmethod
+    def level_ranges(starts: np.ndarray, offsets: np.ndarray, mask: np.ndarray, levels: np.ndarray) -> tuple:
+        # Same as ranges(), for data with many levels of detail (see BlockOctree and MeshLOD), where the chunk `c`
+        # of the level `k` goes from starts[k] + offsets[k][c] to starts[k] + offsets[k][c + 1]
+        chunks = np.flatnonzero(mask)
+        levels = np.asarray(levels)[chunks]
+
+        firsts = starts[levels] + offsets[levels, chunks]
+        counts = offsets[levels, chunks + 1] - offsets[levels, chunks]
+
+        order = np.argsort(firsts, kind='stable')
+        firsts, counts = firsts[order], counts[order]
+
+        # A range starts where the previous one doesn't end there
+        new = np.ones(len(firsts), bool)
+        new[1:] = firsts[1:] != firsts[:-1] + counts[:-1]
+        ends = firsts + counts
+
+        merged_starts = firsts[new]
+        merged_ends = ends[np.append(np.flatnonzero(new)[1:] - 1, len(ends) - 1)] if len(ends) else ends
+
+        return merged_starts.astype(np.int32), (merged_ends - merged_starts).astype(np.int32)
+
+
+class Frustum:
+    def __init__(self, matrix: np.ndarray, viewport_height: float = 1.0):
+        """
+        Frustum is the view volume of a camera, given by its projection matrix (usually proj * model_view,
+        as a row-major numpy matrix) and the height of the viewport in pixels.
+
+        Besides its planes (see SpatialChunks.cull()), it estimates the size in pixels of
+        a length in the world, so the drawables can choose their levels of detail.
+        """
+        self.matrix = np.asarray(matrix, float).reshape((4, 4))
+        self.viewport_height = viewport_height
+        self.planes = SpatialChunks.frustum_planes(self.matrix)
+
+    def pixel_size(self, lo: np.ndarray, hi: np.ndarray, length: float) -> np.ndarray:
+        # Returns the size in pixels of `length`, in the closest point to the camera of each box (from lo to hi).
+        # In perspective, the size depends on the depth (w) of the point, while in orthographic projection w = 1.
+        centers = (np.asarray(lo) + np.asarray(hi)) / 2
+        radii = np.linalg.norm(np.asarray(hi) - np.asarray(lo), axis=-1) / 2
+
+        w = centers @ self.matrix[3, :3] + self.matrix[3, 3]
+        w_near = w - radii * np.linalg.norm(self.matrix[3, :3])
+        scale = 0.5 * self.viewport_height * np.linalg.norm(self.matrix[1, :3])
+
+        # Boxes that contain the camera are infinitely big
+        return np.where(w_near > 1e-6, length * scale / np.maximum(w_near, 1e-6), np.inf)
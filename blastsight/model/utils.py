@@ -5,9 +5,13 @@
 #  Distributed under the MIT License.
 #  See LICENSE for more info.
 
+import functools
 import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor
 from qtpy.QtGui import QColor
 
+
 def magnitude(vector: np.ndarray) -> float:
     return np.linalg.norm(vector)
 
@@ -53,40 +57,103 @@ def distances_between(origin: np.ndarray, points: np.ndarray) -> np.ndarray | No
 
 
 def points_inside_mesh(mesh, point_vertices: np.ndarray) -> np.ndarray:
-    # With ray tracing, we'll detect which points are inside the mesh
-    ray = np.array([0.0, 0.0, 1.0])  # Arbitrary direction
-    mask = []
+    # Returns a mask of the points that are inside the mesh (see MeshClassifier)
+    return mesh.contains_points(point_vertices)
+
 
-    # From the point center, if we hit the mesh an odd number of times, we're inside the mesh
-    for origin in point_vertices:
-        intersections = mesh.intersect_with_ray(origin, ray)
-        mask.append(len(intersections) > 0 and len(np.unique(intersections, axis=0)) % 2 == 1)
+# Resolution of the colormap lookup tables.
+# It's 2^10 + 1, so evenly spaced colors (like the middle one) land exactly in an entry.
+COLORMAP_RESOLUTION = 1025
 
-    return np.array(mask)
+# Values mapped by each thread in values_to_rgb
+COLORMAP_CHUNK_SIZE = 1 << 20
 
 
 def values_to_rgb(values: np.ndarray, vmin: float, vmax: float, colormap: str) -> np.ndarray:
-    initial, final = parse_colormap(colormap)
-    vals = np.interp(np.clip(values, vmin, vmax), (vmin, vmax), (0.0, 1.0))
+    # Maps each value to a color, gathering it from the colormap lookup table (see compile_colormap)
+    lut = compile_colormap(colormap)
+    values = np.asarray(values).ravel()
+    rgb = np.empty((values.size, 3), np.float32)
+
+    def map_chunk(start: int) -> None:
+        end = start + COLORMAP_CHUNK_SIZE
+        np.take(lut, colormap_indices(values[start:end], vmin, vmax), axis=0, out=rgb[start:end])
+
+    # The gather is memory-bound, but numpy releases the GIL, so big arrays are split between threads
+    if values.size <= COLORMAP_CHUNK_SIZE:
+        map_chunk(0)
+    else:
+        with ThreadPoolExecutor() as pool:
+            list(pool.map(map_chunk, range(0, values.size, COLORMAP_CHUNK_SIZE)))
+
+    return rgb
+
+
+def colormap_indices(values: np.ndarray, vmin: float, vmax: float) -> np.ndarray:
+    # Returns the index of each value in a colormap lookup table, clamping values to [vmin, vmax]
+    last = COLORMAP_RESOLUTION - 1
+
+    # Same behaviour as np.interp(values, (vmin, vmax), (0.0, 1.0)) when vmin == vmax
+    if vmax <= vmin:
+        return np.where(values < vmin, 0, last)
+
+    indices = np.subtract(values, vmin, dtype=float)
+    indices *= last / (vmax - vmin)
+    np.clip(indices, 0.0, last, out=indices)
+    indices += 0.5  # Round to the nearest entry
+
+    # NaNs are cast to an arbitrary integer, so they're clipped again
+    with np.errstate(invalid='ignore'):
+        indices = indices.astype(np.int32)
 
-    hsv = np.ones((vals.size, 3))
-    hsv[:, 0] = initial[0] + (final - initial)[0] * vals
-    hsv[:, 1] = initial[1] + (final - initial)[1] * vals
-    hsv[:, 2] = initial[2] + (final - initial)[2] * vals
+    return np.clip(indices, 0, last, out=indices)
 
-    return hsv_to_rgb(hsv)
+
+@functools.lru_cache(maxsize=64)
+def compile_colormap(colormap: str) -> np.ndarray:
+    """
+    Compiles a colormap string ('#FF0000-#0000FF', 'red-yellow-green', etc.)
+    into a (COLORMAP_RESOLUTION, 3) RGB lookup table.
+
+    The colors are evenly spaced, and interpolated in HSV (like the original two-color colormaps).
+    The table is cached (and read-only), so each colormap is compiled just once.
+    """
+    stops = parse_colormap(colormap)
+    if len(stops) == 0:
+        raise ValueError(f'Invalid colormap: {colormap}')
+
+    # Each pair of consecutive colors is a segment
+    stops = np.array(stops)
+    starts = stops[:-1].copy()
+    ends = stops[1:].copy()
+
+    # Achromatic colors (white, black, greys) have hue = -1, so they borrow the hue of the other end
+    starts[starts[:, 0] < 0.0, 0] = ends[starts[:, 0] < 0.0, 0]
+    ends[ends[:, 0] < 0.0, 0] = starts[ends[:, 0] < 0.0, 0]
+    np.clip(starts[:, 0], 0.0, None, out=starts[:, 0])
+    np.clip(ends[:, 0], 0.0, None, out=ends[:, 0])
+
+    # Position of each step inside its segment
+    steps = np.linspace(0.0, 1.0, COLORMAP_RESOLUTION) * len(starts)
+    segment = np.minimum(steps.astype(int), len(starts) - 1)
+    t = (steps - segment).reshape((-1, 1))
+
+    hsv = starts[segment] + (ends - starts)[segment] * t
+
+    lut = hsv_to_rgb(hsv).astype(np.float32)
+    lut.flags.writeable = False
+
+    return lut
 
 
 def parse_colormap(colormap: str) -> list:
+    # Returns the HSV values of each color of the colormap, or an empty list if the colormap is invalid
     try:
-        initial_str, final_str = colormap.split('-')
-        if not (QColor.isValidColor(initial_str) or QColor.isValidColor(final_str)):
+        colors = colormap.split('-')
+        if len(colors) < 2 or not all(map(QColor.isValidColor, colors)):
             return []
 
-        initial = np.array(QColor(initial_str).getHsvF()[:3])
-        final = np.array(QColor(final_str).getHsvF()[:3])
-
-        return [initial, final]
+        return [np.array(QColor(color).getHsvF()[:3]) for color in colors]
 
     except Exception:
         return []
@@ -17,12 +17,24 @@ class GLCollection:
         self._needs_update = True
         self._is_initialized = False
 
+        # Drawables indexed by their type, and associations indexed by the type of their drawables
+        self._by_type = {}
+        self._associations_by_type = {}
+
+        # Drawables that changed since the last frame (by id(drawable)), to be moved between programs
+        self._changed = OrderedDict()
+
     """
     Drawable collection handlers
     """
     def add(self, drawable: GLDrawable) -> None:
+        previous = self._collection.get(drawable.id)
+        if previous is not None and previous is not drawable:
+            self._unindex(previous)
+
         self._collection[drawable.id] = drawable
-        self._needs_update = True
+        self._by_type.setdefault(type(drawable), OrderedDict())[id(drawable)] = drawable
+        self._changed[id(drawable)] = drawable
 
     def get(self, _id: int) -> GLDrawable:
         return self._collection.get(_id)
@@ -39,24 +51,30 @@ class GLCollection:
 
     def delete(self, _id: int) -> None:
         drawable = self._collection.pop(_id)
+        self._unindex(drawable)
         drawable.cleanup()
 
     def clear(self) -> None:
         self._collection.clear()
+        self._by_type.clear()
+        self._changed.clear()
+        self._needs_update = True
+
+    def _unindex(self, drawable: GLDrawable) -> None:
+        # The drawable will be removed from its programs in the next frame
+        self._by_type.get(type(drawable), {}).pop(id(drawable), None)
+        self._changed[id(drawable)] = drawable
 
     def size(self) -> int:
         return len(self._collection)
 
     def select(self, drawable_type: type, selector: callable = lambda x: True) -> list:
-        # Filters by type
-        def matches_type(x) -> bool:
-            return type(x) is drawable_type
-
-        # Filters by type and selector
-        def matches_all(x) -> bool:
-            return matches_type(x) and selector(x)
+        # Filters by type (already indexed) and selector
+        drawables = list(self._by_type.get(drawable_type, {}).values())
+        return list(filter(selector, drawables))
 
-        return list(filter(matches_all, self.all_drawables()))
+    def contains(self, drawable: GLDrawable) -> bool:
+        return id(drawable) in self._by_type.get(type(drawable), {})
 
     @property
     def last_id(self) -> int:
@@ -84,14 +102,21 @@ class GLCollection:
             program.initialize()
 
     def associate(self, program: ShaderProgram, d_type: type, selector: callable = lambda x: True) -> None:
-        self._programs[program.class_name] = {
+        association = {
             'program': program,
             'type': d_type,
             'selector': selector,
         }
 
-    def recreate(self) -> None:
-        self._needs_update = True
+        self._programs[program.class_name] = association
+        self._associations_by_type.setdefault(d_type, []).append(association)
+
+    def recreate(self, drawable: GLDrawable = None) -> None:
+        # If we know which drawable changed, only that one will be moved between programs
+        if drawable is None:
+            self._needs_update = True
+        elif self.contains(drawable):
+            self._changed[id(drawable)] = drawable
 
     def get_program(self, program_name: str) -> ShaderProgram:
         return self._programs.get(program_name).get('program')
@@ -113,6 +138,39 @@ class GLCollection:
             visibles = list(filter(lambda x: x.is_visible or include_hidden, drawables))
             program.set_drawables(visibles)
 
+        self._changed.clear()
+
+    def update_changed_drawables(self) -> None:
+        # Moves only the drawables that changed, so it doesn't depend on the size of the collection
+        changes = OrderedDict()
+
+        for drawable in self._changed.values():
+            is_member = self.contains(drawable) and drawable.is_visible
+
+            for association in self._associations_by_type.get(type(drawable), []):
+                added, removed = changes.setdefault(association.get('program').class_name, ([], []))
+
+                if is_member and association.get('selector')(drawable):
+                    added.append(drawable)
+                else:
+                    removed.append(drawable)
+
+        self._changed.clear()
+
+        for program_name, (added, removed) in changes.items():
+            self.get_program(program_name).update_drawables(added, removed)
+
+    def cull(self, frustum) -> tuple:
+        # Culls the chunks of the visible drawables against the frustum (see SpatialChunks),
+        # and returns the total number of (culled, drawn) chunks
+        culled, drawn = 0, 0
+        for drawable in self._collection.values():
+            if drawable.is_visible:
+                c, d = drawable.cull(frustum)
+                culled, drawn = culled + c, drawn + d
+
+        return culled, drawn
+
     def update_uniform(self, uniform: str, *values) -> None:
         for program in self.all_programs():
             program.update_uniform(uniform, *values)
@@ -126,13 +184,13 @@ class GLCollection:
     """
     def draw_opaques(self) -> None:
         for program in self.all_programs():
-            if len(program.opaques) > 0:
+            if program.num_opaques > 0:
                 program.bind()
                 program.draw()
 
     def draw_transparents(self) -> None:
         for program in self.all_programs():
-            if len(program.transparents) > 0:
+            if program.num_transparents > 0:
                 program.bind()
                 program.redraw()
 
@@ -141,6 +199,8 @@ class GLCollection:
         if self._needs_update:
             self.update_drawables()
             self._needs_update = False
+        elif self._changed:
+            self.update_changed_drawables()
 
         self.draw_opaques()
         self.draw_transparents()
@@ -11,8 +11,10 @@ from ..drawables.meshgl import MeshGL
 from ..drawables.blockgl import BlockGL
 from ..drawables.linegl import LineGL
 from ..drawables.pointgl import PointGL
+from ..drawables.pointcloudgl import PointCloudGL
 from ..drawables.textgl import TextGL
 from ..drawables.tubegl import TubeGL
+from ..drawables.drillholesetgl import DrillholeSetGL
 
 from ..drawables.blocklegacygl import BlockLegacyGL
 from ..drawables.tubelegacygl import TubeLegacyGL
@@ -21,14 +23,18 @@ from ..glprograms.meshprogram import MeshProgram
 from ..glprograms.wireprogram import WireProgram
 from ..glprograms.highlightprogram import HighlightProgram
 from ..glprograms.turbomeshprogram import TurboMeshProgram
+from ..glprograms.turboblockprogram import TurboBlockProgram
+from ..glprograms.turbopointprogram import TurboPointProgram
 
 from ..glprograms.blockprogram import BlockProgram
 from ..glprograms.blocklegacyprogram import BlockLegacyProgram
 
 from ..glprograms.lineprogram import LineProgram
 from ..glprograms.pointprogram import PointProgram
+from ..glprograms.pointcloudprogram import PointCloudProgram
 from ..glprograms.tubeprogram import TubeProgram
 from ..glprograms.tubelegacyprogram import TubeLegacyProgram
+from ..glprograms.drillholesetprogram import DrillholeSetProgram
 
 from ..glprograms.meshphantomprogram import MeshPhantomProgram
 from ..glprograms.xsectionmeshprogram import XSectionMeshProgram
@@ -41,15 +47,21 @@ class GLDrawableCollection(GLCollection):
     def generate_associations(self):
         # Lines/Points
         self.associate(LineProgram(), LineGL)
-        self.associate(PointProgram(), PointGL)
+        self.associate(PointProgram(), PointGL, selector=lambda x: x.is_standard)
+        self.associate(TurboPointProgram(), PointGL, selector=lambda x: x.is_turbo_ready)
+        self.associate(PointCloudProgram(), PointCloudGL)
 
         # Tubes
         self.associate(TubeLegacyProgram(), TubeLegacyGL)
         self.associate(TubeProgram(), TubeGL)
 
+        # Drillholes
+        self.associate(DrillholeSetProgram(), DrillholeSetGL)
+
         # Blocks
         self.associate(BlockLegacyProgram(), BlockLegacyGL, selector=lambda x: x.is_standard)
         self.associate(BlockProgram(), BlockGL, selector=lambda x: x.is_standard)
+        self.associate(TurboBlockProgram(), BlockGL, selector=lambda x: x.is_turbo_ready)
 
         # Meshes
         self.associate(MeshProgram(), MeshGL, selector=lambda x: x.is_standard)
@@ -14,8 +14,10 @@ from .drawables.backgroundgl import BackgroundGL
 from .drawables.meshgl import MeshGL
 from .drawables.blockgl import BlockGL
 from .drawables.pointgl import PointGL
+from .drawables.pointcloudgl import PointCloudGL
 from .drawables.linegl import LineGL
 from .drawables.tubegl import TubeGL
+from .drawables.drillholesetgl import DrillholeSetGL
 
 from .drawables.blocklegacygl import BlockLegacyGL
 from .drawables.tubelegacygl import TubeLegacyGL
@@ -68,6 +70,9 @@ class DrawableFactory:
             return self.generate_drawable(TubeLegacyGL, self.engine.tubes, *args, **kwargs)
         return self.generate_drawable(TubeGL, self.engine.tubes, *args, **kwargs)
 
+    def drillholes(self, *args, **kwargs) -> DrillholeSetGL:
+        return self.generate_drawable(DrillholeSetGL, self.engine.drillholes, *args, **kwargs)
+
     def text(self, *args, **kwargs) -> TextGL:
         return self.generate_drawable(TextGL, self.engine.text, *args, **kwargs)
 
@@ -86,6 +91,9 @@ class DrawableFactory:
     def load_points(self, path: str, *args, **kwargs) -> PointGL:
         return self.generate_drawable(PointGL, self.engine.load_points, path, *args, **kwargs)
 
+    def load_point_cloud(self, path: str, *args, **kwargs) -> PointCloudGL:
+        return self.generate_drawable(PointCloudGL, self.engine.load_point_cloud, path, *args, **kwargs)
+
     def load_lines(self, path: str, *args, **kwargs) -> LineGL:
         return self.generate_drawable(LineGL, self.engine.load_lines, path, *args, **kwargs)
 
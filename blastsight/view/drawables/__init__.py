@@ -13,3 +13,4 @@ from .pointgl import PointGL
 from .linegl import LineGL
 from .meshgl import MeshGL
 from .tubegl import TubeGL
+from .drillholesetgl import DrillholeSetGL
@@ -7,34 +7,48 @@
 
 import numpy as np
 
-from .gldrawable import GLDrawable
+from .dfgl import DFGL
 from OpenGL.GL import *
 
 
-class BlockGL(GLDrawable):
+class BlockGL(DFGL):
     def __init__(self, element, *args, **kwargs):
+        """
+        BlockGL uploads every level of detail of its element (see BlockOctree), and before each frame,
+        each visible chunk chooses the coarsest level whose blocks still look smaller than `lod_error` pixels.
+        So the full resolution is only drawn near the camera. With lod_error = 0, every chunk uses level 0.
+        """
         super().__init__(element, *args, **kwargs)
         self.num_cubes = 0
 
     @property
     def is_standard(self) -> bool:
-        return not self.is_cross_sectioned
+        return not (self.is_cross_sectioned or self.is_turbo_ready)
+
+    @property
+    def is_turbo_ready(self) -> bool:
+        return self.is_boostable and not self.is_cross_sectioned
 
     """
     Internal methods
     """
     def generate_buffers(self) -> None:
         self._vaos = [glGenVertexArrays(1)]
-        self._vbos = glGenBuffers(3)
+        self._vbos = glGenBuffers(5)
 
     def setup_attributes(self) -> None:
         _POSITION = 0
         _COLOR = 1
         _ALPHA = 2
+        _VALUE = 3
+        _SCALE = 4
 
-        # Data
-        vertices = self.element.vertices.astype(np.float32)
-        colors = np.array(self.element.color, np.float32)
+        # Data (every level of detail, sorted by chunk, so only the chunks inside the view are drawn)
+        octree = self.element.octree
+        self.setup_chunks(octree)
+
+        vertices = np.ascontiguousarray(octree.vertices, np.float32)
+        scales = np.ascontiguousarray(octree.scales, np.float32)
         alpha = np.array([self.element.alpha], np.float32)
 
         self.num_cubes = len(vertices)
@@ -43,8 +57,9 @@ class BlockGL(GLDrawable):
 
         # Fill buffers (see GLDrawable)
         self.fill_buffer(_POSITION, 3, vertices, GLfloat, GL_FLOAT, self._vbos[_POSITION])
-        self.fill_buffer(_COLOR, 3, colors, GLfloat, GL_FLOAT, self._vbos[_COLOR])
+        self.fill_colors(_COLOR, _VALUE, colors=octree.colors, values=octree.values)
         self.fill_buffer(_ALPHA, 1, alpha, GLfloat, GL_FLOAT, self._vbos[_ALPHA])
+        self.fill_buffer(_SCALE, 1, scales, GLfloat, GL_FLOAT, self._vbos[_SCALE])
 
         # The attribute advances once per divisor instances of the set(s) of vertices being rendered.
         glVertexAttribDivisor(_ALPHA, 1)
@@ -52,6 +67,11 @@ class BlockGL(GLDrawable):
         glBindVertexArray(0)
 
     def draw(self) -> None:
+        firsts, counts = self.chunk_ranges
+        if len(firsts) == 0:
+            return
+
+        self.bind_colormap()
         glBindVertexArray(self.vao)
-        glDrawArrays(GL_POINTS, 0, self.num_cubes)
+        glMultiDrawArrays(GL_POINTS, firsts, counts, len(firsts))
         glBindVertexArray(0)
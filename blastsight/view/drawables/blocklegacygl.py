@@ -16,22 +16,27 @@ class BlockLegacyGL(BlockGL):
         super().__init__(element, *args, **kwargs)
         self.num_cubes = 0
 
+    @property
+    def is_turbo_ready(self) -> bool:
+        # The turbo blocks are generated in a geometry shader, which we're trying to avoid here
+        return False
+
     """
     Internal methods
     """
     def generate_buffers(self) -> None:
         self._vaos = [glGenVertexArrays(1)]
-        self._vbos = glGenBuffers(4)
+        self._vbos = glGenBuffers(5)
 
     def setup_attributes(self) -> None:
         _POSITION = 0
         _COLOR = 1
         _ALPHA = 2
         _TEMPLATE = 3
+        _VALUE = 4
 
         # Data
-        vertices = self.element.vertices.astype(np.float32)
-        colors = np.array(self.element.color, np.float32)
+        vertices = np.ascontiguousarray(self.element.vertices, np.float32)
         alpha = np.array([self.element.alpha], np.float32)
         template = self.generate_cube(self.element.block_size)
 
@@ -41,7 +46,7 @@ class BlockLegacyGL(BlockGL):
 
         # Fill buffers (see GLDrawable)
         self.fill_buffer(_POSITION, 3, vertices, GLfloat, GL_FLOAT, self._vbos[_POSITION])
-        self.fill_buffer(_COLOR, 3, colors, GLfloat, GL_FLOAT, self._vbos[_COLOR])
+        self.fill_colors(_COLOR, _VALUE)
         self.fill_buffer(_ALPHA, 1, alpha, GLfloat, GL_FLOAT, self._vbos[_ALPHA])
         self.fill_buffer(_TEMPLATE, 3, template, GLfloat, GL_FLOAT, self._vbos[_TEMPLATE])
 
@@ -50,10 +55,12 @@ class BlockLegacyGL(BlockGL):
         glVertexAttribDivisor(_COLOR, 1)
         glVertexAttribDivisor(_ALPHA, -1)
         glVertexAttribDivisor(_TEMPLATE, 0)
+        glVertexAttribDivisor(_VALUE, 1)
 
         glBindVertexArray(0)
 
     def draw(self) -> None:
+        self.bind_colormap()
         glBindVertexArray(self.vao)
         glDrawArraysInstanced(GL_TRIANGLES, 0, 36, self.num_cubes)
         glBindVertexArray(0)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from .gldrawable import GLDrawable
+from ...model import utils
+from OpenGL.GL import *
+
+
+class DFGL(GLDrawable):
+    def __init__(self, element, *args, **kwargs):
+        """
+        DFGL (DataFrameGL) is the base drawable of DFElement's children (blocks and points).
+
+        If the element doesn't have explicit colors, its raw values are uploaded only once,
+        and they're mapped to colors in the shaders, using the colormap as a 1D texture
+        and vmin/vmax as uniforms. Changing any of them doesn't need a reload.
+        """
+        super().__init__(element, *args, **kwargs)
+        self._colormap_texture = None
+        self._texture_colormap = None
+
+    @property
+    def uses_colormap(self) -> bool:
+        return self.element.datasets.get('color').size == 0
+
+    """
+    Internal methods
+    """
+    def fill_colors(self, color_pointer: int, value_pointer: int, colors=None, values=None) -> None:
+        # Only one of the attributes is enabled, the shaders choose using `use_colormap`.
+        # By default, the values/colors are the ones of the element (sorted by chunk).
+        if self.uses_colormap:
+            values = self.sorted_by_chunk(self.element.values) if values is None else values
+            values = np.ascontiguousarray(values, np.float32)
+            self.fill_buffer(value_pointer, 1, values, GLfloat, GL_FLOAT, self._vbos[value_pointer])
+        else:
+            colors = self.sorted_by_chunk(self.element.color) if colors is None else colors
+            colors = np.ascontiguousarray(colors, np.float32)
+            self.fill_buffer(color_pointer, 3, colors, GLfloat, GL_FLOAT, self._vbos[color_pointer])
+
+    def bind_colormap(self) -> None:
+        if not self.uses_colormap:
+            return
+
+        if self._colormap_texture is None:
+            self._colormap_texture = glGenTextures(1)
+
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_1D, self._colormap_texture)
+
+        # The texture is only re-uploaded when the colormap changes
+        if self._texture_colormap != self.element.colormap:
+            self.fill_texture(utils.compile_colormap(self.element.colormap))
+            self._texture_colormap = self.element.colormap
+
+    @staticmethod
+    def fill_texture(lut: np.ndarray) -> None:
+        glTexParameteri(GL_TEXTURE_1D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_1D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_1D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexImage1D(GL_TEXTURE_1D, 0, GL_RGB32F, len(lut), 0, GL_RGB, GL_FLOAT, lut)
+
+    def cleanup(self) -> None:
+        super().cleanup()
+        if self._colormap_texture is not None:
+            glDeleteTextures(1, [self._colormap_texture])
+            self._colormap_texture = None
+            self._texture_colormap = None
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from .gldrawable import GLDrawable
+from OpenGL.GL import *
+
+
+class DrillholeSetGL(GLDrawable):
+    def __init__(self, element, *args, **kwargs):
+        super().__init__(element, *args, **kwargs)
+        self.num_vertices = 0
+
+    def generate_buffers(self) -> None:
+        self._vaos = [glGenVertexArrays(1)]
+        self._vbos = glGenBuffers(3)
+
+    def setup_attributes(self) -> None:
+        _POSITION = 0
+        _COLOR = 1
+        _PROPERTIES = 2  # radius, resolution
+
+        # Every hole shares the same buffers, so the whole set is drawn with a single call
+        vertices = np.ascontiguousarray(self.element.vertices, np.float32)
+        self.num_vertices = len(vertices)
+
+        # The geometry shader colors each interval with the color of its first vertex
+        colors = np.empty((self.num_vertices, 4), np.float32)
+        colors[:, :3] = self.element.vertex_colors
+        colors[:, 3] = self.element.alpha
+
+        # Radius/Resolution
+        properties = np.array([self.element.radius, self.element.resolution], np.float32)
+
+        glBindVertexArray(self.vao)
+
+        # Fill buffers (see GLDrawable)
+        self.fill_buffer(_POSITION, 3, vertices, GLfloat, GL_FLOAT, self._vbos[_POSITION])
+        self.fill_buffer(_COLOR, 4, colors, GLfloat, GL_FLOAT, self._vbos[_COLOR])
+        self.fill_buffer(_PROPERTIES, 2, properties, GLfloat, GL_FLOAT, self._vbos[_PROPERTIES])
+
+        # Shared properties for all holes
+        glVertexAttribDivisor(_PROPERTIES, 1)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self._vbos[-1])
+
+        glBindVertexArray(0)
+
+    @property
+    def draw_ranges(self) -> tuple:
+        # First vertex and number of vertices of each visible hole
+        visible = self.element.visible_holes
+        firsts = self.element.offsets[visible]
+        counts = self.element.offsets[visible + 1] - firsts
+
+        return firsts.astype(np.int32), counts.astype(np.int32)
+
+    def draw(self) -> None:
+        firsts, counts = self.draw_ranges
+
+        if firsts.size == 0:
+            return
+
+        glBindVertexArray(self.vao)
+        glMultiDrawArrays(GL_LINE_STRIP, firsts, counts, firsts.size)
+        glBindVertexArray(0)
@@ -6,6 +6,7 @@
 #  See LICENSE for more info.
 
 import numpy as np
+from operator import attrgetter
 from OpenGL.GL import *
 
 
@@ -13,6 +14,7 @@ class GLDrawable:
     def __init__(self, element, *args, **kwargs):
         # assert element
         super().__setattr__('element', element)  # self.element = element
+        type(self).forward_attributes(type(element))
 
         self._vaos = []
         self._vbos = []
@@ -23,34 +25,62 @@ class GLDrawable:
         self._is_boostable = kwargs.pop('turbo', False)
         self._is_cross_sectioned = kwargs.pop('cross_section', False)
 
-    # Note: The following "hacks" are shortened versions of Delegator Pattern.
-    # They're convenient, but optional.
+        # Spatial chunks of the uploaded data, and the (firsts, counts) of the ones inside the view
+        self._chunks = None
+        self._chunk_mask = None
+        self._chunk_ranges = None
+
+        # Levels of detail of the uploaded data (if any), and the level drawn in each chunk
+        self._lod = None
+        self._lod_error = kwargs.pop('lod_error', 1.0)
+        self._chunk_levels = None
+
+    # Note: GLDrawable is a shortened version of the Delegator Pattern.
+    # The attributes of self.element are exposed as if they were GLDrawable's attributes.
     #
     # Example:
     # d = GLDrawable(element, *args, **kwargs)
     # assert d.alpha is d.element.alpha  => True
+    @classmethod
+    def forward_attributes(cls, element_class: type) -> None:
+        # Adds a property to this class for each attribute of element_class that we don't have,
+        # so reading/writing them goes straight to self.element without any hook.
+        # It's done once per (drawable class, element class) pair.
+        if element_class in cls.__dict__.get('_forwarded_classes', ()):
+            return
+
+        for name in dir(element_class):
+            if not name.startswith('__') and not hasattr(cls, name):
+                setattr(cls, name, property(attrgetter(f'element.{name}'), GLDrawable._element_setter(name)))
+
+        cls._forwarded_classes = cls.__dict__.get('_forwarded_classes', frozenset()) | {element_class}
+
+    @staticmethod
+    def _element_setter(name: str) -> callable:
+        def setter(self, value) -> None:
+            setattr(self.element, name, value)
+        return setter
+
     def __dir__(self) -> list:
-        # Hack to expose GLDrawable's attributes AND self.element's attributes
-        # as if they were GLDrawable's attributes.
+        # Expose GLDrawable's attributes AND self.element's attributes.
         # https://stackoverflow.com/q/15507848
         return list(set(super().__dir__() + dir(self.element)))
 
-    def __getattribute__(self, attr: str) -> any:
-        # Hack to get our attributes.
-        # If not found, search self.element's attributes.
-        # https://stackoverflow.com/a/2405617
-        if hasattr(type(self), attr) or attr in super().__getattribute__('__dict__'):
-            return super().__getattribute__(attr)
-        return super().__getattribute__('element').__getattribute__(attr)
+    def __getattr__(self, attr: str) -> any:
+        # Only called when the regular lookup fails, that is, for the custom properties of self.element
+        # (and attributes of an instance of a subclass of the element classes we forward)
+        element = self.__dict__.get('element')
+        if element is None:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{attr}'")
+        return getattr(element, attr)
 
     def __setattr__(self, key, value) -> None:
-        # Hack to set our attributes.
-        # We'll try to set our element's attribute first, then ourselves.
-        # https://stackoverflow.com/a/7042247
-        if key in dir(self.element):
-            self.element.__setattr__(key, value)
-        else:
+        # Our attributes and the forwarded ones are found in our class (or instance),
+        # so only the custom properties of self.element need to be forwarded here.
+        if key in self.__dict__ or hasattr(type(self), key) or key not in self.element.properties:
             super().__setattr__(key, value)
+        else:
+            self.element.__setattr__(key, value)
 
     @property
     def vao(self) -> int:
@@ -68,6 +98,11 @@ class GLDrawable:
         self.is_initialized = True
 
     def reload(self) -> None:
+        # The buffers of the previous upload are deleted, otherwise every reload would leak them
+        if self.is_initialized:
+            self.cleanup()
+            self._vaos, self._vbos = [], []
+
         self.is_initialized = False
         self.initialize()
 
@@ -87,6 +122,55 @@ class GLDrawable:
     def draw(self) -> None:
         pass
 
+    """
+    Culling
+    """
+    def setup_chunks(self, lod=None) -> None:
+        # Called by drawables that upload their data sorted by chunk (see SpatialChunks and sorted_by_chunk()),
+        # or every level of detail of their data, also sorted by chunk (see BlockOctree and MeshLOD)
+        self._lod = lod
+        self._chunks = self.element.chunks if lod is None else lod.chunks
+        self._chunk_mask = np.ones(self._chunks.num_chunks, bool)
+        self._chunk_levels = np.zeros(self._chunks.num_chunks, int)
+        self._chunk_ranges = self._chunks.ranges(self._chunk_mask)
+
+    def sorted_by_chunk(self, array: np.ndarray) -> np.ndarray:
+        # A single chunk is already sorted, so the data isn't copied
+        if self._chunks is None or self._chunks.num_chunks <= 1:
+            return array
+        return array[self._chunks.order]
+
+    @property
+    def chunk_ranges(self) -> tuple:
+        return self._chunk_ranges
+
+    def select_levels(self, frustum) -> np.ndarray:
+        # Level k has an error of lod.level_sizes[k] (in the world), so each chunk chooses the coarsest level
+        # where that error (in the closest point of the chunk) still looks smaller than lod_error pixels
+        num_chunks = self._chunks.num_chunks
+        if self._lod is None or self.is_cross_sectioned or self.lod_error == 0.0 or self._lod.num_levels == 1:
+            return np.zeros(num_chunks, int)
+
+        pixels = frustum.pixel_size(self._chunks.lo, self._chunks.hi, 1.0)
+        return np.sum(pixels[:, np.newaxis] * self._lod.level_sizes[1:] <= self.lod_error, axis=1)
+
+    def cull(self, frustum) -> tuple:
+        # Keeps the ranges of the chunks inside the frustum (each one in its level of detail),
+        # and returns the number of (culled, drawn) chunks
+        if self._chunks is None:
+            return 0, 0
+
+        mask = self._chunks.cull(frustum.planes)
+        levels = self.select_levels(frustum)
+
+        if not (np.array_equal(mask, self._chunk_mask) and np.array_equal(levels, self._chunk_levels)):
+            self._chunk_mask = mask
+            self._chunk_levels = levels
+            self._chunk_ranges = self._chunks.ranges(mask) if self._lod is None else self._lod.ranges(mask, levels)
+
+        drawn = int(mask.sum())
+        return self._chunks.num_chunks - drawn, drawn
+
     def cleanup(self) -> None:
         if self._is_initialized:
             glDeleteBuffers(len(self._vbos), self._vbos)
@@ -111,6 +195,10 @@ class GLDrawable:
     def is_cross_sectioned(self) -> bool:
         return self._is_cross_sectioned
 
+    @property
+    def lod_error(self) -> float:
+        return self._lod_error
+
     @is_initialized.setter
     def is_initialized(self, status: bool) -> None:
         self._is_initialized = status
@@ -130,6 +218,10 @@ class GLDrawable:
         self._is_cross_sectioned = status
         self.notify()
 
+    @lod_error.setter
+    def lod_error(self, pixels: float) -> None:
+        self._lod_error = max(float(pixels), 0.0)
+
     """
     Quick GLDrawable API
     """
@@ -137,8 +229,9 @@ class GLDrawable:
         self._observers.append(observer)
 
     def notify(self) -> None:
+        # Observers only need to update this drawable
         for observer in self._observers:
-            observer.recreate()
+            observer.recreate(self)
 
     def show(self) -> None:
         self.is_visible = True
@@ -15,6 +15,8 @@ class LineGL(GLDrawable):
     def __init__(self, element, *args, **kwargs):
         super().__init__(element, *args, **kwargs)
         self.num_vertices = 0
+        self.firsts = np.zeros(1, np.int32)
+        self.counts = np.zeros(1, np.int32)
 
     def generate_buffers(self) -> None:
         self._vaos = [glGenVertexArrays(1)]
@@ -25,12 +27,17 @@ class LineGL(GLDrawable):
         _COLOR = 1
 
         # Data
-        vertices = self.element.vertices.astype(np.float32)
+        vertices = np.ascontiguousarray(self.element.vertices, np.float32)
         colors = self.element.rgba.astype(np.float32)
 
         # np.array([[0, 1, 2]], type) has size 3, despite having only 1 list there
         self.num_vertices = len(vertices)
 
+        # Every polyline shares the same buffers, so all of them are drawn with a single call
+        offsets = self.element.offsets
+        self.firsts = offsets[:-1].astype(np.int32)
+        self.counts = np.diff(offsets).astype(np.int32)
+
         glBindVertexArray(self.vao)
 
         # Fill buffers (see GLDrawable)
@@ -44,6 +51,9 @@ class LineGL(GLDrawable):
     def draw(self) -> None:
         glBindVertexArray(self.vao)
         glLineWidth(self.element.thickness)
-        glDrawArrays(GL_LINE_STRIP, 0, self.num_vertices)
+        if len(self.firsts) == 1:
+            glDrawArrays(GL_LINE_STRIP, 0, self.num_vertices)
+        else:
+            glMultiDrawArrays(GL_LINE_STRIP, self.firsts, self.counts, len(self.firsts))
         glLineWidth(1)
         glBindVertexArray(0)
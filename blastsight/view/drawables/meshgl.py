@@ -5,6 +5,7 @@
 #  Distributed under the MIT License.
 #  See LICENSE for more info.
 
+import ctypes
 import numpy as np
 from OpenGL.GL import *
 
@@ -13,12 +14,18 @@ from .gldrawable import GLDrawable
 
 class MeshGL(GLDrawable):
     def __init__(self, element, *args, **kwargs):
+        """
+        If the levels of detail of its element are enabled (and built, see MeshLOD), MeshGL uploads every level,
+        and before each frame, each visible chunk chooses the coarsest level whose error still looks smaller
+        than `lod_error` pixels. Otherwise (or while they're being built), only the full resolution is uploaded.
+        """
         super().__init__(element, *args, **kwargs)
         self.indices_size = 0
         self._xsection_width = kwargs.pop('cross_section_width', 5)
         self._highlighted = kwargs.pop('highlight', False)
         self._wireframed = kwargs.pop('wireframe', False)
         self._phantom = kwargs.pop('phantom', False)
+        self._lod_enabled = kwargs.pop('lod', False)
 
     """
     Properties
@@ -46,6 +53,19 @@ class MeshGL(GLDrawable):
     def is_phantom(self) -> bool:
         return self._phantom
 
+    @property
+    def is_lod_enabled(self) -> bool:
+        return self._lod_enabled
+
+    @property
+    def triangles_drawn(self) -> int:
+        # Triangles drawn in the last frame (turbo meshes are always drawn in full resolution)
+        if self.is_turbo_ready:
+            return self.element.indices.size // 3
+        if self.chunk_ranges is None:
+            return 0
+        return int(self.chunk_ranges[1].sum())
+
     @property
     def is_turbo_ready(self) -> bool:
         return self.is_boostable and not any([self.is_highlighted,
@@ -68,6 +88,11 @@ class MeshGL(GLDrawable):
         self._phantom = status
         self.notify()
 
+    @is_lod_enabled.setter
+    def is_lod_enabled(self, status: bool) -> None:
+        self._lod_enabled = status
+        self.notify()
+
     @cross_section_width.setter
     def cross_section_width(self, value: int) -> None:
         self._xsection_width = value
@@ -107,9 +132,17 @@ class MeshGL(GLDrawable):
         _POSITION = 0
         _COLOR = 1
 
-        # Data
-        vertices = self.element.vertices.astype(np.float32)
-        indices = self.element.indices.astype(np.uint32)
+        # Data (np.ascontiguousarray only copies if the dtype/layout is wrong)
+        # The triangles are sorted by chunk, so only the chunks inside the view are drawn
+        # (with every level of detail after them, if they're enabled and ready)
+        lod = self.element.lod if self.is_lod_enabled else None
+        self.setup_chunks(lod)
+
+        vertices = np.ascontiguousarray(self.element.vertices, np.float32)
+        if lod is None:
+            indices = np.ascontiguousarray(self.sorted_by_chunk(self.element.indices.reshape((-1, 3))), np.uint32)
+        else:
+            indices = lod.indices
         colors = self.element.rgba.astype(np.float32)
 
         self.indices_size = indices.size
@@ -130,6 +163,15 @@ class MeshGL(GLDrawable):
         glBindVertexArray(0)
 
     def draw(self) -> None:
+        # The ranges are in triangles (3 indices of 4 bytes each)
+        firsts, counts = self.chunk_ranges
+        if len(firsts) == 0:
+            return
+
         glBindVertexArray(self.vao)
-        glDrawElements(GL_TRIANGLES, self.indices_size, GL_UNSIGNED_INT, None)
+        if len(firsts) == 1:
+            glDrawElements(GL_TRIANGLES, 3 * int(counts[0]), GL_UNSIGNED_INT, ctypes.c_void_p(12 * int(firsts[0])))
+        else:
+            byte_offsets = (ctypes.c_void_p * len(firsts))(*(12 * firsts.astype(np.int64)).tolist())
+            glMultiDrawElements(GL_TRIANGLES, 3 * counts, GL_UNSIGNED_INT, byte_offsets, len(firsts))
         glBindVertexArray(0)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from .dfgl import DFGL
+from ..glprograms.bufferpool import BufferPool
+from ...model.pointoctree import PointStreamer
+from OpenGL.GL import *
+
+_POSITION = 0
+_ALPHA = 2
+_SIZE = 3
+_VALUE = 4
+
+
+class PointCloudGL(DFGL):
+    def __init__(self, element, *args, **kwargs):
+        """
+        PointCloudGL draws a PointCloudElement, streaming the nodes of its octree that the view needs.
+
+        Before each frame, the visible nodes are chosen by priority until `point_budget` points
+        (see PointOctree.select()), the missing ones are read in a background thread (see PointStreamer),
+        and the ones that were read are uploaded as items of a BufferPool.
+        Nodes that aren't needed anymore stay in the pool until it has twice the budget,
+        and then they're evicted in least-recently-used order.
+        """
+        point_budget = kwargs.pop('point_budget', 5_000_000)
+        super().__init__(element, *args, **kwargs)
+        self._point_budget = int(point_budget)
+
+        self._pool = None
+        self._streamer = None
+        self._selected = np.empty(0, np.int64)
+        self._draw_list = None
+
+    @property
+    def point_budget(self) -> int:
+        return self._point_budget
+
+    @property
+    def is_streaming(self) -> bool:
+        return self._streamer is not None and self._streamer.is_streaming
+
+    @property
+    def points_drawn(self) -> int:
+        return 0 if self._draw_list is None else int(self._draw_list[1].sum())
+
+    @point_budget.setter
+    def point_budget(self, points: int) -> None:
+        self._point_budget = max(int(points), 0)
+        if self._streamer is not None:
+            self._streamer.capacity = 2 * self._point_budget
+
+    """
+    Internal methods
+    """
+    def generate_buffers(self) -> None:
+        if self._pool is not None:
+            self._pool.cleanup()
+        self._pool = BufferPool([(_POSITION, 3), (_VALUE, 1)])
+
+    def setup_attributes(self) -> None:
+        # Nothing is uploaded here, the nodes are uploaded when they're selected (see cull())
+        if self._streamer is not None:
+            self._streamer.clear()
+
+        self._streamer = PointStreamer(self.element.octree, 2 * self.point_budget)
+        self._selected = np.empty(0, np.int64)
+        self._draw_list = None
+
+    def cull(self, frustum) -> tuple:
+        # Uploads the nodes that were read, evicts the old ones, and returns the number of (culled, drawn) nodes
+        if self._streamer is None:
+            return 0, 0
+
+        octree = self.element.octree
+        selected = octree.select(frustum, self.point_budget)
+        ready, evicted = self._streamer.update(selected)
+
+        for node in evicted:
+            self._pool.release(node)
+        for node, (vertices, values) in ready:
+            self._pool.add(node, [vertices, values])
+
+        # Selected nodes that aren't loaded yet are drawn in later frames
+        if ready or evicted or self._draw_list is None or not np.array_equal(selected, self._selected):
+            self._selected = selected
+            self._draw_list = self._pool.draw_list([node for node in selected.tolist() if node in self._pool])
+
+        drawn = len(self._draw_list[0])
+        return octree.num_nodes - drawn, drawn
+
+    def draw(self) -> None:
+        if self._draw_list is None or len(self._draw_list[0]) == 0:
+            return
+
+        # Alpha and size are the same for every point, so they're constant attributes
+        self.bind_colormap()
+        glVertexAttrib1f(_ALPHA, self.element.alpha)
+        glVertexAttrib1f(_SIZE, self.element.avg_size)
+        self._pool.draw(GL_POINTS, self._draw_list)
+
+    def cleanup(self) -> None:
+        super().cleanup()
+        if self._pool is not None:
+            self._pool.cleanup()
+        if self._streamer is not None:
+            self._streamer.clear()
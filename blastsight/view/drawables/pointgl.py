@@ -7,30 +7,42 @@
 
 import numpy as np
 
-from .gldrawable import GLDrawable
+from .dfgl import DFGL
 from OpenGL.GL import *
 
 
-class PointGL(GLDrawable):
+class PointGL(DFGL):
     def __init__(self, element, *args, **kwargs):
         super().__init__(element, *args, **kwargs)
         self.num_points = 0
 
+    @property
+    def is_standard(self) -> bool:
+        return not self.is_turbo_ready
+
+    @property
+    def is_turbo_ready(self) -> bool:
+        return self.is_boostable
+
+    """
+    Internal methods
+    """
     def generate_buffers(self) -> None:
         self._vaos = [glGenVertexArrays(1)]
-        self._vbos = glGenBuffers(4)
+        self._vbos = glGenBuffers(5)
 
     def setup_attributes(self) -> None:
         _POSITION = 0
         _COLOR = 1
         _ALPHA = 2
         _SIZE = 3
+        _VALUE = 4
 
-        # Data
-        vertices = self.element.vertices.astype(np.float32)
-        colors = self.element.color.astype(np.float32)
+        # Data (sorted by chunk, so only the chunks inside the view are drawn)
+        self.setup_chunks()
+        vertices = np.ascontiguousarray(self.sorted_by_chunk(self.element.vertices), np.float32)
         alpha = np.array([self.element.alpha], np.float32)
-        sizes = self.element.point_size.astype(np.float32)
+        sizes = np.ascontiguousarray(self.sorted_by_chunk(self.element.point_size), np.float32)
 
         self.num_points = len(vertices)
 
@@ -38,7 +50,7 @@ class PointGL(GLDrawable):
 
         # Fill buffers (see GLDrawable)
         self.fill_buffer(_POSITION, 3, vertices, GLfloat, GL_FLOAT, self._vbos[_POSITION])
-        self.fill_buffer(_COLOR, 3, colors, GLfloat, GL_FLOAT, self._vbos[_COLOR])
+        self.fill_colors(_COLOR, _VALUE)
         self.fill_buffer(_ALPHA, 1, alpha, GLfloat, GL_FLOAT, self._vbos[_ALPHA])
         self.fill_buffer(_SIZE, 1, sizes, GLfloat, GL_FLOAT, self._vbos[_SIZE])
 
@@ -49,6 +61,11 @@ class PointGL(GLDrawable):
         glBindVertexArray(0)
 
     def draw(self) -> None:
+        firsts, counts = self.chunk_ranges
+        if len(firsts) == 0:
+            return
+
+        self.bind_colormap()
         glBindVertexArray(self.vao)
-        glDrawArrays(GL_POINTS, 0, self.num_points)
+        glMultiDrawArrays(GL_POINTS, firsts, counts, len(firsts))
         glBindVertexArray(0)
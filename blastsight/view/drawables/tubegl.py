@@ -26,7 +26,7 @@ class TubeGL(GLDrawable):
         _PROPERTIES = 2  # radius, resolution
 
         # Data
-        vertices = self.element.vertices
+        vertices = np.ascontiguousarray(self.element.vertices, np.float32)
         self.num_tubes = len(self.element.vertices)
 
         # Color extraction
@@ -31,17 +31,16 @@ class TubeLegacyGL(GLDrawable):
         self.num_vertices = vertices.size
 
         # Color extraction
-        colors = []
         num_tubes = len(self.element.vertices) - 1
-        triangles_per_tube = self.num_vertices // (3 * num_tubes)
+        vertices_per_tube = self.num_vertices // (3 * num_tubes)
 
         # Check if single-color (replicate) or multiple color (for each tube)
         if hasattr(self.element.color[0], '__len__'):
-            for i in range(num_tubes):
-                # When loop=True, we will replicate the last tube color
-                index = min(i, len(self.element.color) - 1)
-                base_color = np.append(self.element.color[index][:3], self.element.alpha)
-                colors.append(np.tile(base_color, triangles_per_tube))
+            # When loop=True, we will replicate the last tube color
+            index = np.minimum(np.arange(num_tubes), len(self.element.color) - 1)
+            base_colors = np.array(self.element.color)[index, :3]
+            base_colors = np.column_stack((base_colors, np.full(num_tubes, self.element.alpha)))
+            colors = np.repeat(base_colors, vertices_per_tube, axis=0)
         else:
             base_color = np.append(self.element.color[:3], self.element.alpha)
             colors = np.tile(base_color, self.num_vertices)
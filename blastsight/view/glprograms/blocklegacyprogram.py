@@ -12,3 +12,12 @@ class BlockLegacyProgram(ShaderProgram):
     def __init__(self):
         super().__init__()
         self.base_name = 'BlockLegacy'
+
+    def initialize(self) -> None:
+        super().initialize()
+        self.add_colormap_handlers()
+
+    def inner_draw(self, drawables: list) -> None:
+        for drawable in drawables:
+            self.update_colormap_uniforms(drawable)
+            drawable.draw()
@@ -17,6 +17,7 @@ class BlockProgram(ShaderProgram):
     def initialize(self) -> None:
         super().initialize()
         self.add_uniform_handler('block_size')
+        self.add_colormap_handlers()
 
     def generate_shaders(self) -> list:
         shaders = super().generate_shaders()
@@ -27,4 +28,5 @@ class BlockProgram(ShaderProgram):
     def inner_draw(self, drawables: list) -> None:
         for drawable in drawables:
             self.update_uniform('block_size', *drawable.element.block_size)
+            self.update_colormap_uniforms(drawable)
             drawable.draw()
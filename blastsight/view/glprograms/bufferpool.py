@@ -0,0 +1,258 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import bisect
+import ctypes
+import numpy as np
+from OpenGL.GL import *
+
+
+class RangeAllocator:
+    def __init__(self, capacity: int = 0):
+        """
+        RangeAllocator sub-allocates contiguous ranges of a buffer of `capacity` elements.
+
+        Released ranges are kept as holes (sorted by offset, and merged with their neighbours),
+        and they're reused first-fit. When nothing fits, allocate() returns -1,
+        so the owner of the buffer can grow it (see BufferPool).
+        """
+        self.capacity = capacity
+        self.end = 0  # Everything after `end` is free
+        self.holes = []  # (offset, size), sorted by offset
+
+    @property
+    def used(self) -> int:
+        return self.end - sum(size for _, size in self.holes)
+
+    def reset(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.end = 0
+        self.holes = []
+
+    def fits(self, size: int) -> bool:
+        return self.end + size <= self.capacity or any(hole >= size for _, hole in self.holes)
+
+    def allocate(self, size: int) -> int:
+        if size == 0:
+            return 0
+
+        for i, (offset, hole) in enumerate(self.holes):
+            if hole >= size:
+                if hole == size:
+                    self.holes.pop(i)
+                else:
+                    self.holes[i] = (offset + size, hole - size)
+                return offset
+
+        if self.end + size <= self.capacity:
+            self.end += size
+            return self.end - size
+
+        return -1
+
+    def release(self, offset: int, size: int) -> None:
+        if size == 0:
+            return
+
+        i = bisect.bisect(self.holes, (offset, size))
+        self.holes.insert(i, (offset, size))
+
+        # Merge with the next hole, then with the previous one
+        if i + 1 < len(self.holes) and offset + size == self.holes[i + 1][0]:
+            self.holes[i] = (offset, size + self.holes.pop(i + 1)[1])
+        if i > 0 and sum(self.holes[i - 1]) == offset:
+            self.holes[i - 1] = (self.holes[i - 1][0], self.holes[i - 1][1] + self.holes.pop(i)[1])
+
+        # A hole at the end isn't a hole anymore
+        if self.holes and sum(self.holes[-1]) == self.end:
+            self.end = self.holes.pop()[0]
+
+
+class BufferPool:
+    def __init__(self, attributes: list, indexed: bool = False):
+        """
+        BufferPool keeps the data of many items (drawables) in a few shared buffers
+        (one per attribute, plus one for the indices), so that any subset of them
+        can be drawn with a single multi-draw call.
+
+        Each item owns a range of vertices (and indices), so adding an item only uploads its data,
+        and hiding it only removes it from the draw list. When the buffers are full, they're grown
+        (at least doubled), and the ranges of the items are packed in the new buffers,
+        copying them in the GPU (glCopyBufferSubData) instead of uploading them again.
+
+        Indices are relative to the first vertex of their item (see glMultiDrawElementsBaseVertex),
+        so the items can be moved without rewriting them.
+
+        Every attribute is made of GLfloats, described as (location, size).
+        """
+        self.attributes = attributes
+        self.is_indexed = indexed
+
+        self.vertex_ranges = RangeAllocator()
+        self.index_ranges = RangeAllocator()
+        self.items = {}  # key -> [vertex_offset, num_vertices, index_offset, num_indices]
+
+        self.vao = None
+        self.vbos = []  # One per attribute, and the indices at the end
+
+    def __contains__(self, key) -> bool:
+        return key in self.items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    @property
+    def num_buffers(self) -> int:
+        return len(self.attributes) + int(self.is_indexed)
+
+    def fits(self, num_vertices: int, num_indices: int = 0) -> bool:
+        return self.vertex_ranges.fits(num_vertices) and self.index_ranges.fits(num_indices)
+
+    """
+    Items
+    """
+    def add(self, key, arrays: list, indices: np.ndarray = None) -> None:
+        # Uploads the arrays of the item (one per attribute) and its indices (if indexed)
+        self.release(key)
+
+        num_vertices = len(arrays[0])
+        num_indices = indices.size if self.is_indexed else 0
+
+        if self.vao is None or not self.fits(num_vertices, num_indices):
+            self.grow(num_vertices, num_indices)
+
+        item = [self.vertex_ranges.allocate(num_vertices), num_vertices,
+                self.index_ranges.allocate(num_indices), num_indices]
+        self.items[key] = item
+
+        for attribute, array in enumerate(arrays):
+            self.write(key, attribute, array)
+
+        if self.is_indexed:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.vbos[-1])
+            glBufferSubData(GL_ELEMENT_ARRAY_BUFFER, 4 * item[2], 4 * num_indices,
+                            np.ascontiguousarray(indices, np.uint32))
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+    def write(self, key, attribute: int, array: np.ndarray) -> None:
+        # Overwrites an attribute of an item (the array must have the same number of vertices)
+        vertex_offset, num_vertices = self.items[key][:2]
+        size = self.attributes[attribute][1]
+        array = np.ascontiguousarray(array, np.float32)
+
+        glBindBuffer(GL_ARRAY_BUFFER, self.vbos[attribute])
+        glBufferSubData(GL_ARRAY_BUFFER, 4 * size * vertex_offset, 4 * size * num_vertices, array)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def release(self, key) -> None:
+        item = self.items.pop(key, None)
+        if item is not None:
+            self.vertex_ranges.release(item[0], item[1])
+            self.index_ranges.release(item[2], item[3])
+
+    """
+    Buffers
+    """
+    def grow(self, num_vertices: int, num_indices: int) -> None:
+        # New buffers with room for (at least) twice the current data
+        vertex_capacity = max(2 * self.vertex_ranges.used + num_vertices, 1024)
+        index_capacity = max(2 * self.index_ranges.used + num_indices, 1024) if self.is_indexed else 0
+
+        old_vbos = self.vbos
+        self.vbos = [int(vbo) for vbo in np.atleast_1d(glGenBuffers(self.num_buffers))]
+
+        buffers = [(4 * size, vertex_capacity) for _, size in self.attributes]
+        if self.is_indexed:
+            buffers.append((4, index_capacity))
+
+        for vbo, (stride, capacity) in zip(self.vbos, buffers):
+            glBindBuffer(GL_COPY_WRITE_BUFFER, vbo)
+            glBufferData(GL_COPY_WRITE_BUFFER, stride * capacity, None, GL_STATIC_DRAW)
+
+        # Pack the items in the new buffers
+        self.vertex_ranges.reset(vertex_capacity)
+        self.index_ranges.reset(index_capacity)
+
+        for item in self.items.values():
+            offsets = [self.vertex_ranges.allocate(item[1]), self.index_ranges.allocate(item[3])]
+
+            for i, (stride, _) in enumerate(buffers):
+                old_offset, new_offset, count = (item[0], offsets[0], item[1]) if i < len(self.attributes) \
+                    else (item[2], offsets[1], item[3])
+
+                if count > 0:
+                    glBindBuffer(GL_COPY_READ_BUFFER, old_vbos[i])
+                    glBindBuffer(GL_COPY_WRITE_BUFFER, self.vbos[i])
+                    glCopyBufferSubData(GL_COPY_READ_BUFFER, GL_COPY_WRITE_BUFFER,
+                                        stride * old_offset, stride * new_offset, stride * count)
+
+            item[0], item[2] = offsets
+
+        glBindBuffer(GL_COPY_READ_BUFFER, 0)
+        glBindBuffer(GL_COPY_WRITE_BUFFER, 0)
+
+        if len(old_vbos) > 0:
+            glDeleteBuffers(len(old_vbos), old_vbos)
+
+        self.setup_vao()
+
+    def setup_vao(self) -> None:
+        if self.vao is None:
+            self.vao = glGenVertexArrays(1)
+
+        glBindVertexArray(self.vao)
+
+        for vbo, (location, size) in zip(self.vbos, self.attributes):
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glVertexAttribPointer(location, size, GL_FLOAT, False, 0, None)
+            glEnableVertexAttribArray(location)
+
+        if self.is_indexed:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.vbos[-1])
+
+        glBindVertexArray(0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+    def cleanup(self) -> None:
+        if len(self.vbos) > 0:
+            glDeleteBuffers(len(self.vbos), self.vbos)
+        if self.vao is not None:
+            glDeleteVertexArrays(1, [self.vao])
+
+        self.vao = None
+        self.vbos = []
+        self.items.clear()
+        self.vertex_ranges.reset(0)
+        self.index_ranges.reset(0)
+
+    """
+    Drawing
+    """
+    def draw_list(self, keys: list) -> tuple:
+        # Arguments of the multi-draw call of the given items (see draw())
+        table = np.array([self.items[key] for key in keys], np.int64).reshape((-1, 4))
+
+        if not self.is_indexed:
+            return table[:, 0].astype(np.int32), table[:, 1].astype(np.int32)
+
+        byte_offsets = (ctypes.c_void_p * len(table))(*(4 * table[:, 2]).tolist())
+        return table[:, 3].astype(np.int32), byte_offsets, table[:, 0].astype(np.int32)
+
+    def draw(self, mode, draw_list: tuple) -> None:
+        if self.vao is None or len(draw_list[0]) == 0:
+            return
+
+        glBindVertexArray(self.vao)
+
+        if self.is_indexed:
+            counts, byte_offsets, base_vertices = draw_list
+            glMultiDrawElementsBaseVertex(mode, counts, GL_UNSIGNED_INT, byte_offsets, len(counts), base_vertices)
+        else:
+            firsts, counts = draw_list
+            glMultiDrawArrays(mode, firsts, counts, len(counts))
+
+        glBindVertexArray(0)
@@ -0,0 +1,15 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+from .tubeprogram import TubeProgram
+
+
+class DrillholeSetProgram(TubeProgram):
+    def __init__(self):
+        # Drillholes are drawn with the tube shaders, but programs are associated by class name
+        super().__init__()
+        self.base_name = 'Tube'
@@ -137,6 +137,11 @@ class GridComposite(ShaderProgram):
         self.grid_program.set_drawables(drawables)
         self.text_program.set_drawables(all_text_drawables)
 
+    def update_drawables(self, added: list, removed: list) -> None:
+        # The labels of every grid are generated again
+        removed_ids = set(map(id, removed + added))
+        self.set_drawables([d for d in self.drawables if id(d) not in removed_ids] + added)
+
     def bind(self) -> None:
         pass
 
@@ -0,0 +1,13 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+from .pointprogram import PointProgram
+
+
+class PointCloudProgram(PointProgram):
+    # Same shaders as PointProgram, for the streamed point clouds (see PointCloudGL)
+    pass
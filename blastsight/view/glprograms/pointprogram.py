@@ -17,8 +17,10 @@ class PointProgram(ShaderProgram):
         super().initialize()
         self.add_uniform_handler('viewport')
         self.add_uniform_handler('marker')
+        self.add_colormap_handlers()
 
     def inner_draw(self, drawables: list) -> None:
         for drawable in drawables:
             self.update_uniform('marker', drawable.element.marker_num)
+            self.update_colormap_uniforms(drawable)
             drawable.draw()
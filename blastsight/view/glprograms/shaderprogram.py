@@ -20,8 +20,9 @@ class ShaderProgram:
         self.uniform_locations = {}
         self.uniform_values = {}
 
-        self.opaques = []
-        self.transparents = []
+        # Drawables by id(drawable), so that they can be moved without searching them
+        self._opaques = {}
+        self._transparents = {}
 
     @property
     def vertex_path(self) -> str:
@@ -35,10 +36,26 @@ class ShaderProgram:
     def geometry_path(self) -> str:
         return f'{self.base_folder}/{self.base_name}/geometry.glsl'
 
+    @property
+    def opaques(self) -> list:
+        return list(self._opaques.values())
+
+    @property
+    def transparents(self) -> list:
+        return list(self._transparents.values())
+
     @property
     def drawables(self) -> list:
         return self.opaques + self.transparents
 
+    @property
+    def num_opaques(self) -> int:
+        return len(self._opaques)
+
+    @property
+    def num_transparents(self) -> int:
+        return len(self._transparents)
+
     @property
     def class_name(self) -> str:
         return self.__class__.__name__
@@ -78,11 +95,42 @@ class ShaderProgram:
             self.shader_program.bind()
             self.shader_program.setUniformValue(self.uniform_locations[loc_str], *values)
 
+    def add_colormap_handlers(self) -> None:
+        # Used by programs that map values to colors in the shaders (see DFGL)
+        self.add_uniform_handler('use_colormap')
+        self.add_uniform_handler('colormap')
+        self.add_uniform_handler('vmin')
+        self.add_uniform_handler('vmax')
+
+        # The colormap texture is always bound to GL_TEXTURE0
+        self.update_uniform('colormap', 0)
+
+    def update_colormap_uniforms(self, drawable) -> None:
+        self.update_uniform('use_colormap', int(drawable.uses_colormap))
+        self.update_uniform('vmin', float(drawable.element.vmin))
+        self.update_uniform('vmax', float(drawable.element.vmax))
+
     def set_drawables(self, drawables: list) -> None:
-        self.opaques = [d for d in drawables if d.alpha >= 0.99]
-        self.transparents = [d for d in drawables if d.alpha < 0.99]
+        self._opaques.clear()
+        self._transparents.clear()
+        self._insert_drawables(drawables)
+
+    def update_drawables(self, added: list, removed: list) -> None:
+        # Incremental version of set_drawables(), where only the given drawables are moved.
+        # Drawables already added keep their place, but they're classified again (their alpha may have changed).
+        for drawable in removed:
+            self._opaques.pop(id(drawable), None)
+            self._transparents.pop(id(drawable), None)
+
+        self._insert_drawables(added)
+
+    def _insert_drawables(self, drawables: list) -> None:
+        for drawable in drawables:
+            is_opaque = drawable.alpha >= 0.99
+            target, other = (self._opaques, self._transparents) if is_opaque else (self._transparents, self._opaques)
 
-        for drawable in self.drawables:
+            other.pop(id(drawable), None)
+            target[id(drawable)] = drawable
             drawable.initialize()
 
     def bind(self) -> None:
@@ -6,6 +6,7 @@ layout (triangle_strip, max_vertices = 12) out;
 in vec3 v_position[1];
 in vec3 v_color[1];
 in float v_alpha[1];
+in float v_scale[1];
 
 out vec3 v_normal;
 out vec3 f_color;
@@ -59,7 +60,7 @@ void add_face(vec4 center, vec4 shift, vec4 dy, vec4 dx, vec3 n)
 void main()
 {
     vec4 center = model_view_matrix * vec4(v_position[0], 1.0);
-    vec3 half_block = 0.5f * block_size;
+    vec3 half_block = 0.5f * block_size * v_scale[0];
 
     vec4 dx = model_view_matrix[0] * half_block.x;
     vec4 dy = model_view_matrix[1] * half_block.y;
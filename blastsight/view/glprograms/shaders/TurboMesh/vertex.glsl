@@ -0,0 +1,24 @@
+#version 140
+#extension GL_ARB_explicit_attrib_location : require
+
+layout (location = 0) in vec3 a_position;
+layout (location = 1) in float a_slot;
+
+out vec3 pos_mv;
+out vec4 v_color;
+
+uniform mat4 proj_matrix;
+uniform mat4 model_view_matrix;
+uniform vec3 rendering_offset;
+uniform sampler2D mesh_colors;
+
+void main()
+{
+    gl_Position = proj_matrix * model_view_matrix * vec4(a_position + rendering_offset, 1.0);
+    pos_mv = (model_view_matrix * vec4(a_position + rendering_offset, 1.0)).xyz;
+
+    // Each mesh has a slot in the color table
+    int slot = int(a_slot);
+    int width = textureSize(mesh_colors, 0).x;
+    v_color = texelFetch(mesh_colors, ivec2(slot % width, slot / width), 0);
+}
@@ -0,0 +1,35 @@
+#version 140
+#extension GL_ARB_explicit_attrib_location : require
+
+layout (location = 0) in vec3 a_position;
+layout (location = 1) in vec3 a_color;
+layout (location = 2) in float a_alpha;
+layout (location = 3) in float point_size;
+layout (location = 4) in float a_marker;
+
+out vec3 v_color;
+out float v_alpha;
+flat out int v_marker;
+
+uniform vec2 viewport;
+uniform mat4 proj_matrix;
+uniform mat4 model_view_matrix;
+uniform vec3 rendering_offset;
+
+void main()
+{
+    gl_Position = proj_matrix * model_view_matrix * vec4(a_position + rendering_offset, 1.0);
+    v_color = a_color;
+    v_alpha = a_alpha;
+    v_marker = int(a_marker);
+
+    // Same sizes as the Point shaders
+    if (proj_matrix[3][3] == 0.0)
+    {
+        gl_PointSize = 1.21 * viewport.y * point_size / gl_Position.w;
+    }
+    else
+    {
+        gl_PointSize = 0.5 * viewport.y * point_size * proj_matrix[1][1];
+    }
+}
@@ -3,6 +3,7 @@
 layout (location = 0) in vec3 a_position;
 layout (location = 1) in vec3 a_color;
 layout (location = 2) in float a_alpha;
+layout (location = 3) in float a_value;
 
 out vec3 v_position;
 out vec3 v_color;
@@ -10,10 +11,22 @@ out float v_alpha;
 
 uniform mat4 proj_matrix;
 uniform mat4 model_view_matrix;
+uniform bool use_colormap;
+uniform sampler1D colormap;
+uniform float vmin;
+uniform float vmax;
+
+vec3 value_to_rgb(float value)
+{
+    // Same mapping as utils.values_to_rgb, sampling the center of each texel of the colormap
+    float size = float(textureSize(colormap, 0));
+    float t = (vmax > vmin) ? clamp((value - vmin) / (vmax - vmin), 0.0, 1.0) : float(value >= vmin);
+    return texture(colormap, (t * (size - 1.0) + 0.5) / size).rgb;
+}
 
 void main()
 {
     v_position = a_position;
-    v_color = a_color;
+    v_color = use_colormap ? value_to_rgb(a_value) : a_color;
     v_alpha = a_alpha;
 }
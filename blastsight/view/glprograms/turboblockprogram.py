@@ -0,0 +1,32 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from .blockprogram import BlockProgram
+from .turboprogram import TurboProgram
+
+
+class TurboBlockProgram(TurboProgram, BlockProgram):
+    # Position, color, alpha and block size of each block
+    POOL_ATTRIBUTES = [(0, 3), (1, 3), (2, 1), (3, 3)]
+
+    def __init__(self):
+        super().__init__()
+        self.base_name = 'TurboBlock'
+
+    def attributes(self, drawable) -> list:
+        element = drawable.element
+        num_blocks = element.x.size
+
+        return [element.color,
+                np.full(num_blocks, element.alpha, np.float32),
+                np.tile(np.array(element.block_size, np.float32), (num_blocks, 1))]
+
+    def signature(self, drawable) -> tuple:
+        element = drawable.element
+        return element.colormap, element.vmin, element.vmax, element.alpha, tuple(element.block_size)
@@ -9,91 +9,144 @@ import numpy as np
 from OpenGL.GL import *
 
 from .meshprogram import MeshProgram
-from ..drawables.gldrawable import GLDrawable
+from .bufferpool import BufferPool
 
 
 class TurboMeshProgram(MeshProgram):
-    def __init__(self):
-        super().__init__()
-        self.info = {
-            'opaque': {
-                'vaos': [],
-                'vbos': [],
-                'num_indices': 0,
-            },
-            'transparent': {
-                'vaos': [],
-                'vbos': [],
-                'num_indices': 0,
-            },
-        }
-
-    def set_drawables(self, drawables: list) -> None:
-        super().set_drawables(drawables)
-        self.set_buffers(self.opaques, 'opaque')
-        self.set_buffers(self.transparents, 'transparent')
-
-    def set_buffers(self, meshes: list, visibility: str) -> None:
-        _POSITION = 0
-        _COLOR = 1
-
-        # VBO
-        if len(self.info[visibility]['vbos']) == 0:
-            self.info[visibility]['vaos'] = [glGenVertexArrays(1)]
-            self.info[visibility]['vbos'] = glGenBuffers(3)
+    # Width of the color table texture (one texel per slot)
+    TABLE_WIDTH = 1024
 
-        # Data
-        vertices = np.empty(len(meshes), np.ndarray)
-        indices = np.empty(len(meshes), np.ndarray)
-        colors = np.empty(len(meshes), np.ndarray)
-
-        vertices_counter = 0
-        indices_counter = 0
-
-        for index, mesh in enumerate(meshes):
-            num_vertices = len(mesh.element.vertices)
-
-            vertices[index] = mesh.element.vertices.astype(np.float32)
-            indices[index] = (mesh.element.indices + vertices_counter)
-            colors[index] = np.tile(mesh.element.rgba, num_vertices).astype(np.float32)
+    def __init__(self):
+        """
+        TurboMeshProgram draws every mesh with a single multi-draw call (two, if there are transparent meshes).
 
-            vertices_counter += num_vertices
-            indices_counter += mesh.element.indices.size
+        The meshes live in a BufferPool, so adding a mesh only uploads that mesh,
+        and hiding it only removes it from the draw list. Each mesh also has a slot
+        in a color table (a RGBA texture), so its color isn't replicated for each vertex.
 
-        self.info[visibility]['num_indices'] = indices_counter
+        Meshes that leave the program (hidden, deleted, or moved to another program)
+        release their data and their slot, so the pool only holds the meshes that are drawn.
+        """
+        super().__init__()
+        self.base_name = 'TurboMesh'
 
-        if len(meshes) > 0:
-            vertices = np.concatenate(vertices)
-            indices = np.concatenate(indices)
-            colors = np.concatenate(colors)
+        _POSITION = 0
+        _SLOT = 1
+        self.pool = BufferPool([(_POSITION, 3), (_SLOT, 1)], indexed=True)
 
-        glBindVertexArray(self.info[visibility]['vaos'][-1])
+        # Meshes in the pool, by id(drawable): (drawable, element version, slot)
+        self.uploaded = {}
+        self.free_slots = []
+        self.colors = np.zeros((0, 4), np.float32)
 
-        # Recycle GLDrawable's fill_buffers method
-        GLDrawable.fill_buffer(_POSITION, 3, vertices, GLfloat, GL_FLOAT,
-                               self.info[visibility]['vbos'][_POSITION])
-        GLDrawable.fill_buffer(_COLOR, 4, colors, GLfloat, GL_FLOAT,
-                               self.info[visibility]['vbos'][_COLOR])
+        self.color_texture = None
+        self.colors_changed = False
+        self.draw_lists = {}
 
-        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self.info[visibility]['vbos'][-1])
-        glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices, GL_STATIC_DRAW)
+    def initialize(self) -> None:
+        super().initialize()
+        self.add_uniform_handler('mesh_colors')
 
-        glBindVertexArray(0)
+        # The color table is always bound to GL_TEXTURE0
+        self.update_uniform('mesh_colors', 0)
 
+    """
+    Drawables
+    """
+    def set_drawables(self, drawables: list) -> None:
+        super().set_drawables(drawables)
+        self.evict(lambda k: not self.contains(k))
+        self.sync(self.drawables)
+
+    def update_drawables(self, added: list, removed: list) -> None:
+        super().update_drawables(added, removed)
+        removed_keys = set(map(id, removed))
+        self.evict(lambda k: k in removed_keys and not self.contains(k))
+        self.sync(added)
+
+    def contains(self, key: int) -> bool:
+        return key in self._opaques or key in self._transparents
+
+    def sync(self, drawables: list) -> None:
+        # Uploads the meshes that aren't in the pool yet (or whose data changed), and refreshes their colors
+        for drawable in drawables:
+            key = id(drawable)
+            entry = self.uploaded.get(key)
+
+            if entry is None or entry[1] != drawable.element.version:
+                self.upload(drawable)
+                entry = self.uploaded[key]
+
+            self.colors[entry[2]] = drawable.element.rgba
+            self.colors_changed = True
+
+        self.draw_lists.clear()
+
+    def upload(self, drawable) -> None:
+        key = id(drawable)
+        element = drawable.element
+
+        vertices = element.vertices  # Already float32 (see Element)
+        indices = np.ascontiguousarray(element.indices, np.uint32)
+
+        # Outdated data is replaced
+        self.evict(lambda k: k == key)
+
+        slot = self.free_slots.pop() if self.free_slots else len(self.uploaded)
+        if slot >= len(self.colors):
+            self.colors = np.concatenate((self.colors, np.zeros((max(slot + 1, len(self.colors)), 4), np.float32)))
+
+        self.pool.add(key, [vertices, np.full(len(vertices), slot, np.float32)], indices)
+        self.uploaded[key] = (drawable, element.version, slot)
+
+    def evict(self, condition: callable) -> None:
+        for key in [k for k in self.uploaded.keys() if condition(k)]:
+            self.pool.release(key)
+            self.free_slots.append(self.uploaded.pop(key)[2])
+
+    """
+    Color table
+    """
+    def bind_colors(self) -> None:
+        if self.color_texture is None:
+            self.color_texture = glGenTextures(1)
+
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self.color_texture)
+
+        # The whole table is tiny (16 bytes per mesh), so it's uploaded again if any color changed
+        if self.colors_changed:
+            rows = max(1, -(-len(self.colors) // self.TABLE_WIDTH))
+            table = np.zeros((rows * self.TABLE_WIDTH, 4), np.float32)
+            table[:len(self.colors)] = self.colors
+
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA32F, self.TABLE_WIDTH, rows, 0, GL_RGBA, GL_FLOAT, table)
+            self.colors_changed = False
+
+    def draw_list(self, name: str, drawables: dict) -> tuple:
+        # The arguments of the multi-draw calls are only generated when the drawables change
+        if name not in self.draw_lists:
+            self.draw_lists[name] = self.pool.draw_list(list(drawables.keys()))
+
+        return self.draw_lists[name]
+
+    """
+    Drawing
+    """
     def draw(self) -> None:
-        glBindVertexArray(self.info['opaque']['vaos'][-1])
-        glDrawElements(GL_TRIANGLES, self.info['opaque']['num_indices'], GL_UNSIGNED_INT, None)
-        glBindVertexArray(0)
+        self.bind_colors()
+        self.pool.draw(GL_TRIANGLES, self.draw_list('opaque', self._opaques))
 
     def redraw(self) -> None:
-        glBindVertexArray(self.info['transparent']['vaos'][-1])
+        self.bind_colors()
         glDepthMask(GL_FALSE)
         glEnable(GL_CULL_FACE)
 
         for gl_cull in [GL_FRONT, GL_BACK]:
             glCullFace(gl_cull)
-            glDrawElements(GL_TRIANGLES, self.info['transparent']['num_indices'], GL_UNSIGNED_INT, None)
+            self.pool.draw(GL_TRIANGLES, self.draw_list('transparent', self._transparents))
 
         glDisable(GL_CULL_FACE)
         glDepthMask(GL_TRUE)
-        glBindVertexArray(0)
@@ -0,0 +1,33 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+import numpy as np
+
+from .pointprogram import PointProgram
+from .turboprogram import TurboProgram
+
+
+class TurboPointProgram(TurboProgram, PointProgram):
+    # Position, color, alpha, point size and marker of each point
+    POOL_ATTRIBUTES = [(0, 3), (1, 3), (2, 1), (3, 1), (4, 1)]
+
+    def __init__(self):
+        super().__init__()
+        self.base_name = 'TurboPoint'
+
+    def attributes(self, drawable) -> list:
+        element = drawable.element
+        num_points = element.x.size
+
+        return [element.color,
+                np.full(num_points, element.alpha, np.float32),
+                element.point_size,
+                np.full(num_points, element.marker_num, np.float32)]
+
+    def signature(self, drawable) -> tuple:
+        element = drawable.element
+        return element.colormap, element.vmin, element.vmax, element.alpha, element.marker_num
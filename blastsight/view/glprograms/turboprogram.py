@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+
+#  Copyright (c) 2019-2024 Gabriel Sanhueza.
+#
+#  Distributed under the MIT License.
+#  See LICENSE for more info.
+
+from OpenGL.GL import *
+
+from .bufferpool import BufferPool
+
+
+class TurboProgram:
+    # Attributes of the pool, as (location, size)
+    POOL_ATTRIBUTES = []
+
+    def __init__(self):
+        """
+        TurboProgram is a mixin for programs of DFGL's children (blocks and points), where every drawable
+        is merged in a BufferPool, so the program draws all of them with a single call (see TurboMeshProgram).
+
+        Everything that used to be a uniform (colors, alpha, sizes, etc.) is a vertex attribute,
+        so drawables with different properties can be drawn together. The colors are computed
+        in the CPU, since each drawable may have its own colormap.
+
+        Subclasses generate the arrays of each drawable, and a signature of its properties.
+        If only the signature of a drawable changes, its data (positions) isn't uploaded again.
+        Drawables that leave the program release their data, as in TurboMeshProgram.
+
+        Usage: class TurboBlockProgram(TurboProgram, BlockProgram)
+        """
+        super().__init__()
+        self.pool = BufferPool(self.POOL_ATTRIBUTES)
+
+        # Drawables in the pool, by id(drawable): (drawable, element version, signature)
+        self.uploaded = {}
+        self.draw_lists = {}
+
+    """
+    Data of each drawable
+    """
+    def geometry(self, drawable) -> list:
+        # Arrays that only change with the data of the element (the first attributes)
+        return [drawable.element.vertices]
+
+    def attributes(self, drawable) -> list:
+        # Arrays of the remaining attributes
+        return []
+
+    def signature(self, drawable) -> tuple:
+        # Everything (other than the data) that attributes() depends on.
+        # Datasets (explicit colors, point sizes) bump the version of the element, so they upload everything.
+        return ()
+
+    """
+    Drawables
+    """
+    def set_drawables(self, drawables: list) -> None:
+        super().set_drawables(drawables)
+        self.evict(lambda k: not self.contains(k))
+        self.sync(self.drawables)
+
+    def update_drawables(self, added: list, removed: list) -> None:
+        super().update_drawables(added, removed)
+        removed_keys = set(map(id, removed))
+        self.evict(lambda k: k in removed_keys and not self.contains(k))
+        self.sync(added)
+
+    def contains(self, key: int) -> bool:
+        return key in self._opaques or key in self._transparents
+
+    def _insert_drawables(self, drawables: list) -> None:
+        # Same as ShaderProgram, but the drawables don't need their own buffers
+        for drawable in drawables:
+            is_opaque = drawable.alpha >= 0.99
+            target, other = (self._opaques, self._transparents) if is_opaque else (self._transparents, self._opaques)
+
+            other.pop(id(drawable), None)
+            target[id(drawable)] = drawable
+
+    def sync(self, drawables: list) -> None:
+        # Uploads the drawables that aren't in the pool yet (or whose data changed),
+        # and rewrites the attributes of the ones whose properties changed
+        for drawable in drawables:
+            key = id(drawable)
+            entry = self.uploaded.get(key)
+            version = drawable.element.version
+            signature = self.signature(drawable)
+
+            if entry is None or entry[1] != version:
+                self.upload(drawable)
+            elif entry[2] != signature:
+                offset = len(self.POOL_ATTRIBUTES) - len(self.attributes(drawable))
+                for i, array in enumerate(self.attributes(drawable)):
+                    self.pool.write(key, offset + i, array)
+
+            self.uploaded[key] = (drawable, version, signature)
+
+        self.draw_lists.clear()
+
+    def upload(self, drawable) -> None:
+        key = id(drawable)
+        arrays = self.geometry(drawable) + self.attributes(drawable)
+
+        # Outdated data is replaced
+        self.evict(lambda k: k == key)
+
+        self.pool.add(key, arrays)
+
+    def evict(self, condition: callable) -> None:
+        for key in [k for k in self.uploaded.keys() if condition(k)]:
+            self.pool.release(key)
+            self.uploaded.pop(key)
+
+    def draw_list(self, name: str, drawables: dict) -> tuple:
+        # The arguments of the multi-draw calls are only generated when the drawables change
+        if name not in self.draw_lists:
+            self.draw_lists[name] = self.pool.draw_list(list(drawables.keys()))
+
+        return self.draw_lists[name]
+
+    """
+    Drawing
+    """
+    def draw(self) -> None:
+        self.pool.draw(GL_POINTS, self.draw_list('opaque', self._opaques))
+
+    def redraw(self) -> None:
+        self.pool.draw(GL_POINTS, self.draw_list('transparent', self._transparents))
@@ -20,6 +20,7 @@ class XSectionBlockProgram(ShaderProgram):
         self.add_uniform_handler('block_size')
         self.add_uniform_handler('plane_origin')
         self.add_uniform_handler('plane_normal')
+        self.add_colormap_handlers()
 
     def generate_shaders(self) -> list:
         shaders = super().generate_shaders()
@@ -30,4 +31,5 @@ class XSectionBlockProgram(ShaderProgram):
     def inner_draw(self, drawables: list) -> None:
         for drawable in drawables:
             self.update_uniform('block_size', *drawable.element.block_size)
+            self.update_colormap_uniforms(drawable)
             drawable.draw()
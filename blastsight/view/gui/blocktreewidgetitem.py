@@ -5,6 +5,8 @@
 #  Distributed under the MIT License.
 #  See LICENSE for more info.
 
+import numpy as np
+
 from qtpy.QtWidgets import QMenu
 
 from .actioncollection import ActionCollection
@@ -48,7 +50,19 @@ class BlockTreeWidgetItem(TreeWidgetItem):
         def has_altered_coordinates() -> bool:
             return any(map(lambda x, y: x != y, element.headers[:3], dialog.get_current_headers()[:3]))
 
+        def uploaded_properties() -> list:
+            # Properties stored in the drawable's buffers (colormap and limits are uniforms, see DFGL).
+            # The sizes are kept as they are (their setters replace the arrays), and compared with np.array_equal.
+            size = element.block_size if hasattr(element, 'block_size') else element.point_size
+            return [element.headers, element.alpha, size]
+
+        def has_altered_uploads(previous: list) -> bool:
+            current = uploaded_properties()
+            return current[:2] != previous[:2] or not np.array_equal(current[2], previous[2])
+
         def update_properties() -> None:
+            previous_properties = uploaded_properties()
+
             # Update headers
             altered_coordinates = has_altered_coordinates()
             element.headers = dialog.get_current_headers()
@@ -78,8 +92,14 @@ class BlockTreeWidgetItem(TreeWidgetItem):
             if altered_coordinates:
                 viewer.fit_to_screen()
 
-            # Finally, recreate instance with the "new" data
-            viewer.update_drawable(element.id)
+            # Finally, recreate instance with the "new" data, or just repaint it if it's not needed.
+            # Turbo drawables have their colors in the pool of their program, which is synced when recreated.
+            if has_altered_uploads(previous_properties) or not element.uses_colormap:
+                viewer.update_drawable(element.id)
+            elif element.is_turbo_ready:
+                viewer.recreate(element)
+            else:
+                viewer.update()
 
         dialog.accepted.connect(update_properties)
         dialog.show()
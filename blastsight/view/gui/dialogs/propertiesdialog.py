@@ -59,6 +59,9 @@ class PropertiesDialog(QDialog):
         self.pushButton_color_high = ColoredButton(self, 'High', (0.0, 0.0, 1.0, 1.0))
         self.pushButton_color_high.clicked.connect(self.show_colordialog_high)
 
+        # Intermediate colors of multi-color colormaps (kept, but not editable here)
+        self.middle_colors = []
+
         self.doubleSpinBox_pointsize = DoubleSpinBox(self, lower=0.0)
         self.comboBox_markers = QComboBox(self)
 
@@ -208,7 +211,7 @@ class PropertiesDialog(QDialog):
     def get_colormap(self) -> str:
         color_low = self.pushButton_color_low.qcolor.name()
         color_high = self.pushButton_color_high.qcolor.name()
-        return f'{color_low}-{color_high}'
+        return '-'.join([color_low, *self.middle_colors, color_high])
 
     def get_vmin(self) -> float:
         return self.doubleSpinBox_vmin.value()
@@ -240,7 +243,7 @@ class PropertiesDialog(QDialog):
         return self.doubleSpinBox_alpha.setValue(value)
 
     def set_colormap(self, value: str) -> None:
-        low, high = value.split('-')
+        low, *self.middle_colors, high = value.split('-')
         self.pushButton_color_low.set_color(QColor(low).getRgbF())
         self.pushButton_color_high.set_color(QColor(high).getRgbF())
 
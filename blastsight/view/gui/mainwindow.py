@@ -347,16 +347,15 @@ class MainWindow(QMainWindow):
             mesh_id = description.get('element_id')
             mesh = self.viewer.get_drawable(mesh_id)
 
-            def add_subslice(subslice, num: int) -> None:
-                self.viewer.lines(vertices=subslice,
-                                  color=mesh.color,
-                                  name=f'MESHSLICE_{num}_{mesh.name}',
-                                  extension='csv',
-                                  loop=True)
-
-            # Execute add_subslice for all subslices of the slice
-            for i, ssl in enumerate(slices):
-                add_subslice(ssl, i)
+            if len(slices) == 0:
+                return
+
+            # Every polyline of the slice is kept in a single element
+            self.viewer.lines(polylines=slices,
+                              color=mesh.color,
+                              name=f'MESHSLICE_{mesh.name}',
+                              extension='csv',
+                              loop=True)
 
         # Execute add_slice over all slice descriptions
         for sl in slice_list:
@@ -6,7 +6,9 @@
 #  See LICENSE for more info.
 
 import numpy as np
+import traceback
 
+from concurrent.futures import ThreadPoolExecutor
 from OpenGL.GL import *
 
 from qtpy.QtCore import QFileInfo
@@ -31,7 +33,9 @@ from .drawables.blockgl import BlockGL
 from .drawables.linegl import LineGL
 from .drawables.meshgl import MeshGL
 from .drawables.pointgl import PointGL
+from .drawables.pointcloudgl import PointCloudGL
 from .drawables.tubegl import TubeGL
+from .drawables.drillholesetgl import DrillholeSetGL
 from .drawables.textgl import TextGL
 
 from .drawablefactory import DrawableFactory
@@ -45,6 +49,7 @@ from ..interactors.measure_interactor import MeasureInteractor
 
 from ..model import utils
 from ..model.model import Model
+from ..model.spatialchunks import Frustum
 
 
 class IntegrableViewer(QOpenGLWidget):
@@ -73,6 +78,8 @@ class IntegrableViewer(QOpenGLWidget):
     signal_screen_clicked = Signal(object)
     signal_ray_generated = Signal(object)
     signal_fps_updated = Signal(float)
+    signal_lod_built = Signal(object)
+    signal_chunk_loaded = Signal(object, object)
     signal_interactor_updated = Signal(str)
     signal_projection_updated = Signal(str)
 
@@ -110,6 +117,22 @@ class IntegrableViewer(QOpenGLWidget):
         # FPS Counter
         self.fps_counter = FPSCounter()
 
+        # Spatial chunks culled/drawn (and triangles/streamed points drawn) in the last frame (see SpatialChunks)
+        self.culling_stats = {'culled': 0, 'drawn': 0, 'triangles': 0, 'points': 0}
+
+        # Screen-space error (in pixels) allowed to the levels of detail of the blocks and meshes (see GLDrawable)
+        self.lod_error = 1.0
+
+        # The levels of detail of the meshes are optional, and built in the background (see MeshLOD)
+        self.is_mesh_lod_enabled = False
+        self.lod_executor = ThreadPoolExecutor(max_workers=1)
+
+        # Points drawn by each streamed point cloud (see PointCloudGL)
+        self.point_budget = 5_000_000
+
+        # Files loaded by chunks are read in the background (see load_by_chunks())
+        self.chunk_executor = ThreadPoolExecutor(max_workers=1)
+
         # Initial positions and rotations
         self._rotation_center = np.array([0.0, 0.0, 0.0])
         self._rotation_angle = np.array([0.0, 0.0, 0.0])
@@ -143,6 +166,8 @@ class IntegrableViewer(QOpenGLWidget):
         self.signal_camera_rotated.connect(self.update)
         self.signal_camera_translated.connect(self.update)
         self.signal_center_translated.connect(self.update)
+        self.signal_lod_built.connect(self.upload_lod)
+        self.signal_chunk_loaded.connect(self.append_chunk)
 
         # Interactors
         self.add_interactor(NormalInteractor(self))
@@ -176,6 +201,9 @@ class IntegrableViewer(QOpenGLWidget):
         # Propagate uniform values (matrices, viewport, etc)
         self.propagate_uniforms()
 
+        # Skip the chunks of the drawables that are outside the view
+        self.cull_chunks()
+
         # Draw every GLDrawable (meshes, blocks, points, etc)
         glEnable(GL_BLEND)
         glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
@@ -242,6 +270,26 @@ class IntegrableViewer(QOpenGLWidget):
             collection.update_uniform('plane_origin', *self.last_cross_origin)
             collection.update_uniform('plane_normal', *self.last_cross_normal)
 
+    @property
+    def mvp_matrix(self) -> np.ndarray:
+        # Same transformation as the shaders (including the rendering offset), as a row-major numpy matrix
+        offset = QMatrix4x4()
+        offset.translate(*self.rendering_offset)
+        mvp = self.proj_matrix * self.view_matrix * self.model_matrix * offset
+
+        return np.array(mvp.data()).reshape((4, 4)).T
+
+    def cull_chunks(self) -> None:
+        culled, drawn = self.drawable_collection.cull(Frustum(self.mvp_matrix, self.viewport[1]))
+        triangles = sum(d.triangles_drawn for d in self.get_all_meshes() if d.is_visible)
+        point_clouds = [d for d in self.get_all_point_clouds() if d.is_visible]
+        points = sum(d.points_drawn for d in point_clouds)
+        self.culling_stats = {'culled': culled, 'drawn': drawn, 'triangles': triangles, 'points': points}
+
+        # Nodes that are still being read are uploaded in the next frames
+        if any(d.is_streaming for d in point_clouds):
+            QTimer.singleShot(30, self.update)
+
     """
     Environment drawables
     """
@@ -406,6 +454,61 @@ class IntegrableViewer(QOpenGLWidget):
         self.blockSignals(False)
         self.recreate()
 
+    def set_lod_error(self, pixels: float) -> None:
+        # Blocks and meshes are drawn with coarser levels of detail while their errors look smaller than `pixels`
+        # (0 disables them)
+        self.lod_error = max(float(pixels), 0.0)
+
+        for d in self.get_all_drawables():
+            d.lod_error = self.lod_error
+
+        self.update()
+
+    def set_mesh_lod(self, status: bool) -> None:
+        # The meshes are uploaded again when their levels of detail are ready (or right now, if disabled)
+        self.is_mesh_lod_enabled = status
+        self.makeCurrent()
+        self.blockSignals(True)
+
+        for d in self.get_all_meshes():
+            d.is_lod_enabled = status
+            if status:
+                self.build_lod(d)
+            else:
+                d.reload()
+
+        self.blockSignals(False)
+        self.recreate()
+
+    def build_lod(self, drawable: MeshGL) -> None:
+        # The levels of detail are built in another thread, and uploaded in this one (see upload_lod())
+        def build() -> None:
+            try:
+                drawable.element.build_lod()
+                self.signal_lod_built.emit(drawable)
+            except Exception:
+                traceback.print_exc()
+
+        self.lod_executor.submit(build)
+
+    def upload_lod(self, drawable: MeshGL) -> None:
+        # The mesh may have been deleted (or its levels of detail disabled) while they were being built
+        if self.get_drawable(drawable.id) is not drawable or not drawable.is_lod_enabled:
+            return
+
+        self.makeCurrent()
+        drawable.reload()
+        self.recreate(drawable)
+
+    def set_point_budget(self, points: int) -> None:
+        # Maximum number of points drawn by each streamed point cloud
+        self.point_budget = max(int(points), 0)
+
+        for d in self.get_all_point_clouds():
+            d.point_budget = self.point_budget
+
+        self.update()
+
     def set_animated(self, status: bool) -> None:
         self.is_animated = status
 
@@ -463,6 +566,14 @@ class IntegrableViewer(QOpenGLWidget):
 
         # Update shared settings
         drawable.is_cross_sectioned = self.is_cross_sectioned
+        drawable.lod_error = self.lod_error
+
+        if isinstance(drawable, MeshGL) and self.is_mesh_lod_enabled:
+            drawable.is_lod_enabled = True
+            self.build_lod(drawable)
+
+        if isinstance(drawable, PointCloudGL):
+            drawable.point_budget = self.point_budget
 
         # Register in collection
         drawable.add_observer(self)
@@ -492,6 +603,9 @@ class IntegrableViewer(QOpenGLWidget):
     def tubes(self, *args, **kwargs) -> TubeGL:
         return self.register_drawable(self.factory.tubes(*args, **kwargs))
 
+    def drillholes(self, *args, **kwargs) -> DrillholeSetGL:
+        return self.register_drawable(self.factory.drillholes(*args, **kwargs))
+
     def text(self, *args, **kwargs) -> TextGL:
         return self.register_drawable(self.factory.text(*args, **kwargs))
 
@@ -513,6 +627,55 @@ class IntegrableViewer(QOpenGLWidget):
     def load_tubes(self, path: str, *args, **kwargs) -> TubeGL:
         return self.register_drawable(self.factory.load_tubes(path, *args, **kwargs))
 
+    def load_point_cloud(self, path: str, *args, **kwargs) -> PointCloudGL:
+        return self.register_drawable(self.factory.load_point_cloud(path, *args, **kwargs))
+
+    def load_blocks_by_chunks(self, path: str, *args, **kwargs) -> BlockGL:
+        return self.load_by_chunks(path, self.model.load_blocks_by_chunks, BlockGL, *args, **kwargs)
+
+    def load_points_by_chunks(self, path: str, *args, **kwargs) -> PointGL:
+        return self.load_by_chunks(path, self.model.load_points_by_chunks, PointGL, *args, **kwargs)
+
+    def load_by_chunks(self, path: str, loader: callable, d_class: type, *args, **kwargs):
+        # The first chunk of the file is drawn right away, and the rest of the file is read in another thread,
+        # and appended to the drawable in this one (see append_chunk())
+        try:
+            element, batches = loader(path, *args, **kwargs)
+            drawable = d_class(element, *args, **kwargs)
+        except Exception:
+            traceback.print_exc()
+            return self.register_drawable(None)
+
+        def read() -> None:
+            try:
+                for data in batches:
+                    # The drawable may have been deleted while the file was being read
+                    if self.get_drawable(drawable.id) is not drawable:
+                        break
+                    self.signal_chunk_loaded.emit(drawable, data)
+            except Exception:
+                traceback.print_exc()
+
+        self.register_drawable(drawable)
+        self.chunk_executor.submit(read)
+
+        return drawable
+
+    def append_chunk(self, drawable: GLDrawable, data) -> None:
+        if self.get_drawable(drawable.id) is not drawable:
+            return
+
+        # Exceptions can't escape a slot, so chunks that don't fit the element (e.g. off its grid) are reported
+        try:
+            drawable.element.append(data)
+        except Exception:
+            traceback.print_exc()
+            return
+
+        self.makeCurrent()
+        drawable.reload()
+        self.recreate(drawable)
+
     def load_mesh_folder(self, path: str, *args, **kwargs) -> list:
         return self.load_folder(path, self.load_mesh, *args, **kwargs)
 
@@ -612,10 +775,11 @@ class IntegrableViewer(QOpenGLWidget):
         self.drawable_collection.clear()
         self.signal_file_modified.emit()
 
-    def recreate(self) -> None:
-        self.pre_collection.recreate()
-        self.drawable_collection.recreate()
-        self.post_collection.recreate()
+    def recreate(self, drawable: GLDrawable = None) -> None:
+        # If a single drawable changed, the collections only update that drawable
+        self.pre_collection.recreate(drawable)
+        self.drawable_collection.recreate(drawable)
+        self.post_collection.recreate(drawable)
         self.update()
 
     """
@@ -636,12 +800,18 @@ class IntegrableViewer(QOpenGLWidget):
     def get_all_points(self) -> list:
         return self.drawable_collection.select(PointGL)
 
+    def get_all_point_clouds(self) -> list:
+        return self.drawable_collection.select(PointCloudGL)
+
     def get_all_lines(self) -> list:
         return self.drawable_collection.select(LineGL)
 
     def get_all_tubes(self) -> list:
         return self.drawable_collection.select(TubeGL)
 
+    def get_all_drillholes(self) -> list:
+        return self.drawable_collection.select(DrillholeSetGL)
+
     """
     Camera handling
     """
@@ -862,6 +1032,24 @@ class IntegrableViewer(QOpenGLWidget):
 
         return self.model.slice_points(origin, normal, points)
 
+    def slice_meshes_with_planes(self, normal: np.ndarray, offsets: list, include_hidden: bool = False) -> list:
+        # By default, slice only visible meshes
+        meshes = list(filter(lambda m: m.is_visible or include_hidden, self.get_all_meshes()))
+
+        return self.model.slice_meshes_with_planes(normal, offsets, meshes)
+
+    def slice_blocks_with_planes(self, normal: np.ndarray, offsets: list, include_hidden: bool = True) -> list:
+        # By default, slice visible and hidden blocks
+        blocks = list(filter(lambda m: m.is_visible or include_hidden, self.get_all_blocks()))
+
+        return self.model.slice_blocks_with_planes(normal, offsets, blocks)
+
+    def slice_points_with_planes(self, normal: np.ndarray, offsets: list, include_hidden: bool = True) -> list:
+        # By default, slice visible and hidden points
+        points = list(filter(lambda m: m.is_visible or include_hidden, self.get_all_points()))
+
+        return self.model.slice_points_with_planes(normal, offsets, points)
+
     def intersect_meshes(self, origin: np.ndarray, ray: np.ndarray, include_hidden: bool = False) -> list:
         # By default, intersect only visible meshes
         meshes = list(filter(lambda m: m.is_visible or include_hidden, self.get_all_meshes()))
@@ -874,10 +1062,23 @@ class IntegrableViewer(QOpenGLWidget):
 
         return self.model.intersect_lines(origin, ray, lines)
 
+    def intersect_drillholes(self, origin: np.ndarray, ray: np.ndarray, include_hidden: bool = False) -> list:
+        # By default, intersect only visible drillhole sets
+        drillholes = list(filter(lambda m: m.is_visible or include_hidden, self.get_all_drillholes()))
+
+        return self.model.intersect_drillholes(origin, ray, drillholes)
+
+    def intersect_rays(self, origins: np.ndarray, rays: np.ndarray, include_hidden: bool = False) -> dict:
+        # By default, intersect only visible meshes
+        meshes = list(filter(lambda m: m.is_visible or include_hidden, self.get_all_meshes()))
+
+        return self.model.intersect_rays(origins, rays, meshes)
+
     def intersect_elements(self, origin: np.ndarray, ray: np.ndarray, include_hidden: bool = False) -> list:
         meshes = self.intersect_meshes(origin, ray, include_hidden)
         lines = self.intersect_lines(origin, ray, include_hidden)
-        results = meshes + lines
+        drillholes = self.intersect_drillholes(origin, ray, include_hidden)
+        results = meshes + lines + drillholes
 
         self.signal_mesh_clicked.emit(meshes)
         self.signal_lines_clicked.emit(lines)
@@ -54,8 +54,8 @@ def demo():
     Each value is mapped with the respective vertex.
     The arguments vmin, vmax and colormap are optional.
 
-    The colormap is two colors separated with a`-`.
-    For example, `red-blue`, `cyan-magenta`, etc.
+    The colormap is two (or more) colors separated with a`-`.
+    For example, `red-blue`, `cyan-magenta`, `red-yellow-green`, etc.
 
     Alternatively, you can pass an HTML color, like
     "#FF0000-#00FF00", as long as it's separated
@@ -52,12 +52,15 @@ def add_mesh_slices(slice_list: list) -> None:
         origin_id = sliced_meshes.get('element_id')
         mesh = viewer.get_drawable(origin_id)
 
-        for i, vert_slice in enumerate(slices):
-            viewer.lines(vertices=vert_slice,
-                         color=mesh.color,
-                         name=f'MESHSLICE_{i}_{mesh.name}',
-                         extension=mesh.extension,
-                         loop=True)
+        if len(slices) == 0:
+            continue
+
+        # A single element holds every polyline of the slice
+        viewer.lines(polylines=slices,
+                     color=mesh.color,
+                     name=f'MESHSLICE_{mesh.name}',
+                     extension=mesh.extension,
+                     loop=True)
 
 
 def add_blocks_slices(slice_list: list) -> None:
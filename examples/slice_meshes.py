@@ -31,8 +31,8 @@ We'll draw them as a line, so the slice is more evident.
 """
 
 for mesh_slice in slices:
-    vertices = mesh_slice.get('vertices')
-    v.lines(vertices=vertices,
+    polylines = mesh_slice.get('vertices')
+    v.lines(polylines=polylines,
             color=[0.0, 1.0, 0.0],
             loop=True)
 
@@ -3,6 +3,7 @@
 import numpy as np
 import pytest
 from blastsight.model.elements.blockelement import BlockElement
+from blastsight.model.elements.meshelement import MeshElement
 
 
 class TestBlockElement:
@@ -234,3 +235,51 @@ class TestBlockElement:
             for k in range(len(expected_lo)):
                 assert i == element.bounding_box[0][k]
                 assert j == element.bounding_box[1][k]
+
+    def test_slice_with_plane(self):
+        element = BlockElement(x=[0, 1, 2, 0, 1, 2], y=[0, 0, 0, 1, 1, 1], z=[0, 0, 0, 0, 0, 0],
+                               values=[0, 1, 2, 3, 4, 5], block_size=[1.0, 1.0, 1.0])
+
+        # Axis-aligned plane (sorted projection)
+        assert element.slice_with_plane(np.array([1.0, 0.0, 0.0]), np.array([1.0, 0.0, 0.0])).tolist() == [1, 4]
+        assert element.slice_with_plane(np.array([0.5, 0.0, 0.0]), np.array([-1.0, 0.0, 0.0])).tolist() == [0, 1, 3, 4]
+
+        # General plane
+        assert element.slice_with_plane(np.array([0.0, 0.0, 0.0]), np.array([1.0, 1.0, 0.0])).tolist() == [0, 1, 3]
+
+    def test_slice_with_planes(self):
+        element = BlockElement(x=[0, 1, 2, 0, 1, 2], y=[0, 0, 0, 1, 1, 1], z=[0, 0, 0, 0, 0, 0],
+                               values=[0, 1, 2, 3, 4, 5], block_size=[1.0, 1.0, 1.0])
+
+        for normal in [[1.0, 0.0, 0.0], [0.0, -2.0, 0.0], [1.0, 1.0, 0.0]]:
+            normal = np.array(normal)
+            offsets = [0.0, 0.5, 1.0, 3.0]
+            unit = normal / np.linalg.norm(normal)
+
+            result = element.slice_with_planes(normal, offsets)
+            expected = [element.slice_with_plane(offset * unit, unit.copy()) for offset in offsets]
+            assert [r.tolist() for r in result] == [e.tolist() for e in expected]
+
+    def test_inside_mesh(self):
+        element = BlockElement(x=[0.0, 0.0, 0.0], y=[0.2, 0.2, 2.0], z=[0.1, 1.0, 0.1], values=[0, 1, 2])
+        tetrahedron = MeshElement(vertices=[[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.5, 0.5]],
+                                  indices=[[0, 1, 2], [0, 1, 3], [1, 2, 3], [2, 0, 3]])
+
+        mask = element.inside_mesh(tetrahedron)
+        assert mask.tolist() == [True, False, False]
+        assert element.values[mask].tolist() == [0]
+
+    def test_octree(self):
+        vertices = np.mgrid[0:4, 0:4, 0:4].reshape((3, -1)).T
+        element = BlockElement(vertices=vertices, values=np.arange(64), block_size=[1.0, 1.0, 1.0])
+        assert element.octree.colors is None
+        assert element.octree is element.octree
+
+        # Every new set of colors is used, even if a new array reuses the id of an old one
+        for i in range(10):
+            element.color = np.full((64, 3), 0.1)
+            assert np.allclose(element.octree.colors, 0.1)
+
+            element.color = np.full((64, 3), 0.2)
+            element.color = np.full((64, 3), 0.3)
+            assert np.allclose(element.octree.colors, 0.3)
@@ -168,6 +168,35 @@ class TestDFElement:
             for j in range(len(expected[0])):
                 assert element.color[i][j] == expected[i][j]
 
+    def test_cached_color(self):
+        data = {'x': [0.0, 2.0, 4.0],
+                'y': [0.0, 0.0, 0.0],
+                'z': [0.0, 3.0, 3.0],
+                'val': [0.0, 5.0, 10.0]}
+
+        element = DFElement(data=data, colormap='#FF0000-#0000FF')
+        color = element.color
+        assert element.color is color
+
+        # Changing the limits, the colormap or the values regenerates the colors
+        element.vmax = 5.0
+        assert element.color is not color
+        assert element.color[1][2] == 1.0
+
+        color = element.color
+        element.values = [10.0, 10.0, 10.0]
+        assert element.color is not color
+        assert element.color[0][2] == 1.0
+
+        # Cached arrays are read-only, so they're changed with their setters (or as copies)
+        with pytest.raises(ValueError):
+            element.vertices[0][0] = 1.0
+
+        vertices = element.vertices.copy()
+        vertices[0][0] = 1.0
+        element.vertices = vertices
+        assert element.x[0] == 1.0
+
     def test_headers(self):
         data = {'x': [0.0, 2.0, 4.0, 6.0, 8.0, 10.0],
                 'y': [0.0, 0.0, 0.0, 3.0, 3.0, 1.0],
@@ -201,3 +230,30 @@ class TestDFElement:
 
         with pytest.raises(Exception):
             getattr(element, 'wrong')
+
+    def test_append(self):
+        element = DFElement(x=[0, 1], y=[0, 0], z=[0, 0], values=[5, 6])
+        vertices = element.vertices
+
+        element.append({'x': [2, 3], 'y': [1, 1], 'z': [0, 0], 'values': [4, 9]})
+        assert element.vertices.tolist() == [[0, 0, 0], [1, 0, 0], [2, 1, 0], [3, 1, 0]]
+        assert element.vertices is not vertices
+        assert element.vmin == 4.0
+        assert element.vmax == 9.0
+
+        # Limits given by the user don't grow
+        limited = DFElement(x=[0], y=[0], z=[0], values=[5], vmin=0.0)
+        limited.vmax = 6.0
+        limited.append({'x': [1], 'y': [1], 'z': [1], 'values': [-1]})
+        limited.append({'x': [2], 'y': [2], 'z': [2], 'values': [8]})
+        assert limited.vmin == 0.0
+        assert limited.vmax == 6.0
+
+        limited.recalculate_limits()
+        limited.append({'x': [3], 'y': [3], 'z': [3], 'values': [10]})
+        assert limited.vmin == -1.0
+        assert limited.vmax == 10.0
+
+        colored = DFElement(x=[0], y=[0], z=[0], values=[5], color=[[1.0, 0.0, 0.0]])
+        with pytest.raises(ValueError):
+            colored.append({'x': [1], 'y': [1], 'z': [1], 'values': [1]})
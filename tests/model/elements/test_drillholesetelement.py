@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+
+import numpy as np
+import pytest
+from blastsight.model.elements.drillholesetelement import DrillholeSetElement
+
+
+class TestDrillholeSetElement:
+    # Three vertical holes (3, 2 and 4 vertices), going down from z = 0
+    holes = [[[0.0, 0.0, 0.0], [0.0, 0.0, -1.0], [0.0, 0.0, -2.0]],
+             [[5.0, 0.0, 0.0], [5.0, 0.0, -3.0]],
+             [[10.0, 0.0, 0.0], [10.0, 0.0, -1.0], [10.0, 0.0, -2.0], [10.0, 0.0, -3.0]]]
+    values = [[1.0, 2.0], [3.0], [4.0, 5.0, 6.0]]
+
+    @pytest.fixture()
+    def element(self):
+        return DrillholeSetElement(holes=self.holes, values=self.values, names=['A', 'B', 'C'], radius=0.5, id=0)
+
+    def test_empty(self):
+        with pytest.raises(Exception):
+            DrillholeSetElement()
+
+        with pytest.raises(Exception):
+            DrillholeSetElement(holes=[])
+
+    def test_holes(self, element):
+        assert element.num_holes == 3
+        assert element.num_intervals == 6
+        assert element.offsets.tolist() == [0, 3, 5, 9]
+
+        for i in range(element.num_holes):
+            assert np.allclose(element.hole(i), self.holes[i])
+            assert np.allclose(element.hole_values(i), self.values[i])
+
+        assert element.interval_starts.tolist() == [0, 1, 3, 5, 6, 7]
+        assert element.hole_of(np.arange(9)).tolist() == [0, 0, 0, 1, 1, 2, 2, 2, 2]
+
+    def test_data(self, element):
+        other = DrillholeSetElement(vertices=element.vertices, offsets=element.offsets, values=element.values)
+        assert np.allclose(other.vertices, element.vertices)
+        assert np.allclose(other.values, element.values)
+
+        # A single hole by default
+        other = DrillholeSetElement(x=[0, 0], y=[0, 0], z=[0, -1])
+        assert other.num_holes == 1
+        assert other.values.tolist() == [0.0]
+
+    def test_wrong_data(self):
+        # Wrong number of values
+        with pytest.raises(ValueError):
+            DrillholeSetElement(holes=self.holes, values=[[1.0], [2.0], [3.0]])
+
+        # Holes with a single vertex
+        with pytest.raises(ValueError):
+            DrillholeSetElement(holes=[[[0.0, 0.0, 0.0]]])
+
+        # Offsets that don't cover every vertex
+        with pytest.raises(ValueError):
+            DrillholeSetElement(x=[0, 0, 0], y=[0, 0, 0], z=[0, -1, -2], offsets=[0, 2], values=[0.0])
+
+    def test_colors(self, element):
+        assert element.vmin == 1.0
+        assert element.vmax == 6.0
+
+        # Red to blue
+        assert np.allclose(element.color[0], [1.0, 0.0, 0.0])
+        assert np.allclose(element.color[-1], [0.0, 0.0, 1.0])
+
+        # The last vertex of each hole repeats the color of its last interval
+        colors = element.vertex_colors
+        assert len(colors) == len(element.vertices)
+        assert np.allclose(colors[element.interval_starts], element.color)
+        assert np.allclose(colors[[2, 4, 8]], element.color[[1, 2, 5]])
+
+        element.colormap = '#00FF00-#0000FF'
+        assert np.allclose(element.color[0], [0.0, 1.0, 0.0])
+
+    def test_visibility(self, element):
+        assert element.visible_holes.tolist() == [0, 1, 2]
+
+        element.set_hole_visibility([0, 2], False)
+        assert element.visible_holes.tolist() == [1]
+
+    def test_pick(self, element):
+        origin = np.array([-5.0, 0.0, -2.75])
+        ray = np.array([1.0, 0.0, 0.0])
+
+        # The first hole ends at z = -2, so the ray hits the second one
+        hole, t = element.pick(origin, ray)
+        assert hole == 1
+        assert np.isclose(t, 10.0)  # Closest point to the axis of the hole
+
+        element.set_hole_visibility(1, False)
+        assert element.pick(origin, ray)[0] == 2
+        assert np.allclose(element.intersect_with_ray(origin, ray), [[10.0, 0.0, -2.75]])
+
+        element.set_hole_visibility(2, False)
+        assert element.pick(origin, ray) == (-1, np.inf)
+        assert len(element.intersect_with_ray(origin, ray)) == 0
@@ -163,3 +163,65 @@ class TestElement:
 
         with pytest.raises(Exception):
             getattr(element, 'wrong')
+
+    def test_cache(self):
+        element = Element(vertices=[[0, 1, 2], [3, 4, 5]])
+        version = element.version
+        stats = element.cache_stats
+
+        bounding_box = element.bounding_box
+        assert element.bounding_box is bounding_box
+        assert element.centroid is element.centroid
+        assert element.cache_stats['misses'] == stats['misses'] + 2
+        assert element.cache_stats['hits'] == stats['hits'] + 2
+
+        # Cached arrays are read-only
+        with pytest.raises(ValueError):
+            bounding_box[0][0] = 9.0
+
+        # Setters bump the version, and the derived data is regenerated
+        element.x = [9, 9]
+        assert element.version > version
+        assert element.bounding_box is not bounding_box
+        assert element.vertices[0][0] == 9.0
+        assert element.bounding_box[0][0] == 9.0
+
+        # Replacing the whole data too
+        element.data = {'x': np.array([1.0]), 'y': np.array([1.0]), 'z': np.array([1.0])}
+        assert len(element.vertices) == 1
+        assert element.bounding_box[0][0] == 1.0
+
+        # In-place modifications need a manual invalidation
+        element.vertices[0][0] = 5.0
+        assert element.bounding_box[0][0] == 1.0
+        element.invalidate()
+        assert element.bounding_box[0][0] == 5.0
+
+        # Cached values can be read without generating them
+        assert element.cached_value('bounding_box') is element.bounding_box
+        assert element.cached_value('missing') is None
+        element.invalidate()
+        assert element.cached_value('bounding_box') is None
+
+    def test_contiguous_vertices(self):
+        element = Element(vertices=[[0, 1, 2], [3, 4, 5]])
+        vertices = element.vertices
+
+        assert vertices.dtype == np.float32
+        assert vertices.flags.c_contiguous
+        assert element.vertices is vertices
+
+        # x/y/z are views of the (N, 3) array
+        for i, k in enumerate('xyz'):
+            assert np.shares_memory(element.data[k], vertices)
+            assert getattr(element, k).tolist() == vertices[:, i].tolist()
+
+        # Replacing a coordinate packs the vertices again
+        element.y = [7, 8]
+        assert element.vertices is not vertices
+        assert element.vertices.flags.c_contiguous
+        assert element.vertices[:, 1].tolist() == [7.0, 8.0]
+        assert np.shares_memory(element.y, element.vertices)
+
+        with pytest.raises(ValueError):
+            element.vertices = [[0, 1]]
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from blastsight.model.elementfactory import ElementFactory
+from blastsight.model.elements.blockelement import BlockElement
+from blastsight.model.elements.gridblockelement import GridBlockElement
+
+
+class TestGridBlockElement:
+    grid = np.mgrid[0:4, 0:3, 0:2].reshape((3, -1)).T
+    coordinates = grid * np.array([10.0, 5.0, 2.5]) + np.array([100.0, 200.0, 300.0])
+
+    @pytest.fixture()
+    def element(self):
+        order = np.random.default_rng(0).permutation(len(self.coordinates))
+        x, y, z = self.coordinates[order].T
+        return GridBlockElement(x=x, y=y, z=z, values=order)
+
+    def test_empty(self):
+        with pytest.raises(Exception):
+            GridBlockElement()
+
+    def test_detect_grid(self, element):
+        assert element.origin.tolist() == [100.0, 200.0, 300.0]
+        assert element.spacing.tolist() == [10.0, 5.0, 2.5]
+        assert element.dimensions.tolist() == [4, 3, 2]
+        assert element.block_size.tolist() == [10.0, 5.0, 2.5]
+
+        # Coordinates are stored as compact indices
+        assert element.headers == ['i', 'j', 'k', 'values']
+        assert all(element.data[k].dtype == np.uint16 for k in 'ijk')
+
+    def test_coordinates(self, element):
+        expected = self.coordinates[element.values]
+
+        assert np.allclose(element.x, expected[:, 0])
+        assert np.allclose(element.y, expected[:, 1])
+        assert np.allclose(element.z, expected[:, 2])
+        assert np.allclose(element.vertices, expected)
+        assert element.vertices.dtype == np.float32
+
+        element.x = element.x + 10.0
+        assert np.allclose(element.x, expected[:, 0] + 10.0)
+
+        # The grid grows to include coordinates outside of it
+        element.y = element.y - 10.0
+        assert np.allclose(element.y, expected[:, 1] - 10.0)
+        assert element.origin.tolist() == [100.0, 190.0, 300.0]
+        assert element.dimensions.tolist() == [5, 5, 2]
+        assert element.ijk.min() == 0
+        assert element.block_at(*element.ijk[-1]) == len(element.ijk) - 1
+        assert element.slice_with_plane(np.array([140.0, 0.0, 0.0]), np.array([1.0, 0.0, 0.0])).size == 6
+
+    def test_fill_as_indices(self):
+        i, j, k = self.grid.T
+        by_kwargs = GridBlockElement(i=i, j=j, k=k, values=np.arange(24), origin=[100, 200, 300], spacing=[10, 5, 2.5])
+        by_data = GridBlockElement(data=pd.DataFrame({'i': i, 'j': j, 'k': k, 'au': np.arange(24)}),
+                                   origin=[100, 200, 300], spacing=[10, 5, 2.5])
+
+        assert np.allclose(by_kwargs.vertices, self.coordinates)
+        assert np.allclose(by_data.vertices, self.coordinates)
+        assert by_data.headers == ['i', 'j', 'k', 'au']
+
+        # Without values, every block has 0
+        assert GridBlockElement(i=i, j=j, k=k).values.tolist() == [0.0] * 24
+
+    def test_wrong_grid(self):
+        with pytest.raises(ValueError):
+            GridBlockElement(x=[0.0, 1.0, 2.5], y=[0.0, 0.0, 0.0], z=[0.0, 0.0, 0.0], values=[0, 1, 2])
+
+        with pytest.raises(ValueError):
+            GridBlockElement(x=[0.0, 1.0, 2.0], y=[0.0, 0.0, 0.0], z=[0.0, 0.0, 0.0], values=[0, 1, 2], origin=[1, 0, 0])
+
+        with pytest.raises(ValueError):
+            GridBlockElement(i=[0, 1, 2], j=[0, 0, 0], k=[0, 0, 0], values=[0, 1, 2], dimensions=[2, 1, 1])
+
+    def test_bounding_box(self, element):
+        lo, hi = element.bounding_box
+        reference = BlockElement(vertices=self.coordinates, values=np.arange(24))
+
+        assert np.allclose(lo, reference.bounding_box[0])
+        assert np.allclose(hi, reference.bounding_box[1])
+
+    def test_neighbours(self, element):
+        corner = element.block_at(0, 0, 0)
+        center = element.block_at(1, 1, 0)
+
+        assert element.block_at(4, 0, 0) == -1
+        assert sorted(element.neighbours(corner)) == sorted([element.block_at(1, 0, 0),
+                                                             element.block_at(0, 1, 0),
+                                                             element.block_at(0, 0, 1)])
+        assert len(element.neighbours(center)) == 5
+
+    def test_sparse_grid(self):
+        # The lookup and the coordinates don't depend on the size of the grid, only on the blocks
+        element = GridBlockElement(i=[0, 60000, 3], j=[0, 60000, 4], k=[0, 60000, 5], values=[0, 1, 2])
+        cells, order = element.lookup
+
+        assert cells.size == order.size == 3
+        assert element.block_at(60000, 60000, 60000) == 1
+        assert element.block_at(3, 4, 5) == 2
+        assert element.block_at(3, 4, 6) == -1
+        assert element.neighbours(2).size == 0
+
+        assert np.allclose(element.vertices, [[0, 0, 0], [60000, 60000, 60000], [3, 4, 5]])
+        assert element.vertices is not element.vertices
+
+    def test_headers(self, element):
+        element.data['au'] = element.values * 2.0
+        element.headers = ['i', 'j', 'k', 'au']
+        assert element.values.tolist() == (element.data['values'] * 2.0).tolist()
+
+        # The coordinates of a grid are always its indices
+        with pytest.raises(ValueError):
+            element.headers = ['values', 'j', 'k', 'au']
+
+    def test_slice_with_plane(self, element):
+        reference = BlockElement(vertices=element.vertices, values=element.values, block_size=element.block_size)
+
+        for origin, normal in [([120.0, 0.0, 0.0], [1.0, 0.0, 0.0]),
+                               ([0.0, 202.5, 0.0], [0.0, 1.0, 0.0]),
+                               ([0.0, 0.0, 1000.0], [0.0, 0.0, -1.0]),
+                               ([110.0, 205.0, 300.0], [1.0, 1.0, 0.0])]:
+            expected = reference.slice_with_plane(np.array(origin), np.array(normal))
+            result = element.slice_with_plane(np.array(origin), np.array(normal))
+
+            assert result.tolist() == expected.tolist()
+
+    def test_factory(self):
+        x, y, z = self.coordinates.T
+
+        assert type(ElementFactory.blocks(x=x, y=y, z=z, values=x)) is BlockElement
+        assert type(ElementFactory.blocks(x=x, y=y, z=z, values=x, grid=True)) is GridBlockElement
+        assert type(ElementFactory.blocks(x=x, y=y, z=z, values=x, dimensions=[4, 3, 2])) is GridBlockElement
+
+    def test_append(self):
+        # Rows are appended as the chunks of a file, with the grid growing to include them
+        # (the first chunk has two layers in each axis, so the spacing can be detected)
+        order = np.argsort(self.grid.max(axis=1) > 1, kind='stable')
+        x, y, z = self.coordinates[order].T
+        element = GridBlockElement(x=x[:8], y=y[:8], z=z[:8], values=np.arange(8))
+        element.append({'x': x[8:], 'y': y[8:], 'z': z[8:], 'values': np.arange(8, 24)})
+        element.append({'x': [90.0], 'y': [200.0], 'z': [297.5], 'values': [24]})
+
+        assert element.origin.tolist() == [90.0, 200.0, 297.5]
+        assert element.dimensions.tolist() == [5, 3, 3]
+        assert np.allclose(element.vertices[:24], self.coordinates[order])
+        assert np.allclose(element.vertices[24], [90.0, 200.0, 297.5])
+        assert element.values.tolist() == list(range(25))
+        assert element.block_at(0, 0, 0) == 24
+        assert element.vmax == 24
+
+        with pytest.raises(ValueError):
+            element.append({'x': [93.0], 'y': [200.0], 'z': [300.0], 'values': [0]})
+
+        # Grids filled by indices get more indices
+        by_indices = GridBlockElement(i=[0, 1], j=[0, 0], k=[0, 0], values=[0, 1])
+        by_indices.append({'i': [2], 'j': [70000], 'k': [0], 'values': [2]})
+
+        assert by_indices.dimensions.tolist() == [3, 70001, 1]
+        assert by_indices.data['j'].dtype == np.uint32
+        assert by_indices.ijk.tolist() == [[0, 0, 0], [1, 0, 0], [2, 70000, 0]]
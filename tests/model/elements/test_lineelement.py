@@ -76,3 +76,40 @@ class TestLineElement:
 
         with pytest.raises(Exception):
             LineElement(x=[-1, 1], y=[0, 1, 0], z=[0, 0, 0], values=[0.0, 1.0, 0.0])
+
+    def test_polylines(self):
+        polylines = [[[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0]],
+                     [[5.0, 0.0, 0.0], [6.0, 0.0, 0.0]]]
+        element = LineElement(polylines=polylines, color=[1.0, 0.0, 0.0])
+
+        assert element.is_multiple
+        assert element.num_polylines == 2
+        assert element.offsets.tolist() == [0, 3, 5]
+        for i in range(element.num_polylines):
+            assert np.allclose(element.polyline(i), polylines[i])
+
+        # Each polyline is closed by itself
+        element = LineElement(polylines=polylines, loop=True)
+        assert element.offsets.tolist() == [0, 4, 7]
+        assert np.allclose(element.polyline(0)[-1], polylines[0][0])
+        assert np.allclose(element.polyline(1)[-1], polylines[1][0])
+
+        # Same data with explicit offsets
+        other = LineElement(vertices=np.concatenate(polylines), offsets=[0, 3, 5], loop=True)
+        assert np.allclose(other.vertices, element.vertices)
+
+        # A single polyline doesn't keep offsets
+        element = LineElement(x=[-1, 1, 0], y=[0, 0, 1], z=[0, 0, 0])
+        assert not element.is_multiple
+        assert element.offsets.tolist() == [0, 3]
+
+        with pytest.raises(ValueError):
+            LineElement(vertices=np.concatenate(polylines), offsets=[0, 3, 4])
+
+    def test_polylines_intersection(self):
+        element = LineElement(polylines=[[[-1.0, 0.0, 0.0], [1.0, 0.0, 0.0]],
+                                         [[2.0, 0.0, 5.0], [3.0, 0.0, 5.0]]])
+
+        # The gap between both polylines isn't a segment
+        assert len(element.intersect_with_ray(np.array([0.0, 0.0, 10.0]), np.array([0.0, 0.0, -1.0]))) == 1
+        assert len(element.intersect_with_ray(np.array([1.5, 0.0, 2.5]), np.array([0.0, 1.0, 0.0]))) == 0
@@ -162,3 +162,47 @@ class TestMeshElement:
         volume = element.volume
 
         assert abs(volume - 8.0) < epsilon
+
+    def test_bvh(self):
+        element = MeshElement(x=[-1, 1, 0], y=[0, 0, 3], z=[0, 0, 0], indices=[[0, 1, 2]])
+        origin = np.array([0.0, 1.0, 5.0])
+        ray = np.array([0.0, 0.0, -1.0])
+
+        bvh = element.bvh
+        assert bvh is element.bvh  # Cached
+        assert len(element.intersect_with_ray(origin, ray)) == 1
+
+        # Replacing the vertices invalidates the BVH
+        element.z = [10, 10, 10]
+        assert bvh is not element.bvh
+        assert element.intersect_with_ray(origin, ray).size == 0
+
+    def test_slice_with_plane(self):
+        element = MeshElement(x=[-1, 1, 0], y=[0, 0, 3], z=[0, 0, 0], indices=[[0, 1, 2]])
+        origin = np.array([0.0, 1.0, 0.0])
+        normal = np.array([0.0, 1.0, 0.0])
+
+        slices = element.slice_with_plane(origin, normal)
+        assert len(slices) == 1
+        assert np.allclose(sorted(slices[0].tolist()), [[-2 / 3, 1.0, 0.0], [2 / 3, 1.0, 0.0]])
+
+        # Replacing the vertices invalidates the slicer
+        slicer = element.slicer
+        assert slicer is element.slicer  # Cached
+        element.y = [10, 10, 13]
+        assert slicer is not element.slicer
+        assert element.slice_with_plane(origin, normal) == []
+
+    def test_lod(self):
+        element = MeshElement(x=[-1, 1, 0, 2], y=[0, 0, 1, 1], z=[0, 0, 0, 0], indices=[[0, 1, 2], [1, 3, 2]])
+
+        # The levels of detail are only built on demand
+        assert element.lod is None
+        lod = element.build_lod()
+        assert element.lod is lod
+        assert element.build_lod() is lod
+        assert lod.level_size(0) == 2
+
+        # Replacing the vertices invalidates them
+        element.z = [1, 1, 1, 1]
+        assert element.lod is None
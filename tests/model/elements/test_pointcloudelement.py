@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+import numpy as np
+import pytest
+
+from blastsight.model.elements.pointcloudelement import PointCloudElement
+from blastsight.model.elementfactory import ElementFactory
+from blastsight.model.pointoctree import PointOctree
+
+
+class TestPointCloudElement:
+    points = np.random.default_rng(0).uniform(-10.0, 10.0, (20000, 3))
+
+    @pytest.fixture()
+    def octree(self, tmp_path):
+        batches = PointOctree.array_batches(self.points, self.points[:, 0])
+        return PointOctree.build(str(tmp_path / 'cloud'), batches, capacity=1000)
+
+    def test_empty(self):
+        with pytest.raises(Exception):
+            PointCloudElement(x=[-1, 1, 0], y=[0, 0, 1], z=[0, 0, 0])
+
+    def test_root(self, octree):
+        element = PointCloudElement(octree=octree, id=0)
+
+        # The data of the element is the root of the octree, but the limits are the ones of the whole point cloud
+        assert element.octree is octree
+        assert element.num_points == len(self.points)
+        assert len(element.vertices) == octree.counts[0]
+        assert element.vmin == pytest.approx(self.points[:, 0].min())
+        assert element.vmax == pytest.approx(self.points[:, 0].max())
+
+        lo, hi = element.bounding_box
+        assert np.allclose(lo, self.points.min(axis=0))
+        assert np.allclose(hi, self.points.max(axis=0))
+
+    def test_factory(self, octree):
+        assert type(ElementFactory.points(octree=octree, id=0)) is PointCloudElement
+        assert type(ElementFactory.points(x=[0], y=[0], z=[0], id=0)) is not PointCloudElement
@@ -206,6 +206,27 @@ class TestPointElement:
         assert element.point_size[1] == 10.0
         assert element.avg_size == 10.0
 
+    def test_append(self):
+        element = PointElement(vertices=[[0, 1, 2], [3, 4, 5]], values=[8, 16], point_size=[2.0, 4.0])
+        element.append({'x': [6], 'y': [7], 'z': [8], 'values': [32]})
+
+        # New points get the average size
+        assert element.x.size == 3
+        assert element.point_size.tolist() == [2.0, 4.0, 3.0]
+        assert element.chunks.num_items == 3
+
+    def test_chunks(self):
+        element = PointElement(vertices=[[0, 0, 0], [10, 0, 0]], values=[8, 16], point_size=[2.0, 4.0])
+        assert element.chunks.hi.max() == 12.0
+
+        # The chunks grow with the points, whether the sizes are replaced or modified in-place (and invalidated)
+        element.point_size = [2.0, 8.0]
+        assert element.chunks.hi.max() == 14.0
+
+        element.point_size[1] = 20.0
+        element.invalidate()
+        assert element.chunks.hi.max() == 20.0
+
     def test_markers(self):
         element = PointElement(vertices=[[0, 1, 2]], values=[8])
         assert element.marker == 'square'
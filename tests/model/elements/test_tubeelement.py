@@ -94,3 +94,39 @@ class TestTubeElement:
 
         assert element.radius == 0.3
         assert element.resolution == 9
+
+    def test_as_mesh(self):
+        # Includes vertical segments (parallel and opposite to Z) and a zero-length segment
+        element = TubeElement(x=[-1, 1, 1, 1, 1, 0], y=[0, 0, 0, 0, 0, 2], z=[0, 0, 1, 0, 0, 3], resolution=6)
+        vertices, indices = element.as_mesh()
+
+        num_tubes = len(element.vertices) - 1
+        assert vertices.shape == (num_tubes * 14, 3)
+        assert indices.shape == (num_tubes * 24, 3)
+
+        # Same mesh as the former one-cylinder-per-segment implementation
+        # (a horizontal segment, one opposite to Z, and a zero-length one)
+        small = TubeElement(x=[-1, 1, 1, 1], y=[0, 0, 0, 0], z=[0, 0, -1, -1], resolution=3, radius=0.5)
+        s_vertices, s_indices = small.as_mesh()
+        expected_vertices = [
+            [-1.0, 0.0, 0.0], [1.0, 0.0, 0.0], [-1.0, 0.5, 0.0], [-1.0, -0.25, -0.433], [-1.0, -0.25, 0.433],
+            [1.0, 0.5, 0.0], [1.0, -0.25, -0.433], [1.0, -0.25, 0.433],
+            [1.0, 0.0, 0.0], [1.0, 0.0, -1.0], [1.0, -0.5, 0.0], [1.433, 0.25, 0.0], [0.567, 0.25, 0.0],
+            [1.0, -0.5, -1.0], [1.433, 0.25, -1.0], [0.567, 0.25, -1.0],
+            [1.0, 0.0, -1.0], [1.0, 0.0, -1.0], [1.0, 0.5, -1.0], [1.433, -0.25, -1.0], [0.567, -0.25, -1.0],
+            [1.0, 0.5, -1.0], [1.433, -0.25, -1.0], [0.567, -0.25, -1.0],
+        ]
+        expected_faces = np.array([[0, 3, 2], [0, 4, 3], [0, 2, 4], [1, 5, 6], [1, 6, 7], [1, 7, 5],
+                                   [2, 3, 5], [3, 4, 6], [4, 2, 7], [5, 3, 6], [6, 4, 7], [7, 2, 5]])
+
+        assert np.allclose(s_vertices, expected_vertices, atol=1e-3)
+        assert np.array_equal(s_indices, np.concatenate([expected_faces + i * 8 for i in range(3)]))
+
+        # Every rim vertex is at `radius` from the axis of its segment
+        for i, (v0, v1) in enumerate(zip(element.vertices[:-1], element.vertices[1:])):
+            rim = vertices[i * 14 + 2:i * 14 + 8] - v0
+            axis = v1 - v0 if np.linalg.norm(v1 - v0) > 0.0 else np.array([0.0, 0.0, 1.0])
+            axis = axis / np.linalg.norm(axis)
+
+            assert np.allclose(np.inner(rim, axis), 0.0)
+            assert np.allclose(np.linalg.norm(rim, axis=1), element.radius)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+import numpy as np
+import pandas as pd
+import pytest
+from blastsight.model.parsers.bsxparser import BSXParser as Parser
+from blastsight.model.model import Model
+from tests.globals import *
+
+
+class TestBSXParser:
+    vertices = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]])
+    indices = np.array([[0, 1, 2], [0, 1, 3], [0, 2, 3], [1, 2, 3]])
+
+    def test_mesh(self, tmp_path):
+        path = str(tmp_path / 'mesh.bsx')
+        Parser.save_file(path=path, data={'vertices': self.vertices, 'indices': self.indices},
+                         properties={'color': np.array([1.0, 0.5, 0.0]), 'alpha': np.float32(0.5)})
+
+        info = Parser.load_file(path)
+        data = info.get('data')
+
+        # The arrays are mapped with the layout of the drawables
+        assert isinstance(data.get('vertices'), np.memmap)
+        assert data.get('vertices').dtype == np.float32
+        assert data.get('indices').dtype == np.uint32
+        assert np.array_equal(data.get('vertices'), self.vertices)
+        assert np.array_equal(data.get('indices'), self.indices)
+
+        assert info.get('properties') == {'color': [1.0, 0.5, 0.0], 'alpha': 0.5}
+        assert info.get('metadata') == {'name': 'mesh', 'extension': 'bsx'}
+
+    def test_xyz(self, tmp_path):
+        # Lines (and meshes exported from the model) have x/y/z instead of vertices
+        path = str(tmp_path / 'lines.bsx')
+        Parser.save_file(path=path, data={'x': [0, 1], 'y': [2, 3], 'z': [4, 5]})
+
+        data = Parser.load_file(path).get('data')
+        assert data.get('vertices').tolist() == [[0, 2, 4], [1, 3, 5]]
+        assert 'indices' not in data.keys()
+
+    def test_columns(self, tmp_path):
+        path = str(tmp_path / 'blocks.bsx')
+        data = pd.DataFrame({'x': [0.5, 1.5], 'y': [0, 1], 'z': [-1.0, 2.0], 'Geol': ['Amb', 'Cuarz']})
+        Parser.save_file(path=path, data=data)
+
+        loaded = Parser.load_file(path).get('data')
+        assert list(loaded.keys()) == ['x', 'y', 'z', 'Geol']
+        assert loaded['x'].tolist() == [0.5, 1.5]
+        assert loaded['y'].dtype == np.int64
+        assert loaded['Geol'].tolist() == ['Amb', 'Cuarz']
+
+    def test_export(self, tmp_path):
+        model = Model()
+        mesh = model.load_mesh(f'{TEST_FILES_FOLDER_PATH}/caseron.off')
+        blocks = model.load_blocks(f'{TEST_FILES_FOLDER_PATH}/complex.csv')
+
+        model.export(str(tmp_path / 'caseron.bsx'), mesh.id)
+        model.export(str(tmp_path / 'complex.bsx'), blocks.id)
+
+        # The loaded mesh keeps the mapped arrays (it isn't copied)
+        loaded_mesh = model.load_mesh(str(tmp_path / 'caseron.bsx'))
+        assert isinstance(loaded_mesh.vertices, np.memmap)
+        assert isinstance(loaded_mesh.indices, np.memmap)
+        assert np.array_equal(loaded_mesh.vertices, mesh.vertices)
+        assert np.array_equal(loaded_mesh.indices, mesh.indices)
+        assert np.allclose(loaded_mesh.color, mesh.color)
+
+        loaded_blocks = model.load_blocks(str(tmp_path / 'complex.bsx'))
+        assert loaded_blocks.data.equals(blocks.data)
+        assert loaded_blocks.vmax == blocks.vmax
+
+        # Mapped elements can be saved in the same file
+        model.export(str(tmp_path / 'caseron.bsx'), loaded_mesh.id)
+        assert np.array_equal(model.load_mesh(str(tmp_path / 'caseron.bsx')).vertices, mesh.vertices)
+
+    def test_load_damaged(self):
+        with pytest.raises(Exception):
+            Parser.load_file(f'{TEST_FILES_FOLDER_PATH}/bad.csv')
+
+    def test_load_inexistent(self):
+        with pytest.raises(Exception):
+            Parser.load_file(f'{TEST_FILES_FOLDER_PATH}/nonexistent.bsx')
+
+    def test_save_empty(self):
+        with pytest.raises(Exception):
+            Parser.save_file()
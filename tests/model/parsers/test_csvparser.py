@@ -1,6 +1,7 @@
 #!/usr/bin/env python
 
 import os
+import pandas as pd
 import pytest
 from blastsight.model.parsers.csvparser import CSVParser as Parser
 from tests.globals import *
@@ -19,6 +20,14 @@ class TestCSVParser:
         with pytest.raises(Exception):
             assert data['abc']
 
+    def test_load_chunks(self):
+        data = Parser.load_file(f'{TEST_FILES_FOLDER_PATH}/rainbow.csv').get('data')
+        chunks = list(Parser.load_chunks(f'{TEST_FILES_FOLDER_PATH}/rainbow.csv', chunk_size=10))
+
+        assert [len(chunk.get('data')) for chunk in chunks] == [10, 10, 10, 10, 10, 10, 3]
+        assert chunks[0].get('metadata') == {'name': 'rainbow', 'extension': 'csv'}
+        assert pd.concat([chunk.get('data') for chunk in chunks]).equals(data)
+
     def test_load_inexistent(self):
         with pytest.raises(Exception):
             Parser.load_file(f'{TEST_FILES_FOLDER_PATH}/nonexistent.csv')
@@ -1,5 +1,6 @@
 #!/usr/bin/env python
 
+import pandas as pd
 import pytest
 from blastsight.model.parsers.gslibparser import GSLibParser as Parser
 from tests.globals import *
@@ -30,6 +31,14 @@ class TestGSLibParser:
         with pytest.raises(Exception):
             assert data['abc']
 
+    def test_load_chunks(self):
+        for path in [f'{TEST_FILES_FOLDER_PATH}/mini.out', f'{TEST_FILES_FOLDER_PATH}/mini_gslib.out']:
+            data = Parser.load_file(path).get('data')
+            chunks = list(Parser.load_chunks(path, chunk_size=4))
+
+            assert [len(chunk.get('data')) for chunk in chunks] == [4, 2]
+            assert pd.concat([chunk.get('data') for chunk in chunks]).equals(data)
+
     def test_load_inexistent(self):
         with pytest.raises(Exception):
             Parser.load_file(f'{TEST_FILES_FOLDER_PATH}/nonexistent.out')
@@ -1,6 +1,8 @@
 #!/usr/bin/env python
 
 import os
+import numpy as np
+import pandas as pd
 import pytest
 from blastsight.model.parsers.h5pparser import H5PParser as Parser
 from tests.globals import *
@@ -37,6 +39,21 @@ class TestH5PParser:
         # Cleanup
         os.remove(f'{TEST_FILES_FOLDER_PATH}/mini_save.h5p')
 
+    def test_load_chunks(self, tmp_path):
+        data = pd.DataFrame({'x': np.arange(25.0), 'y': np.zeros(25), 'z': np.ones(25), 'CuT': np.arange(25.0) / 10})
+
+        # Both fixed and table stores are read by parts
+        for store_format in ['fixed', 'table']:
+            path = str(tmp_path / f'{store_format}.h5p')
+            with pd.HDFStore(path, 'w') as store:
+                store.put('data', data, format=store_format)
+                store.get_storer('data').attrs.metadata = {'alpha': 0.5}
+
+            chunks = list(Parser.load_chunks(path, chunk_size=10))
+            assert [len(chunk.get('data')) for chunk in chunks] == [10, 10, 5]
+            assert chunks[-1].get('properties') == {'alpha': 0.5}
+            assert pd.concat([chunk.get('data') for chunk in chunks]).equals(data)
+
     def test_load_inexistent(self):
         with pytest.raises(Exception):
             Parser.load_file(path=f'{TEST_FILES_FOLDER_PATH}/nonexistent.h5p')
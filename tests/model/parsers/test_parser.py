@@ -11,6 +11,11 @@ class TestParser:
         with pytest.raises(NotImplementedError):
             Parser.load_file('')
 
+    def test_load_chunks(self):
+        # By default, the whole file is a single chunk
+        with pytest.raises(NotImplementedError):
+            next(Parser.load_chunks(''))
+
     def test_save(self):
         with pytest.raises(NotImplementedError):
             Parser.save_file('')
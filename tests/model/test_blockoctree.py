@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from blastsight.model.blockoctree import BlockOctree
+from blastsight.model.spatialchunks import SpatialChunks
+
+
+class TestBlockOctree:
+    # 8x8x4 blocks of size 10, where the value is the Z coordinate
+    vertices = np.mgrid[0:8, 0:8, 0:4].reshape((3, -1)).T * 10.0
+    values = vertices[:, 2].copy()
+
+    @property
+    def quadrant_chunks(self) -> SpatialChunks:
+        # One chunk per quadrant in XY (4x4x4 blocks each)
+        quadrants = 2 * (self.vertices[:, 0] >= 40.0) + (self.vertices[:, 1] >= 40.0)
+        order = np.argsort(quadrants, kind='stable')
+        lo = np.array([self.vertices[quadrants == q].min(axis=0) - 5.0 for q in range(4)])
+        hi = np.array([self.vertices[quadrants == q].max(axis=0) + 5.0 for q in range(4)])
+
+        return SpatialChunks(order, np.array([0, 64, 128, 192, 256]), lo, hi)
+
+    def test_levels(self):
+        chunks = SpatialChunks.from_points(self.vertices, 5.0)
+        octree = BlockOctree(self.vertices, [10.0, 10.0, 10.0], chunks, values=self.values)
+
+        # 256 blocks, then 32 blocks of size 20, 4 of size 40, and 1 of size 80
+        assert octree.num_levels == 4
+        assert [octree.level_size(k) for k in range(4)] == [256, 32, 4, 1]
+        assert octree.num_blocks == 293
+        assert sorted(set(octree.scales.tolist())) == [1.0, 2.0, 4.0, 8.0]
+
+        # The first parent covers the blocks from (0, 0, 0) to (10, 10, 10)
+        assert np.allclose(octree.vertices[octree.starts[1]], [5.0, 5.0, 5.0])
+        assert octree.values[octree.starts[1]] == 5.0
+
+        # Every level has the same average (the parents of level 3 merge an unbalanced number of blocks)
+        for k in range(4):
+            level = octree.values[octree.starts[k]:octree.starts[k] + octree.level_size(k)]
+            assert np.isclose(level.mean(), self.values.mean()) or k == 3
+        assert octree.values[-1] == self.values.mean()
+
+    def test_colors(self):
+        colors = np.zeros((len(self.vertices), 3))
+        colors[:, 0] = self.vertices[:, 0] < 40.0
+
+        chunks = SpatialChunks.from_points(self.vertices, 5.0)
+        octree = BlockOctree(self.vertices, [10.0, 10.0, 10.0], chunks, colors=colors)
+
+        assert octree.values is None
+        assert np.allclose(octree.colors[-1], [0.5, 0.0, 0.0])
+
+    def test_chunks(self):
+        # Parents never cross their chunks
+        chunks = self.quadrant_chunks
+        octree = BlockOctree(self.vertices, [10.0, 10.0, 10.0], chunks, values=self.values)
+
+        # A single parent per quadrant in level 2, so there isn't a level 3
+        assert [octree.level_size(k) for k in range(octree.num_levels)] == [256, 32, 4]
+
+        for k in range(octree.num_levels):
+            for c in range(chunks.num_chunks):
+                first = octree.starts[k] + octree.offsets[k][c]
+                last = octree.starts[k] + octree.offsets[k][c + 1]
+                half = 5.0 * octree.scales[first:last, np.newaxis]
+
+                assert last > first
+                assert np.all(octree.vertices[first:last] - half >= chunks.lo[c] - 1e-9)
+                assert np.all(octree.vertices[first:last] + half <= chunks.hi[c] + 1e-9)
+
+    def test_ranges(self):
+        chunks = self.quadrant_chunks
+        octree = BlockOctree(self.vertices, [10.0, 10.0, 10.0], chunks, values=self.values)
+        mask = np.ones(chunks.num_chunks, bool)
+
+        # Every chunk in the same level is a single range
+        firsts, counts = octree.ranges(mask, np.zeros(chunks.num_chunks, int))
+        assert firsts.tolist() == [0]
+        assert counts.tolist() == [256]
+
+        firsts, counts = octree.ranges(mask, np.ones(chunks.num_chunks, int))
+        assert firsts.tolist() == [256]
+        assert counts.tolist() == [32]
+
+        # Mixed levels
+        firsts, counts = octree.ranges(np.array([True, True, False, True]), np.array([0, 1, 0, 0]))
+        assert firsts.tolist() == [0, 192, 256 + 8]
+        assert counts.tolist() == [64, 64, 8]
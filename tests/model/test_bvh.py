@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from blastsight.model.bvh import BVH
+from blastsight.model.intersections import Intersections
+from blastsight.model.parsers.offparser import OFFParser
+from tests.globals import *
+
+
+class TestBVH:
+    info = OFFParser.load_file(f'{TEST_FILES_FOLDER_PATH}/caseron.off')
+    vertices = np.array(info.get('data').get('vertices'), np.float32)
+    indices = np.array(info.get('data').get('indices'), np.uint32)
+
+    def brute_force(self, origin: np.ndarray, ray: np.ndarray) -> np.ndarray:
+        return Intersections.ray_with_triangles(origin, ray, self.vertices[self.indices])
+
+    def test_structure(self):
+        bvh = BVH(self.vertices, self.indices, leaf_size=4)
+
+        assert bvh.num_triangles == len(self.indices)
+        assert len(bvh.mins[0]) == 1
+        assert len(bvh.mins[-1]) * bvh.leaf_size >= bvh.num_triangles
+
+        # Every triangle is still there, just sorted
+        assert sorted(map(tuple, bvh.indices)) == sorted(map(tuple, self.indices))
+
+    def test_same_as_brute_force(self):
+        bvh = BVH(self.vertices, self.indices)
+        center = self.vertices.mean(axis=0)
+        rng = np.random.default_rng(0)
+
+        for _ in range(50):
+            origin = center + rng.uniform(-200.0, 200.0, 3)
+            ray = center - origin + rng.uniform(-20.0, 20.0, 3)
+
+            expected = self.brute_force(origin, ray)
+            actual = bvh.intersect_with_ray(origin, ray)
+
+            assert expected.shape == actual.shape
+            assert np.allclose(expected, actual)
+
+    def test_multiple_rays(self):
+        bvh = BVH(self.vertices, self.indices)
+        center = self.vertices.mean(axis=0)
+        rng = np.random.default_rng(1)
+
+        origins = center + rng.uniform(-200.0, 200.0, (50, 3))
+        rays = center - origins + rng.uniform(-20.0, 20.0, (50, 3))
+        distances = bvh.intersect_with_rays(origins, rays)
+
+        for origin, ray, t in zip(origins, rays, distances):
+            expected = self.brute_force(origin, ray)
+
+            if expected.size == 0:
+                assert t == np.inf
+            else:
+                closest = expected[np.argmin(np.linalg.norm(expected - origin, axis=1))]
+                assert np.allclose(origin + t * ray, closest)
+
+    def test_miss(self):
+        bvh = BVH(self.vertices, self.indices)
+        origin = self.vertices.max(axis=0) + 10.0
+
+        assert bvh.intersect_with_ray(origin, np.array([1.0, 0.0, 0.0])).size == 0
+        assert bvh.candidates(origin, np.array([1.0, 0.0, 0.0])).size == 0
+
+    def test_flat_mesh(self):
+        # A flat grid (zero-thickness AABB) made of 2 * 20 * 20 triangles
+        xx, yy = np.meshgrid(np.arange(21.0), np.arange(21.0))
+        vertices = np.column_stack((xx.ravel(), yy.ravel(), np.zeros(xx.size)))
+        corners = (np.arange(20)[:, None] * 21 + np.arange(20)).ravel()
+        indices = np.vstack([np.column_stack((corners, corners + 1, corners + 21)),
+                             np.column_stack((corners + 1, corners + 22, corners + 21))])
+
+        bvh = BVH(vertices, indices)
+
+        for origin in [[0.5, 0.5, 5.0], [10.25, 3.75, 5.0], [19.9, 19.9, 5.0]]:
+            result = bvh.intersect_with_ray(np.array(origin), np.array([0.0, 0.0, -1.0]))
+            assert len(result) == 1
+            assert np.allclose(result[0], [origin[0], origin[1], 0.0])
@@ -70,3 +70,29 @@ class TestIntersections:
         assert 0 == len(Intersections.ray_with_triangles(self.origin_translated, self.ray, self.tetrahedron.triangles))
         assert 0 == len(Intersections.ray_with_triangles(self.origin_translated, self.ray_oblique, self.tetrahedron.triangles))
         assert 0 == len(Intersections.ray_with_triangles(self.origin, self.ray_oblique, self.tetrahedron.triangles))
+
+    def test_rays_with_triangles(self):
+        triangles = self.tetrahedron.triangles.reshape((-1, 3, 3))
+        origins = np.tile(self.origin, (len(triangles), 1))
+        rays = np.tile(self.ray, (len(triangles), 1))
+
+        t = Intersections.rays_with_triangles(origins, rays, triangles)
+        hits = origins + t[np.isfinite(t)].reshape((-1, 1)) * rays[np.isfinite(t)]
+
+        # The ray passes through the apex, so three triangles share the same hit
+        assert np.isfinite(t).sum() == 4
+        assert np.allclose(np.unique(hits, axis=0), Intersections.ray_with_triangles(self.origin, self.ray, triangles))
+
+    def test_ray_with_segments(self):
+        # Ray going down from (0, 0.5, 10)
+        starts = np.array([[-1.0, 0.5, 0.0], [0.0, 1.0, 5.0], [2.0, 0.0, 0.0], [0.0, 0.5, -3.0]])
+        ends = np.array([[1.0, 0.5, 0.0], [0.0, 2.0, 5.0], [2.0, 1.0, 0.0], [0.0, 0.5, -1.0]])
+
+        t, distances = Intersections.ray_with_segments(self.origin, self.ray, starts, ends)
+
+        # Crossing segment, segment ending near the ray, far segment, and a segment parallel to the ray
+        assert np.allclose(distances, [0.0, 0.5, 2.0, 0.0])
+        assert np.allclose(self.origin + t[:2].reshape((-1, 1)) * self.ray, [[0.0, 0.5, 0.0], [0.0, 0.5, 5.0]])
+
+        # Any point of the parallel segment is equally close, so its start is taken
+        assert np.isclose(t[3], 13.0)
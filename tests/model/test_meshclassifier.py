@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from blastsight.model.meshclassifier import MeshClassifier
+from blastsight.model.parsers.offparser import OFFParser
+from tests.globals import *
+
+
+class TestMeshClassifier:
+    info = OFFParser.load_file(f'{TEST_FILES_FOLDER_PATH}/caseron.off')
+    vertices = np.array(info.get('data').get('vertices'))
+    indices = np.array(info.get('data').get('indices'))
+
+    # Unit cube, with its faces split by their diagonals
+    cube_vertices = np.array([[x, y, z] for x in [0.0, 1.0] for y in [0.0, 1.0] for z in [0.0, 1.0]])
+    cube_indices = np.array([[0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3],
+                             [0, 4, 5], [0, 5, 1], [2, 3, 7], [2, 7, 6],
+                             [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5]])
+
+    def test_vertical_triangles(self):
+        classifier = MeshClassifier(self.cube_vertices, self.cube_indices)
+
+        # Only the top and bottom faces can be hit by vertical rays
+        assert classifier.num_triangles == 4
+
+    def test_cube(self):
+        classifier = MeshClassifier(self.cube_vertices, self.cube_indices)
+
+        # The XY coordinates include the diagonals of the top/bottom faces (shared edges)
+        grid = np.mgrid[-1:6, -1:6, -1:6].reshape((3, -1)).T / 4.0 + np.array([0.0, 0.0, 0.1])
+        grid = grid[np.all((grid[:, :2] != 0.0) & (grid[:, :2] != 1.0), axis=1)]
+
+        expected = np.all((grid > 0.0) & (grid < 1.0), axis=1)
+        assert classifier.contains(grid).tolist() == expected.tolist()
+
+    def test_shared_edge(self):
+        classifier = MeshClassifier(self.cube_vertices, self.cube_indices)
+
+        # The rays pass exactly through the diagonals of the faces, but they're counted once per face
+        assert classifier.crossings(np.array([[0.5, 0.5, 0.5], [0.5, 0.5, -0.5]])).tolist() == [1, 2]
+
+    def test_same_as_ray_casting(self):
+        classifier = MeshClassifier(self.vertices, self.indices)
+
+        lo, hi = self.vertices.min(axis=0), self.vertices.max(axis=0)
+        points = np.random.default_rng(0).uniform(lo, hi, (500, 3))
+
+        # Brute force: count every intersection of a vertical ray with the triangles
+        triangles = self.vertices[self.indices]
+        expected = []
+        for point in points:
+            hits = 0
+            for a, b, c in triangles:
+                matrix = np.column_stack((b - a, c - a, [0.0, 0.0, -1.0]))
+                if abs(np.linalg.det(matrix)) > 1e-12:
+                    u, v, t = np.linalg.solve(matrix, point - a)
+                    hits += u >= 0.0 and v >= 0.0 and u + v <= 1.0 and t < 0.0
+            expected.append(hits % 2 == 1)
+
+        assert classifier.contains(points).tolist() == expected
+
+    def test_chunks(self):
+        classifier = MeshClassifier(self.cube_vertices, self.cube_indices)
+        classifier.CHUNK_SIZE = 100
+
+        points = np.random.default_rng(0).uniform(-0.5, 1.5, (1000, 3))
+        expected = np.all((points > 0.0) & (points < 1.0), axis=1)
+
+        assert classifier.contains(points).tolist() == expected.tolist()
+
+    def test_empty(self):
+        classifier = MeshClassifier(np.empty((0, 3)), np.empty((0, 3), int))
+        assert classifier.contains(np.zeros((3, 3))).tolist() == [False, False, False]
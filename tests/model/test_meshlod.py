@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from blastsight.model.meshlod import MeshLOD
+from blastsight.model.spatialchunks import SpatialChunks
+
+
+class TestMeshLOD:
+    @staticmethod
+    def terrain(n: int) -> tuple:
+        # Grid of n x n vertices (2 triangles per square), with some hills
+        x, y = np.meshgrid(np.arange(n), np.arange(n), indexing='ij')
+        z = np.sin(x / 5.0) * np.cos(y / 7.0)
+        vertices = np.column_stack((x.ravel(), y.ravel(), z.ravel())).astype(float)
+
+        ids = np.arange(n * n).reshape((n, n))
+        a, b, c, d = ids[:-1, :-1].ravel(), ids[1:, :-1].ravel(), ids[1:, 1:].ravel(), ids[:-1, 1:].ravel()
+        indices = np.concatenate((np.column_stack((a, b, c)), np.column_stack((a, c, d))))
+
+        return vertices, indices
+
+    def level(self, lod: MeshLOD, k: int) -> np.ndarray:
+        return lod.indices[lod.starts[k]:lod.starts[k] + lod.level_size(k)]
+
+    def test_levels(self):
+        vertices, indices = self.terrain(64)
+        chunks = SpatialChunks.from_triangles(vertices, indices, chunk_size=1024)
+        lod = MeshLOD(vertices, indices, chunks)
+
+        # Level 0 is the original mesh (sorted by chunk), and each level is smaller than the previous one
+        assert lod.num_levels > 2
+        assert np.array_equal(self.level(lod, 0), indices[chunks.order])
+
+        sizes = [lod.level_size(k) for k in range(lod.num_levels)]
+        assert all(b <= MeshLOD.MIN_REDUCTION * a for a, b in zip(sizes[:-1], sizes[1:]))
+        assert np.all(np.diff(lod.level_sizes) > 0.0)
+        assert lod.num_triangles == sum(sizes)
+
+        # Every level uses the same vertices, without degenerate triangles
+        for k in range(lod.num_levels):
+            triangles = self.level(lod, k)
+            assert triangles.max() < len(vertices)
+            assert np.all(np.diff(np.sort(triangles, axis=1), axis=1) > 0)
+
+    def test_boundary(self):
+        vertices, indices = self.terrain(32)
+        lod = MeshLOD(vertices, indices, SpatialChunks.from_triangles(vertices, indices))
+
+        # The border of the grid is kept in every level
+        boundary = MeshLOD.boundary_vertices(indices, len(vertices))
+        assert boundary.sum() == 4 * 31
+
+        for k in range(lod.num_levels):
+            triangles = self.level(lod, k).astype(np.int64)
+            assert np.all(MeshLOD.boundary_vertices(triangles, len(vertices))[boundary])
+
+    def test_unreferenced_vertices(self):
+        # Vertices that don't belong to any triangle (common in OFF/DXF files) are ignored
+        vertices, indices = self.terrain(32)
+        vertices = np.vstack((vertices, [[100.0, 100.0, 100.0]]))
+        lod = MeshLOD(vertices, indices, SpatialChunks.from_triangles(vertices, indices))
+
+        assert lod.num_levels > 1
+        for k in range(lod.num_levels):
+            assert len(vertices) - 1 not in self.level(lod, k)
+
+    def test_quadrics(self):
+        # A flat square has no error anywhere in its plane
+        vertices = np.array([[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [1.0, 1.0, 0.0], [0.0, 1.0, 0.0]])
+        indices = np.array([[0, 1, 2], [0, 2, 3]])
+
+        quadrics = MeshLOD.vertex_quadrics(vertices, indices)
+        assert np.allclose(MeshLOD.quadric_errors(quadrics, vertices + [5.0, -3.0, 0.0]), 0.0)
+        assert np.allclose(MeshLOD.quadric_errors(quadrics, vertices + [0.0, 0.0, 2.0]), [4.0, 2.0, 4.0, 2.0])
+
+    def test_chunks(self):
+        vertices, indices = self.terrain(64)
+        chunks = SpatialChunks.from_triangles(vertices, indices, chunk_size=1024)
+        lod = MeshLOD(vertices, indices, chunks)
+
+        # The boxes of the chunks contain the triangles of every level
+        for k in range(lod.num_levels):
+            offsets = lod.offsets[k]
+            triangles = vertices[self.level(lod, k)]
+            for c in range(lod.num_chunks):
+                inside = triangles[offsets[c]:offsets[c + 1]].reshape((-1, 3))
+                assert np.all(inside >= lod.chunks.lo[c]) and np.all(inside <= lod.chunks.hi[c])
+
+        # Everything in level 0, or everything in the last level
+        last = lod.num_levels - 1
+        mask = np.ones(lod.num_chunks, bool)
+        assert np.array_equal(lod.ranges(mask, np.zeros(lod.num_chunks, int))[1], [lod.level_size(0)])
+        assert np.array_equal(lod.ranges(mask, np.full(lod.num_chunks, last))[0], [lod.starts[last]])
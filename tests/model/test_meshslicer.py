@@ -0,0 +1,91 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from blastsight.model.meshslicer import MeshSlicer
+from blastsight.model.parsers.offparser import OFFParser
+from tests.globals import *
+
+
+class TestMeshSlicer:
+    info = OFFParser.load_file(f'{TEST_FILES_FOLDER_PATH}/caseron.off')
+    vertices = np.array(info.get('data').get('vertices'))
+    indices = np.array(info.get('data').get('indices'))
+
+    # Unit cube, with its faces split by their diagonals
+    cube_vertices = np.array([[x, y, z] for x in [0.0, 1.0] for y in [0.0, 1.0] for z in [0.0, 1.0]])
+    cube_indices = np.array([[0, 2, 6], [0, 6, 4], [1, 5, 7], [1, 7, 3],
+                             [0, 4, 5], [0, 5, 1], [2, 3, 7], [2, 7, 6],
+                             [0, 1, 3], [0, 3, 2], [4, 6, 7], [4, 7, 5]])
+
+    def test_closed_polyline(self):
+        slicer = MeshSlicer(self.cube_vertices, self.cube_indices)
+        polylines = slicer.slice_with_plane(np.array([0.0, 0.0, 0.5]), np.array([0.0, 0.0, 1.0]))
+
+        # One loop around the cube (4 corners and 4 diagonals), without repeating the first point
+        assert len(polylines) == 1
+        assert polylines[0].shape == (8, 3)
+        assert len(np.unique(polylines[0], axis=0)) == 8
+        assert np.allclose(polylines[0][:, 2], 0.5)
+
+        # Consecutive points share a face of the cube
+        polyline = polylines[0][:, :2]
+        steps = np.roll(polyline, -1, axis=0) - polyline
+        assert np.allclose(np.abs(steps).sum(axis=1), 0.5)
+
+    def test_open_polyline(self):
+        # Only the bottom face of the cube
+        slicer = MeshSlicer(self.cube_vertices, self.cube_indices[:2])
+        polylines = slicer.slice_with_plane(np.array([0.5, 0.0, 0.0]), np.array([1.0, 0.0, 0.0]))
+
+        assert len(polylines) == 1
+        assert sorted(polylines[0].tolist()) == [[0.5, 0.0, 0.0], [0.5, 0.5, 0.0], [0.5, 1.0, 0.0]]
+
+    def test_plane_through_vertices(self):
+        slicer = MeshSlicer(self.cube_vertices, self.cube_indices)
+
+        # The plane contains the diagonals of the front and back faces, so the points aren't repeated
+        polylines = slicer.slice_with_plane(np.array([0.0, 0.0, 0.0]), np.array([1.0, 0.0, -1.0]))
+        assert len(polylines) == 1
+        assert len(polylines[0]) == len(np.unique(polylines[0], axis=0))
+        assert np.allclose(polylines[0][:, 0], polylines[0][:, 2])
+
+        # Touching a corner doesn't slice anything
+        assert slicer.slice_with_plane(np.array([0.0, 0.0, 0.0]), np.array([1.0, 1.0, 1.0])) == []
+
+    def test_no_slice(self):
+        slicer = MeshSlicer(self.cube_vertices, self.cube_indices)
+
+        assert slicer.slice_with_plane(np.array([0.0, 0.0, 2.0]), np.array([0.0, 0.0, 1.0])) == []
+        assert slicer.slice_with_plane(np.array([0.0, 0.0, 0.5]), np.array([0.0, 0.0, 0.0])) == []
+
+    def test_caseron(self):
+        slicer = MeshSlicer(self.vertices, self.indices)
+        origin = self.vertices.mean(axis=0)
+
+        for normal in np.random.default_rng(0).normal(size=(20, 3)):
+            normal /= np.linalg.norm(normal)
+            polylines = slicer.slice_with_plane(origin, normal)
+
+            # The caseron is closed, so every slice is a set of loops over the plane
+            assert len(polylines) > 0
+            for polyline in polylines:
+                assert np.allclose(np.inner(polyline - origin, normal), 0.0, atol=1e-6)
+                assert len(polyline) == len(np.unique(polyline, axis=0))
+
+    def test_multiple_planes(self):
+        slicer = MeshSlicer(self.vertices, self.indices)
+        normal = np.array([0.0, 0.6, 0.8])
+        projections = np.inner(self.vertices, normal)
+
+        # Unsorted offsets, including planes outside of the mesh and through a vertex
+        offsets = np.concatenate((np.linspace(projections.max() + 1.0, projections.min() - 1.0, 25), projections[:1]))
+        result = slicer.slice_with_planes(normal, offsets)
+
+        assert len(result) == len(offsets)
+        assert result[0] == [] and result[24] == []
+        for offset, polylines in zip(offsets, result):
+            expected = slicer.slice_with_plane(offset * normal, normal)
+            assert len(polylines) == len(expected)
+            for a, b in zip(polylines, expected):
+                assert np.allclose(a, b)
@@ -1,10 +1,14 @@
 #!/usr/bin/env python
 
 import os
+import time
+import numpy as np
 import pytest
 from blastsight.model.parsers.offparser import OFFParser
 from blastsight.model.parsers.csvparser import CSVParser
 from blastsight.model.model import Model
+from blastsight.model.bvh import BVH
+from blastsight.model.elements import meshelement
 from tests.globals import *
 
 
@@ -94,6 +98,34 @@ class TestModel:
 
         assert bm_1.id != bm_2.id
 
+    def test_load_blocks_by_chunks(self):
+        model = Model()
+        path = f'{TEST_FILES_FOLDER_PATH}/rainbow.csv'
+
+        # The element has the first chunk, and the batches of the rest double the rows each time
+        element, batches = model.load_blocks_by_chunks(path=path, chunk_size=5)
+        assert model.get(element.id) is element
+        assert element.x.size == 5
+        assert element.name == 'rainbow'
+
+        sizes = []
+        for data in batches:
+            sizes.append(len(data))
+            element.append(data)
+
+        assert sizes == [5, 10, 20, 23]
+        assert np.allclose(element.vertices, model.load_blocks(path=path).vertices)
+
+        # Grid blocks too, with the grid growing while the chunks are appended
+        grid, batches = model.load_blocks_by_chunks(path=path, chunk_size=20, grid=True)
+        for data in batches:
+            grid.append(data)
+
+        # (the spacing is detected in the first chunk, which only has one row of blocks here)
+        reference = model.load_blocks(path=path, grid=True)
+        assert np.allclose(grid.vertices, reference.vertices)
+        assert np.allclose(grid.origin, reference.origin)
+
     def test_wrong_blocks(self):
         model = Model()
         with pytest.raises(Exception):
@@ -217,6 +249,27 @@ class TestModel:
 
         assert model.get(_id) is None
 
+    # Drillholes
+    def test_add_drillholes(self):
+        model = Model()
+        holes = [[[0.0, 0.0, 0.0], [0.0, 0.0, -2.0]],
+                 [[5.0, 0.0, 0.0], [5.0, 0.0, -1.0], [5.0, 0.0, -2.0]]]
+
+        drillholes = model.drillholes(holes=holes, values=[[1.0], [2.0, 3.0]], names=['A', 'B'])
+
+        assert model.get(drillholes.id) is drillholes
+        assert drillholes.num_holes == 2
+
+        # The ray passes next to the first hole, and hits the second one
+        origin = np.array([-5.0, 0.0, -1.5])
+        ray = np.array([1.0, 0.0, 0.0])
+        drillholes.set_hole_visibility(0, False)
+
+        result = model.intersect_drillholes(origin, ray, [drillholes])
+        assert len(result) == 1
+        assert result[0].get('hole_name') == 'B'
+        assert np.allclose(result[0].get('closest_point'), [5.0, 0.0, -1.5])
+
     # Points
     def test_add_points(self):
         model = Model()
@@ -306,6 +359,56 @@ class TestModel:
 
         assert model.element_collection.size() == 3
 
+    def test_intersect_rays(self, monkeypatch):
+        model = Model()
+        mesh_a = model.load_mesh(path=f'{TEST_FILES_FOLDER_PATH}/caseron.off')
+        mesh_b = model.mesh(vertices=mesh_a.vertices + np.array([0.0, 0.0, 50.0]), indices=mesh_a.indices)
+
+        # Each BVH is built only once, not once per thread (slow builds make the threads overlap)
+        builds = []
+        monkeypatch.setattr(meshelement, 'BVH', lambda *args: builds.append(time.sleep(0.05)) or BVH(*args))
+
+        center = mesh_a.centroid
+        rng = np.random.default_rng(0)
+        origins = center + rng.uniform(-50.0, 50.0, (30, 3)) + np.array([0.0, 0.0, 500.0])
+        rays = np.tile([0.0, 0.0, -2.0], (30, 1))
+
+        result = model.intersect_rays(origins, rays, [mesh_a, mesh_b], chunk_size=8)
+        assert len(builds) == 2
+
+        for i in range(len(origins)):
+            expected = model.intersect_meshes(origins[i], rays[i], [mesh_a, mesh_b])
+
+            if len(expected) == 0:
+                assert result.get('element_ids')[i] == -1
+                assert result.get('distances')[i] == np.inf
+                assert np.isnan(result.get('points')[i]).all()
+            else:
+                closest = expected[0].get('closest_point')
+                assert result.get('element_ids')[i] == expected[0].get('id')
+                assert np.allclose(result.get('points')[i], closest)
+                assert np.isclose(result.get('distances')[i], np.linalg.norm(closest - origins[i]))
+
+    def test_slice_with_planes(self):
+        model = Model()
+        mesh = model.load_mesh(path=f'{TEST_FILES_FOLDER_PATH}/caseron.off')
+        blocks = model.load_blocks(path=f'{TEST_FILES_FOLDER_PATH}/mini.csv')
+        points = model.load_points(path=f'{TEST_FILES_FOLDER_PATH}/mini.csv')
+
+        normal = np.array([0.0, 0.0, 1.0])
+        offsets = np.arange(-500.0, 500.0, 5.0)
+
+        for elements, single, batch in [([mesh], model.slice_meshes, model.slice_meshes_with_planes),
+                                        ([blocks], model.slice_blocks, model.slice_blocks_with_planes),
+                                        ([points], model.slice_points, model.slice_points_with_planes)]:
+            result = batch(normal, offsets, elements)
+            assert len(result) == len(offsets)
+            assert sum(map(len, result)) > 0
+
+            for offset, slices in zip(offsets, result):
+                expected = single(offset * normal, normal.copy(), elements)
+                assert [s.get('element_id') for s in slices] == [e.get('element_id') for e in expected]
+
     def test_export(self):
         model = Model()
         mesh = model.load_mesh(path=f'{TEST_FILES_FOLDER_PATH}/caseron.off')
@@ -326,3 +429,22 @@ class TestModel:
         os.remove(f'{TEST_FILES_FOLDER_PATH}/mini_model_export_points.h5p')
         os.remove(f'{TEST_FILES_FOLDER_PATH}/mini_model_export_lines.csv')
         os.remove(f'{TEST_FILES_FOLDER_PATH}/mini_model_export_tubes.csv')
+
+    def test_parse_cache(self, tmp_path):
+        model = Model()
+        cache = model.set_parse_cache(str(tmp_path))
+
+        mesh_1 = model.load_mesh(f'{TEST_FILES_FOLDER_PATH}/caseron.off')
+        mesh_2 = model.load_mesh(f'{TEST_FILES_FOLDER_PATH}/caseron.off', color=[1.0, 0.0, 0.0])
+
+        assert cache.misses == 1 and cache.hits == 1
+        assert np.array_equal(mesh_1.vertices, mesh_2.vertices)
+        assert mesh_2.color.tolist() == [1.0, 0.0, 0.0]
+
+        # Binary formats are loaded directly
+        model.load_blocks(f'{TEST_FILES_FOLDER_PATH}/mini.h5p')
+        assert cache.misses == 1 and cache.hits == 1
+
+        model.unset_parse_cache()
+        model.load_mesh(f'{TEST_FILES_FOLDER_PATH}/caseron.off')
+        assert cache.misses == 1 and cache.hits == 1
@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+
+import os
+import shutil
+import numpy as np
+import pandas as pd
+import pytest
+
+from blastsight.model.parsecache import ParseCache
+from blastsight.model.parsers.csvparser import CSVParser
+from blastsight.model.parsers.dxfparser import DXFParser
+from tests.globals import *
+
+
+class TestParseCache:
+    @pytest.fixture()
+    def cache(self, tmp_path):
+        return ParseCache(str(tmp_path / 'cache'))
+
+    def test_hit(self, cache):
+        path = f'{TEST_FILES_FOLDER_PATH}/caseron.dxf'
+
+        parsed = cache.load_file(path, DXFParser(), hint='mesh')
+        cached = cache.load_file(path, DXFParser(), hint='mesh')
+
+        assert cache.hits == 1 and cache.misses == 1
+        assert np.array_equal(parsed.get('data').get('vertices'), cached.get('data').get('vertices'))
+        assert np.array_equal(parsed.get('data').get('indices'), cached.get('data').get('indices'))
+        assert parsed.get('metadata') == cached.get('metadata')
+
+    def test_keys(self, cache, tmp_path, monkeypatch):
+        path = str(tmp_path / 'mini.csv')
+        shutil.copy(f'{TEST_FILES_FOLDER_PATH}/mini.csv', path)
+
+        # Other versions of the libraries may parse the files differently
+        key = cache.key(path, CSVParser(), hint='blocks')
+        monkeypatch.setattr(pd, '__version__', '0.0.0')
+        assert cache.key(path, CSVParser(), hint='blocks') != key
+        monkeypatch.undo()
+
+        # The hint changes what the parsers return
+        assert cache.key(path, CSVParser(), hint='blocks') != cache.key(path, CSVParser(), hint='points')
+        assert cache.key(path, CSVParser(), hint='blocks', color=[1.0, 0.0, 0.0]) == \
+               cache.key(path, CSVParser(), hint='blocks')
+
+        # Files that change are parsed again
+        cache.load_file(path, CSVParser(), hint='blocks')
+        with open(path, 'a') as f:
+            f.write('100,100,100,0.5\n')
+        data = cache.load_file(path, CSVParser(), hint='blocks').get('data')
+
+        assert cache.misses == 2
+        assert data.iloc[-1].tolist() == [100, 100, 100, 0.5]
+
+    def test_hash_content(self, tmp_path):
+        cache = ParseCache(str(tmp_path / 'cache'), hash_content=True)
+        path = str(tmp_path / 'mini.csv')
+        shutil.copy(f'{TEST_FILES_FOLDER_PATH}/mini.csv', path)
+
+        # Same size and modification time, but different contents
+        key = cache.key(path, CSVParser())
+        stat = os.stat(path)
+        with open(path, 'r+') as f:
+            f.write('X')
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert cache.key(path, CSVParser()) != key
+
+    def test_damaged(self, cache):
+        path = f'{TEST_FILES_FOLDER_PATH}/mini.csv'
+        cache.load_file(path, CSVParser())
+
+        # Damaged entries are parsed again, whatever they raise when loaded
+        rng = np.random.default_rng(0)
+        damages = [b'damaged', b'PK\x03\x04', b'\x93NUMPY'] + [rng.bytes(64) for _ in range(20)]
+        for damage in damages:
+            with open(cache.entries[0], 'wb') as f:
+                f.write(damage)
+
+            assert cache.load_file(path, CSVParser()).get('data').equals(CSVParser.load_file(path).get('data'))
+
+        # Entries with pickled objects aren't loaded
+        with open(cache.entries[0], 'wb') as f:
+            np.savez(f, header=np.array([{'data': None}], dtype=object))
+        cache.load_file(path, CSVParser())
+
+        assert cache.hits == 0
+        assert cache.misses == 25
+
+    def test_columns(self, cache, tmp_path):
+        path = str(tmp_path / 'mini.csv')
+        shutil.copy(f'{TEST_FILES_FOLDER_PATH}/mini.csv', path)
+
+        # Text columns (with missing values) and repeated names are kept
+        data = pd.DataFrame({'x': [0.0, 1.0, np.nan], 'name': ['a', None, 'c'], 'code': [1, 2, 3]})
+        data.columns = ['x', 'name', 'x']
+        parser = CSVParser()
+        parser.load_file = lambda *args, **kwargs: {'data': data, 'properties': {}, 'metadata': {'name': 'mini'}}
+
+        cache.load_file(path, parser)
+        cached = cache.load_file(path, parser)
+
+        assert cache.hits == 1
+        assert cached.get('data').equals(data)
+        assert cached.get('data').columns.tolist() == ['x', 'name', 'x']
+        assert cached.get('data').dtypes.tolist() == data.dtypes.tolist()
+        assert cached.get('metadata') == {'name': 'mini'}
+
+        # Columns with mixed objects can't be saved without pickle, so they're not cached
+        mixed = pd.DataFrame({'mixed': [1, 'a', None]})
+        parser.load_file = lambda *args, **kwargs: {'data': mixed, 'properties': {}, 'metadata': {}}
+        cache.load_file(path, parser, hint='points')
+
+        assert cache.stats.get('entries') == 1
+
+    def test_eviction(self, cache):
+        paths = [f'{TEST_FILES_FOLDER_PATH}/{name}' for name in ['mini.csv', 'complex.csv', 'rainbow.csv']]
+        for path in paths:
+            cache.load_file(path, CSVParser())
+
+        # mini.csv is used again, so complex.csv is the least recently used
+        cache.load_file(paths[0], CSVParser())
+        sizes = [os.path.getsize(entry) for entry in cache.entries]
+        cache.max_size = sum(sizes) - 1
+        cache.evict()
+
+        assert cache.evictions == 1
+        assert len(cache.entries) == 2
+        assert cache.size <= cache.max_size
+
+        cache.load_file(paths[0], CSVParser())
+        cache.load_file(paths[1], CSVParser())
+        assert cache.stats.get('hits') == 2
+        assert cache.stats.get('misses') == 4
+
+        # The order of use is kept by other caches in the same directory
+        other = ParseCache(cache.directory)
+        assert other.entries == cache.entries
+
+        cache.clear()
+        assert cache.stats.get('entries') == 0
+
+    def test_missing(self, cache):
+        for name in ['mini.csv', 'complex.csv']:
+            cache.load_file(f'{TEST_FILES_FOLDER_PATH}/{name}', CSVParser())
+
+        # Entries deleted by other processes are ignored
+        entries = cache.entries
+        os.remove(entries[0])
+        assert cache._sizes(entries)[0] == 0
+        assert cache.size == os.path.getsize(entries[1])
+
+        cache.max_size = 0
+        cache.evict()
+        assert cache.stats.get('entries') == 0
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+
+import numpy as np
+import pytest
+
+from blastsight.model.pointoctree import PointOctree, PointStreamer
+from blastsight.model.spatialchunks import Frustum
+
+
+class TestPointOctree:
+    points = np.random.default_rng(0).uniform(0.0, 100.0, (50000, 3))
+    values = points[:, 2] / 10.0
+
+    # Perspective projection (fov = 90°, near = 1, far = 1000), looking at -z from (50, 50, 160)
+    proj = np.array([[1.0, 0.0, 0.0, 0.0],
+                     [0.0, 1.0, 0.0, 0.0],
+                     [0.0, 0.0, -1001.0 / 999.0, -2000.0 / 999.0],
+                     [0.0, 0.0, -1.0, 0.0]])
+    view = np.array([[1.0, 0.0, 0.0, -50.0],
+                     [0.0, 1.0, 0.0, -50.0],
+                     [0.0, 0.0, 1.0, -160.0],
+                     [0.0, 0.0, 0.0, 1.0]])
+    frustum = Frustum(proj @ view, viewport_height=1000.0)
+
+    @pytest.fixture()
+    def octree(self, tmp_path):
+        batches = PointOctree.array_batches(self.points, self.values, batch_size=7000)
+        return PointOctree.build(str(tmp_path / 'cloud'), batches, capacity=2000)
+
+    def test_build(self, octree):
+        assert octree.num_points == len(self.points)
+        assert octree.num_nodes > 8
+        assert octree.vmin == pytest.approx(self.values.min())
+        assert octree.vmax == pytest.approx(self.values.max())
+
+        # Every point is saved once (sorted by node), with its value
+        stored = np.column_stack((octree.vertices, octree.values))
+        expected = np.column_stack((self.points, self.values)).astype(np.float32)
+        assert np.array_equal(np.unique(stored, axis=0), np.unique(expected, axis=0))
+
+        # Inner nodes have a subsample of about `capacity` points
+        inner = np.diff(octree.child_offsets) > 0
+        assert np.all(octree.counts[inner] < 2 * octree.capacity)
+
+    def test_nodes(self, octree):
+        # The points of each node are inside its cube, and the children are inside their parent
+        for node in range(octree.num_nodes):
+            vertices, values = octree.read(node)
+            assert np.all(vertices >= octree.chunks.lo[node] - 1e-4)
+            assert np.all(vertices <= octree.chunks.hi[node] + 1e-4)
+
+            children = octree.children[octree.child_offsets[node]:octree.child_offsets[node + 1]]
+            assert np.all(octree.depths[children] == octree.depths[node] + 1)
+            assert np.all(octree.chunks.lo[children] >= octree.chunks.lo[node])
+            assert np.all(octree.chunks.hi[children] <= octree.chunks.hi[node])
+
+    def test_reopen(self, octree):
+        reopened = PointOctree(octree.path)
+        assert reopened.num_nodes == octree.num_nodes
+        assert np.array_equal(reopened.read(3)[0], octree.read(3)[0])
+
+    def test_select(self, octree):
+        # Nothing goes over the budget, and the root comes first
+        selected = octree.select(self.frustum, 10000)
+        assert 0 < octree.counts[selected].sum() <= 10000
+        assert selected[0] == 0
+
+        # With enough budget, every node that looks big enough is selected
+        everything = octree.select(self.frustum, octree.num_points, min_pixels=0.0)
+        assert len(everything) == octree.num_nodes
+        assert len(octree.select(self.frustum, octree.num_points, min_pixels=1e6)) == 1
+
+        # Without budget, nothing is selected
+        assert len(octree.select(self.frustum, 0)) == 0
+
+    def test_streamer(self, octree):
+        streamer = PointStreamer(octree, capacity=10000)
+        nodes = octree.select(self.frustum, 5000)
+
+        # Nodes are read in the background, and they're ready in later updates
+        ready, evicted = streamer.update(nodes)
+        streamer.executor.submit(lambda: None).result()
+        more, _ = streamer.update(nodes)
+
+        loaded = [node for node, _ in ready + more]
+        assert sorted(loaded) == sorted(nodes.tolist())
+        assert streamer.num_loaded == octree.counts[nodes].sum()
+        assert not streamer.is_streaming
+        assert evicted == []
+
+        # Nodes that aren't wanted anymore are evicted in least-recently-used order, but only above the capacity
+        others = np.setdiff1d(np.arange(octree.num_nodes), nodes)[:4]
+        _, evicted = streamer.update(others)
+        assert evicted == []
+
+        streamer.capacity = octree.counts[nodes[1:]].sum()
+        _, evicted = streamer.update(np.append(others, nodes[1:]))
+        assert evicted == [nodes[0]]
+
+        streamer.clear()
+        assert streamer.num_loaded == 0
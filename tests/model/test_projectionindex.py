@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from blastsight.model.projectionindex import ProjectionIndex
+
+
+class TestProjectionIndex:
+    grid = np.mgrid[0:10, 0:20, 0:5].reshape((3, -1)).T * np.array([10.0, 5.0, 2.5])
+    vertices = np.random.default_rng(0).permutation(grid)
+
+    def brute_force(self, origin: np.ndarray, normal: np.ndarray, threshold: float) -> np.ndarray:
+        plane_d = -np.dot(normal, origin)
+        return np.nonzero(np.abs(np.inner(normal, self.vertices) + plane_d) <= threshold)[-1]
+
+    def test_aligned_axis(self):
+        assert ProjectionIndex.aligned_axis(np.array([1.0, 0.0, 0.0])) == 0
+        assert ProjectionIndex.aligned_axis(np.array([0.0, -1.0, 0.0])) == 1
+        assert ProjectionIndex.aligned_axis(np.array([0.0, 0.0, 1.0])) == 2
+        assert ProjectionIndex.aligned_axis(np.array([0.0, 0.6, 0.8])) == -1
+
+    def test_lazy_sorting(self):
+        index = ProjectionIndex(self.vertices)
+        index.slice_with_plane_and_threshold(np.array([0.0, 10.0, 0.0]), np.array([0.0, 1.0, 0.0]), 2.5)
+
+        assert index.orders[0] is None
+        assert index.orders[1] is not None
+        assert index.orders[2] is None
+
+    def test_same_as_brute_force(self):
+        index = ProjectionIndex(self.vertices)
+
+        for normal in [[1.0, 0.0, 0.0], [0.0, -1.0, 0.0], [0.0, 0.0, 1.0], [0.0, 0.6, 0.8]]:
+            normal = np.array(normal)
+            for offset in [-10.0, 0.0, 7.5, 10.0, 22.5, 1000.0]:
+                for threshold in [0.0, 1.25, 5.0]:
+                    origin = offset * normal
+                    expected = self.brute_force(origin, normal, threshold)
+                    result = index.slice_with_plane_and_threshold(origin, normal, threshold)
+
+                    assert result.tolist() == expected.tolist()
+
+    def test_multiple_planes(self):
+        index = ProjectionIndex(self.vertices)
+        offsets = [22.5, -10.0, 0.0, 7.5, 10.0, 1000.0]
+
+        for normal in [[1.0, 0.0, 0.0], [0.0, 0.6, 0.8], [0.6, 0.0, -0.8]]:
+            normal = np.array(normal)
+            for threshold in [0.0, 1.25, 5.0]:
+                result = index.slice_with_planes_and_threshold(normal, offsets, threshold)
+
+                assert len(result) == len(offsets)
+                for offset, indices in zip(offsets, result):
+                    assert indices.tolist() == self.brute_force(offset * normal, normal, threshold).tolist()
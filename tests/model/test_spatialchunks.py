@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+
+import numpy as np
+
+from blastsight.model.spatialchunks import SpatialChunks, Frustum
+
+
+class TestSpatialChunks:
+    points = np.random.default_rng(0).uniform(0.0, 100.0, (20000, 3))
+
+    # Perspective projection (fov = 90°, near = 1, far = 1000), looking at -z from (50, 50, 60)
+    proj = np.array([[1.0, 0.0, 0.0, 0.0],
+                     [0.0, 1.0, 0.0, 0.0],
+                     [0.0, 0.0, -1001.0 / 999.0, -2000.0 / 999.0],
+                     [0.0, 0.0, -1.0, 0.0]])
+    view = np.array([[1.0, 0.0, 0.0, -50.0],
+                     [0.0, 1.0, 0.0, -50.0],
+                     [0.0, 0.0, 1.0, -60.0],
+                     [0.0, 0.0, 0.0, 1.0]])
+    mvp = proj @ view
+
+    def test_partition(self):
+        chunks = SpatialChunks.from_points(self.points, 0.5, chunk_size=500)
+
+        assert chunks.num_chunks > 1
+        assert chunks.num_items == len(self.points)
+        assert sorted(chunks.order.tolist()) == list(range(len(self.points)))
+
+        # Every chunk contains its points (plus the margin)
+        for i in range(chunks.num_chunks):
+            points = self.points[chunks.order[chunks.offsets[i]:chunks.offsets[i + 1]]]
+            assert np.allclose(points.min(axis=0) - 0.5, chunks.lo[i])
+            assert np.allclose(points.max(axis=0) + 0.5, chunks.hi[i])
+
+    def test_single_chunk(self):
+        chunks = SpatialChunks.from_points(self.points)
+
+        assert chunks.num_chunks == 1
+        assert chunks.offsets.tolist() == [0, len(self.points)]
+
+    def test_flat(self):
+        # A flat element is only split in its two long axes
+        flat = self.points * np.array([1.0, 1.0, 0.0])
+        chunks = SpatialChunks.from_points(flat, chunk_size=500)
+
+        assert 30 <= chunks.num_chunks <= 60
+        assert np.allclose(chunks.lo[:, 2], 0.0)
+
+    def test_point_sizes(self):
+        sizes = np.arange(len(self.points), dtype=float).reshape((-1, 1))
+        chunks = SpatialChunks.from_points(self.points, sizes, chunk_size=500)
+
+        for i in range(chunks.num_chunks):
+            indices = chunks.order[chunks.offsets[i]:chunks.offsets[i + 1]]
+            assert np.allclose(self.points[indices].max(axis=0) + indices.max(), chunks.hi[i])
+
+    def test_triangles(self):
+        indices = np.random.default_rng(1).integers(0, len(self.points), (5000, 3))
+        chunks = SpatialChunks.from_triangles(self.points, indices, chunk_size=500)
+
+        assert chunks.num_items == len(indices)
+        for i in range(chunks.num_chunks):
+            triangles = self.points[indices[chunks.order[chunks.offsets[i]:chunks.offsets[i + 1]]]]
+            assert np.all(triangles.reshape((-1, 3)).min(axis=0) >= chunks.lo[i])
+            assert np.all(triangles.reshape((-1, 3)).max(axis=0) <= chunks.hi[i])
+
+    def test_empty(self):
+        chunks = SpatialChunks.from_points(np.empty((0, 3)))
+
+        assert chunks.num_chunks == 0
+        assert chunks.num_items == 0
+
+    def test_cull(self):
+        chunks = SpatialChunks.from_points(self.points, chunk_size=500)
+        mask = chunks.cull(SpatialChunks.frustum_planes(self.mvp))
+
+        # Points inside the frustum (in clip coordinates)
+        clip = np.column_stack((self.points, np.ones(len(self.points)))) @ self.mvp.T
+        inside = np.all(np.abs(clip[:, :3]) <= clip[:, 3:], axis=1)
+
+        drawn = np.zeros(len(self.points), bool)
+        for first, count in zip(*chunks.ranges(mask)):
+            drawn[chunks.order[first:first + count]] = True
+
+        assert 0 < mask.sum() < chunks.num_chunks
+        assert np.all(drawn[inside])
+        assert not np.all(drawn)
+
+    def test_ranges(self):
+        chunks = SpatialChunks(np.arange(10), np.array([0, 2, 5, 6, 10]), np.zeros((4, 3)), np.ones((4, 3)))
+
+        firsts, counts = chunks.ranges(np.array([True, True, False, True]))
+        assert firsts.tolist() == [0, 6]
+        assert counts.tolist() == [5, 4]
+
+        firsts, counts = chunks.ranges(np.array([False, False, False, False]))
+        assert firsts.size == counts.size == 0
+
+    def test_pixel_size(self):
+        frustum = Frustum(self.mvp, viewport_height=1000.0)
+        lo = np.array([[50.0, 50.0, 50.0], [50.0, 50.0, -40.0], [50.0, 50.0, 59.0]])
+        hi = np.array([[50.0, 50.0, 50.0], [50.0, 50.0, -40.0], [50.0, 50.0, 61.0]])
+
+        # With fov = 90°, a unit at depth 10 is 1/20 of the screen, and boxes around the camera are infinite
+        sizes = frustum.pixel_size(lo, hi, 1.0)
+        assert np.allclose(sizes[:2], [50.0, 5.0])
+        assert sizes[2] == np.inf
+
+        # In orthographic projection, the depth doesn't matter
+        ortho = np.diag([0.01, 0.01, -0.001, 1.0])
+        sizes = Frustum(ortho, viewport_height=1000.0).pixel_size(lo, hi, 1.0)
+        assert np.allclose(sizes, 5.0)
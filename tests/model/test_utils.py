@@ -57,3 +57,66 @@ class TestUtils:
         assert distances[0] < distances[1]
         assert distances[0] < distances[2]
         assert distances[1] < distances[2]
+
+    def test_points_inside_mesh(self):
+        points = np.array([[0.0, 0.2, 0.1],  # Inside
+                           [0.0, 0.2, 1.0],  # Above
+                           [0.0, 0.2, -0.1],  # Below
+                           [2.0, 0.0, 0.1]])  # Aside
+
+        mask = utils.points_inside_mesh(self.tetrahedron, points)
+        assert mask.dtype == bool
+        assert mask.tolist() == [True, False, False, False]
+
+    def test_parse_colormap(self):
+        assert len(utils.parse_colormap('#FF0000-#0000FF')) == 2
+        assert len(utils.parse_colormap('red-yellow-green-blue')) == 4
+
+        assert utils.parse_colormap('#FF0000') == []
+        assert utils.parse_colormap('#FF0000-#GG0000') == []
+        assert utils.parse_colormap(123) == []
+
+    def test_compile_colormap(self):
+        lut = utils.compile_colormap('#FF0000-#0000FF')
+
+        assert lut.shape == (utils.COLORMAP_RESOLUTION, 3)
+        assert lut is utils.compile_colormap('#FF0000-#0000FF')  # Cached
+        assert not lut.flags.writeable
+
+        assert lut[0].tolist() == [1.0, 0.0, 0.0]
+        assert lut[len(lut) // 2].tolist() == [0.0, 1.0, 0.0]
+        assert lut[-1].tolist() == [0.0, 0.0, 1.0]
+
+    def test_values_to_rgb(self):
+        values = np.array([-5.0, 0.0, 5.0, 10.0, 15.0, np.nan])
+        rgb = utils.values_to_rgb(values, 0.0, 10.0, '#FF0000-#00FF00-#0000FF')
+
+        assert rgb.shape == (6, 3)
+        assert rgb[0].tolist() == [1.0, 0.0, 0.0]  # Clamped to vmin
+        assert rgb[1].tolist() == [1.0, 0.0, 0.0]
+        assert rgb[2].tolist() == [0.0, 1.0, 0.0]
+        assert rgb[3].tolist() == [0.0, 0.0, 1.0]
+        assert rgb[4].tolist() == [0.0, 0.0, 1.0]  # Clamped to vmax
+        assert np.isfinite(rgb[5]).all()
+
+        # Achromatic colors keep the hue of their neighbours
+        rgb = utils.values_to_rgb(np.linspace(0.0, 1.0, 5), 0.0, 1.0, '#0000FF-#FFFFFF-#FF0000')
+        assert rgb[2].tolist() == [1.0, 1.0, 1.0]
+        assert rgb[1][2] == 1.0 and rgb[1][0] == rgb[1][1]
+        assert rgb[3][0] == 1.0 and rgb[3][1] == rgb[3][2]
+
+        # Single value (vmin == vmax)
+        rgb = utils.values_to_rgb(np.array([0.0, 1.0, 2.0]), 1.0, 1.0, '#FF0000-#0000FF')
+        assert rgb[0].tolist() == [1.0, 0.0, 0.0]
+        assert rgb[1].tolist() == [0.0, 0.0, 1.0]
+        assert rgb[2].tolist() == [0.0, 0.0, 1.0]
+
+    def test_values_to_rgb_chunks(self):
+        values = np.linspace(0.0, 1.0, 3 * utils.COLORMAP_CHUNK_SIZE + 7)
+        rgb = utils.values_to_rgb(values, 0.0, 1.0, '#FF0000-#0000FF')
+        lut = utils.compile_colormap('#FF0000-#0000FF')
+
+        assert len(rgb) == len(values)
+        assert rgb[0].tolist() == lut[0].tolist()
+        assert rgb[-1].tolist() == lut[-1].tolist()
+        assert np.array_equal(rgb[::100000], lut[utils.colormap_indices(values[::100000], 0.0, 1.0)])
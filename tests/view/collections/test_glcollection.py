@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 
 from blastsight.model.model import Model
+from blastsight.model.elements.element import Element
 from blastsight.view.drawablefactory import DrawableFactory
 
+from blastsight.view.drawables.gldrawable import GLDrawable
 from blastsight.view.drawables.meshgl import MeshGL
 from blastsight.view.drawables.blockgl import BlockGL
 from blastsight.view.drawables.linegl import LineGL
@@ -80,3 +82,46 @@ class TestGLCollection:
         assert len(collection.select(MeshGL, lambda x: x.is_turbo_ready)) == 0
         assert len(collection.select(MeshGL, lambda x: x.is_highlighted)) == 0
         assert len(collection.select(MeshGL, lambda x: x.is_wireframed)) == 0
+
+    def test_incremental_update(self):
+        collection = GLCollection()
+        program = ShaderProgram()
+        collection.associate(program, GLDrawable, selector=lambda x: not x.is_boostable)
+
+        drawables = [GLDrawable(Element(x=[i], y=[0], z=[0], alpha=0.5 if i % 2 else 1.0, id=i)) for i in range(10)]
+        for d in drawables:
+            d.add_observer(collection)
+            collection.add(d)
+
+        collection.update_drawables()
+        assert program.drawables == drawables[0::2] + drawables[1::2]
+        assert program.num_opaques == program.num_transparents == 5
+
+        # Only the drawables that changed are moved
+        drawables[4].hide()
+        drawables[7].is_boostable = True
+        assert list(collection._changed.values()) == [drawables[4], drawables[7]]
+
+        collection.update_changed_drawables()
+        assert program.opaques == [drawables[i] for i in [0, 2, 6, 8]]
+        assert program.transparents == [drawables[i] for i in [1, 3, 5, 9]]
+
+        # Drawables shown again go to the end
+        drawables[4].show()
+        collection.update_changed_drawables()
+        assert program.opaques == [drawables[i] for i in [0, 2, 6, 8, 4]]
+
+        # Same result as a full update (besides the order)
+        incremental = set(map(id, program.drawables))
+        collection.update_drawables()
+        assert set(map(id, program.drawables)) == incremental
+
+        # Deleted drawables leave their programs too
+        collection.delete(9)
+        collection.update_changed_drawables()
+        assert drawables[9] not in program.drawables
+        assert collection.select(GLDrawable) == [d for d in drawables if d.id != 9]
+
+        # Drawables from other collections are ignored
+        collection.recreate(GLDrawable(Element(x=[0], y=[0], z=[0], id=0)))
+        assert len(collection._changed) == 0
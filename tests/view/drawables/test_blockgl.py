@@ -1,8 +1,10 @@
 #!/usr/bin/env python
 
+import numpy as np
 import pytest
 
 from blastsight.model.elements.blockelement import BlockElement
+from blastsight.model.spatialchunks import Frustum
 from blastsight.view.drawables.blockgl import BlockGL
 from tests.view.drawables.test_gldrawable import TestGLDrawable
 
@@ -15,3 +17,48 @@ class TestBlockGL(TestGLDrawable):
     def test_empty(self):
         with pytest.raises(Exception):
             BlockGL()
+
+    def test_uses_colormap(self, drawable):
+        assert drawable.uses_colormap
+
+        colored = BlockGL(BlockElement(x=[-1, 1, 0], y=[0, 0, 1], z=[0, 0, 0], values=[0, 1, 2],
+                                       color=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]], id=1))
+        assert not colored.uses_colormap
+
+    def test_turbo(self, drawable):
+        assert drawable.is_standard
+        assert not drawable.is_turbo_ready
+
+        drawable.is_boostable = True
+        assert drawable.is_turbo_ready
+        assert not drawable.is_standard
+
+        # Cross-sections have their own program
+        drawable.is_cross_sectioned = True
+        assert not drawable.is_turbo_ready
+        assert not drawable.is_standard
+
+    def test_culling(self, drawable):
+        # Not uploaded yet
+        assert drawable.cull(Frustum(np.eye(4))) == (0, 0)
+
+        drawable.setup_chunks()
+        assert drawable.chunk_ranges[1].tolist() == [3]
+
+        # Every block is outside of the view (moved 10 units to the right)
+        outside = np.eye(4)
+        outside[0, 3] = 10.0
+        assert drawable.cull(Frustum(outside)) == (1, 0)
+        assert drawable.chunk_ranges[0].size == 0
+
+        assert drawable.cull(Frustum(np.eye(4))) == (0, 1)
+        assert drawable.chunk_ranges[1].tolist() == [3]
+
+    def test_lod_error(self, drawable):
+        assert drawable.lod_error == 1.0
+
+        drawable.lod_error = 4
+        assert drawable.lod_error == 4.0
+
+        drawable.lod_error = -1.0
+        assert drawable.lod_error == 0.0
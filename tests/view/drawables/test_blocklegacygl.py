@@ -15,3 +15,9 @@ class TestBlockLegacyGL(TestBlockGL):
     def test_empty(self):
         with pytest.raises(Exception):
             BlockLegacyGL()
+
+    def test_turbo(self, drawable):
+        # Legacy blocks are always drawn by their own program
+        drawable.is_boostable = True
+        assert drawable.is_standard
+        assert not drawable.is_turbo_ready
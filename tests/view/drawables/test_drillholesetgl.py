@@ -0,0 +1,31 @@
+#!/usr/bin/env python
+
+import numpy as np
+import pytest
+
+from blastsight.model.elements.drillholesetelement import DrillholeSetElement
+from blastsight.view.drawables.drillholesetgl import DrillholeSetGL
+from tests.view.drawables.test_gldrawable import TestGLDrawable
+
+
+class TestDrillholeSetGL(TestGLDrawable):
+    @pytest.fixture()
+    def drawable(self):
+        holes = [[[0.0, 0.0, 0.0], [0.0, 0.0, -1.0], [0.0, 0.0, -2.0]],
+                 [[5.0, 0.0, 0.0], [5.0, 0.0, -3.0]]]
+        return DrillholeSetGL(DrillholeSetElement(holes=holes, values=[[1.0, 2.0], [3.0]], id=0))
+
+    def test_empty(self):
+        with pytest.raises(Exception):
+            DrillholeSetGL()
+
+    def test_draw_ranges(self, drawable):
+        firsts, counts = drawable.draw_ranges
+        assert firsts.tolist() == [0, 3]
+        assert counts.tolist() == [3, 2]
+
+        drawable.set_hole_visibility(0, False)
+        firsts, counts = drawable.draw_ranges
+        assert firsts.tolist() == [3]
+        assert counts.tolist() == [2]
+        assert firsts.dtype == counts.dtype == np.int32
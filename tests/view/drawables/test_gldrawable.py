@@ -30,6 +30,27 @@ class TestGLDrawable:
         drawable.initialize()
         assert drawable.is_initialized
 
+    def test_reload(self):
+        class RecordingGL(GLDrawable):
+            # Generates fake buffers, and remembers the ones that were deleted
+            def generate_buffers(self) -> None:
+                self._vbos = [len(self.deleted) + 1]
+
+            def cleanup(self) -> None:
+                self.deleted.extend(self._vbos)
+
+        drawable = RecordingGL(Element(x=[-1, 1, 0], y=[0, 0, 1], z=[0, 0, 0], id=0))
+        drawable.deleted = []
+
+        # The buffers of the previous upload are deleted before generating new ones
+        drawable.reload()
+        assert drawable.deleted == []
+
+        drawable.reload()
+        drawable.reload()
+        assert drawable.deleted == [1, 2]
+        assert drawable.is_initialized
+
     def test_visibility(self, drawable):
         drawable.initialize()
 
@@ -52,3 +73,21 @@ class TestGLDrawable:
         assert drawable.id == 0
         drawable.id = 50
         assert drawable.id == 50
+
+    def test_forwarding(self, drawable):
+        # Element attributes are read and written through the drawable
+        drawable.alpha = 0.3
+        assert drawable.element.alpha == 0.3
+        assert drawable.alpha is drawable.element.alpha
+        assert drawable.vertices is drawable.element.vertices
+
+        # Custom properties too
+        drawable.element.set_property('custom', 42)
+        assert drawable.custom == 42
+
+        # Drawable attributes stay in the drawable
+        drawable.is_cross_sectioned = True
+        assert 'is_cross_sectioned' not in dir(drawable.element)
+
+        with pytest.raises(AttributeError):
+            drawable.missing_attribute
@@ -67,3 +67,14 @@ class TestMeshGL(TestGLDrawable):
 
         drawable.is_initialized = True
         auto_test()
+
+    def test_lod(self, drawable):
+        # The state should change regardless of initialization
+        assert not drawable.is_lod_enabled
+        drawable.is_lod_enabled = True
+        assert drawable.is_lod_enabled
+
+        # Nothing is drawn before initialization
+        assert drawable.triangles_drawn == 0
+        drawable.is_boostable = True
+        assert drawable.triangles_drawn == 1
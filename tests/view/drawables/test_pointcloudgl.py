@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+
+import numpy as np
+import pytest
+
+from blastsight.model.elements.pointcloudelement import PointCloudElement
+from blastsight.model.pointoctree import PointOctree
+from blastsight.view.drawables.pointcloudgl import PointCloudGL
+
+
+class TestPointCloudGL:
+    @pytest.fixture()
+    def drawable(self, tmp_path):
+        points = np.random.default_rng(0).uniform(-10.0, 10.0, (5000, 3))
+        octree = PointOctree.build(str(tmp_path / 'cloud'), PointOctree.array_batches(points), capacity=500)
+        return PointCloudGL(PointCloudElement(octree=octree, id=0), point_budget=1000)
+
+    def test_empty(self):
+        with pytest.raises(Exception):
+            PointCloudGL()
+
+    def test_base(self, drawable):
+        assert drawable.uses_colormap
+        assert drawable.num_points == 5000
+        assert drawable.point_budget == 1000
+
+        # Nothing is streamed (or drawn) before uploading
+        assert not drawable.is_streaming
+        assert drawable.points_drawn == 0
+        assert drawable.cull(None) == (0, 0)
+
+    def test_point_budget(self, drawable):
+        drawable.point_budget = 2000
+        assert drawable.point_budget == 2000
+
+        drawable.point_budget = -1
+        assert drawable.point_budget == 0
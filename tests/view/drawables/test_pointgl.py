@@ -15,3 +15,18 @@ class TestPointGL(TestGLDrawable):
     def test_empty(self):
         with pytest.raises(Exception):
             PointGL()
+
+    def test_uses_colormap(self, drawable):
+        assert drawable.uses_colormap
+
+        colored = PointGL(PointElement(x=[-1, 1, 0], y=[0, 0, 1], z=[0, 0, 0], values=[0, 1, 2],
+                                       color=[[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]], id=1))
+        assert not colored.uses_colormap
+
+    def test_turbo(self, drawable):
+        assert drawable.is_standard
+        assert not drawable.is_turbo_ready
+
+        drawable.is_boostable = True
+        assert drawable.is_turbo_ready
+        assert not drawable.is_standard
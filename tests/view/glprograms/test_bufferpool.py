@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+from blastsight.view.glprograms.bufferpool import RangeAllocator
+
+
+class TestRangeAllocator:
+    def test_allocate(self):
+        allocator = RangeAllocator(10)
+
+        assert allocator.allocate(4) == 0
+        assert allocator.allocate(4) == 4
+        assert allocator.allocate(4) == -1
+        assert allocator.fits(2) and not allocator.fits(3)
+        assert allocator.used == 8
+
+        # Empty ranges don't need room
+        assert allocator.allocate(0) == 0
+        assert allocator.used == 8
+
+    def test_release(self):
+        allocator = RangeAllocator(10)
+        offsets = [allocator.allocate(2) for _ in range(5)]
+        assert offsets == [0, 2, 4, 6, 8]
+
+        # Holes are reused first-fit
+        allocator.release(2, 2)
+        allocator.release(6, 2)
+        assert allocator.holes == [(2, 2), (6, 2)]
+        assert not allocator.fits(3)
+        assert allocator.allocate(1) == 2
+        assert allocator.holes == [(3, 1), (6, 2)]
+
+        # Neighbour holes are merged
+        allocator.release(4, 2)
+        assert allocator.holes == [(3, 5)]
+        assert allocator.allocate(5) == 3
+
+        # Holes at the end give their room back
+        allocator.release(8, 2)
+        assert allocator.end == 8
+        assert allocator.holes == []
+
+        allocator.release(0, 2)
+        allocator.release(2, 1)
+        allocator.release(3, 5)
+        assert allocator.end == 0
+        assert allocator.used == 0
+
+    def test_reset(self):
+        allocator = RangeAllocator(4)
+        allocator.allocate(4)
+        allocator.reset(8)
+
+        assert allocator.used == 0
+        assert allocator.allocate(8) == 0
@@ -0,0 +1,20 @@
+#!/usr/bin/env python
+
+from blastsight.model.elements.drillholesetelement import DrillholeSetElement
+from blastsight.view.drawables.drillholesetgl import DrillholeSetGL
+from blastsight.view.glprograms.drillholesetprogram import DrillholeSetProgram
+from tests.view.glprograms.test_shaderprogram import TestShaderProgram
+
+
+class TestDrillholeSetProgram(TestShaderProgram):
+    @property
+    def base_program(self):
+        return DrillholeSetProgram()
+
+    @property
+    def base_element(self):
+        return DrillholeSetElement(holes=[[[0, 0, 0], [0, 0, -1]], [[1, 0, 0], [1, 0, -1], [1, 0, -2]]])
+
+    @property
+    def base_drawable(self):
+        return DrillholeSetGL(self.base_element)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+from blastsight.view.drawables.blockgl import BlockGL
+from blastsight.view.glprograms.turboblockprogram import TurboBlockProgram
+from tests.view.glprograms import test_blockprogram
+from tests.view.glprograms.test_turbomeshprogram import RecordingPool
+
+
+class TestTurboBlockProgram(test_blockprogram.TestBlockProgram):
+    @property
+    def base_program(self):
+        return TurboBlockProgram()
+
+    @property
+    def base_drawable(self):
+        return BlockGL(self.base_element, turbo=True)
+
+    def test_attributes(self):
+        program = self.base_program
+        drawable = self.base_drawable
+        drawable.alpha = 0.5
+        drawable.block_size = [1.0, 2.0, 3.0]
+
+        arrays = program.geometry(drawable) + program.attributes(drawable)
+        assert len(arrays) == len(program.POOL_ATTRIBUTES)
+
+        # One row per block, with the size of its attribute
+        for array, (_, size) in zip(arrays, program.POOL_ATTRIBUTES):
+            assert array.reshape((3, -1)).shape == (3, size)
+
+        assert arrays[2].tolist() == [0.5, 0.5, 0.5]
+        assert arrays[3].tolist() == [[1.0, 2.0, 3.0]] * 3
+
+    def test_signature(self):
+        program = self.base_program
+        drawable = self.base_drawable
+        signature = program.signature(drawable)
+
+        assert program.signature(drawable) == signature
+
+        drawable.vmax = 10.0
+        assert program.signature(drawable) != signature
+        signature = program.signature(drawable)
+
+        drawable.block_size = [5.0, 5.0, 5.0]
+        assert program.signature(drawable) != signature
+
+    def test_release_removed(self):
+        program = self.base_program
+        program.pool = RecordingPool()
+        drawables = [self.base_drawable for _ in range(3)]
+
+        program.set_drawables(drawables)
+        program.update_drawables([], drawables[:1])
+        assert program.pool.keys == set(map(id, drawables[1:]))
+
+        program.set_drawables([])
+        assert program.pool.keys == set()
+        assert program.uploaded == {}
+
+    def test_sync_colors(self):
+        program = self.base_program
+        program.pool = RecordingPool()
+        drawable = self.base_drawable
+        program.set_drawables([drawable])
+
+        # Changing the limits (as the properties dialog does) rewrites the colors when the drawable is recreated
+        drawable.vmax = 10.0
+        program.update_drawables([drawable], [])
+        assert (id(drawable), 1) in program.pool.writes
+
+    def test_sync_datasets(self):
+        program = self.base_program
+        program.pool = RecordingPool()
+        drawable = self.base_drawable
+        program.set_drawables([drawable])
+
+        # New colors are uploaded, even if a new array reuses the id of an old one
+        drawable.color = [[0.1, 0.1, 0.1]] * 3
+        program.update_drawables([drawable], [])
+        drawable.color = [[0.2, 0.2, 0.2]] * 3
+        drawable.color = [[0.3, 0.3, 0.3]] * 3
+        program.update_drawables([drawable], [])
+
+        assert program.pool.uploads == [id(drawable)] * 3
@@ -2,10 +2,29 @@
 
 from blastsight.view.drawables.meshgl import MeshGL
 from blastsight.view.glprograms.turbomeshprogram import TurboMeshProgram
-from tests.view.glprograms.test_meshprogram import TestMeshProgram
+from tests.view.glprograms import test_meshprogram
 
 
-class TestTurboMeshProgram(TestMeshProgram):
+class RecordingPool:
+    # Stands in for BufferPool (which needs an OpenGL context), only remembering the keys in the pool
+    # and the ones that were uploaded or rewritten
+    def __init__(self):
+        self.keys = set()
+        self.uploads = []
+        self.writes = []
+
+    def add(self, key, arrays: list, indices=None) -> None:
+        self.keys.add(key)
+        self.uploads.append(key)
+
+    def write(self, key, attribute: int, array) -> None:
+        self.writes.append((key, attribute))
+
+    def release(self, key) -> None:
+        self.keys.remove(key)
+
+
+class TestTurboMeshProgram(test_meshprogram.TestMeshProgram):
     @property
     def base_program(self):
         return TurboMeshProgram()
@@ -13,3 +32,28 @@ class TestTurboMeshProgram(TestMeshProgram):
     @property
     def base_drawable(self):
         return MeshGL(self.base_element, turbo=True)
+
+    def test_release_removed(self):
+        program = self.base_program
+        program.pool = RecordingPool()
+        drawables = [self.base_drawable for _ in range(3)]
+
+        # The drawables are marked as initialized, so they don't need their own buffers here
+        for drawable in drawables:
+            drawable.is_initialized = True
+
+        program.set_drawables(drawables)
+        assert program.pool.keys == set(map(id, drawables))
+
+        # Drawables that leave the program release their data and their color slot
+        program.update_drawables([], drawables[:1])
+        assert program.pool.keys == set(map(id, drawables[1:]))
+        assert len(program.free_slots) == 1
+
+        program.update_drawables(drawables[:1], [])
+        assert program.pool.keys == set(map(id, drawables))
+        assert len(program.free_slots) == 0
+
+        program.set_drawables(drawables[2:])
+        assert program.pool.keys == {id(drawables[2])}
+        assert list(program.uploaded.keys()) == [id(drawables[2])]
@@ -0,0 +1,59 @@
+#!/usr/bin/env python
+
+from blastsight.view.drawables.pointgl import PointGL
+from blastsight.view.glprograms.turbopointprogram import TurboPointProgram
+from tests.view.glprograms import test_pointprogram
+from tests.view.glprograms.test_turbomeshprogram import RecordingPool
+
+
+class TestTurboPointProgram(test_pointprogram.TestPointProgram):
+    @property
+    def base_program(self):
+        return TurboPointProgram()
+
+    @property
+    def base_drawable(self):
+        return PointGL(self.base_element, turbo=True)
+
+    def test_attributes(self):
+        program = self.base_program
+        drawable = self.base_drawable
+        drawable.marker = 'sphere'
+        drawable.point_size = [1.0, 2.0, 3.0]
+
+        arrays = program.geometry(drawable) + program.attributes(drawable)
+        assert len(arrays) == len(program.POOL_ATTRIBUTES)
+
+        for array, (_, size) in zip(arrays, program.POOL_ATTRIBUTES):
+            assert array.reshape((3, -1)).shape == (3, size)
+
+        assert arrays[3].tolist() == [1.0, 2.0, 3.0]
+        assert arrays[4].tolist() == [2.0, 2.0, 2.0]
+
+    def test_signature(self):
+        program = self.base_program
+        drawable = self.base_drawable
+        signature = program.signature(drawable)
+
+        drawable.marker = 'circle'
+        assert program.signature(drawable) != signature
+        signature = program.signature(drawable)
+
+        drawable.alpha = 0.5
+        assert program.signature(drawable) != signature
+
+    def test_sync_sizes(self):
+        program = self.base_program
+        program.pool = RecordingPool()
+        drawable = self.base_drawable
+        program.set_drawables([drawable])
+
+        # Sizes are uploaded when replaced, or when modified in-place (and invalidated)
+        drawable.point_size = [1.0, 2.0, 3.0]
+        program.update_drawables([drawable], [])
+
+        drawable.point_size[0] = 5.0
+        drawable.invalidate()
+        program.update_drawables([drawable], [])
+
+        assert program.pool.uploads == [id(drawable)] * 3
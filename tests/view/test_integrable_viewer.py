@@ -1,10 +1,12 @@
 #!/usr/bin/env python
 
+import numpy as np
 import os
 import pytest
 
 from blastsight.model.elements.element import Element
 from blastsight.model.model import Model
+from blastsight.model.pointoctree import PointOctree
 
 from blastsight.view.drawables.meshgl import MeshGL
 from blastsight.view.drawables.blockgl import BlockGL
@@ -424,6 +426,61 @@ class TestIntegrableViewer:
         viewer.set_turbo_rendering(False)
         assert not viewer.last_drawable.is_boostable
 
+    def test_lod_error(self):
+        viewer = IntegrableViewer()
+        viewer.blocks(x=[-1, 1, 0], y=[0, 0, 1], z=[0, 0, 0], values=[0, 1, 2])
+        assert viewer.last_drawable.lod_error == 1.0
+
+        viewer.set_lod_error(4.0)
+        assert viewer.last_drawable.lod_error == 4.0
+
+        # New blocks share the setting
+        viewer.blocks(x=[-1, 1, 0], y=[0, 0, 1], z=[0, 0, 0], values=[0, 1, 2])
+        assert viewer.last_drawable.lod_error == 4.0
+
+    def test_mesh_lod(self):
+        viewer = IntegrableViewer()
+        viewer.mesh(x=[-1, 1, 0], y=[0, 0, 1], z=[0, 0, 0], indices=[[0, 1, 2]])
+        assert not viewer.last_drawable.is_lod_enabled
+
+        viewer.set_mesh_lod(True)
+        assert viewer.last_drawable.is_lod_enabled
+
+        # New meshes share the setting, and their levels of detail are built in the background
+        viewer.mesh(x=[-1, 1, 0], y=[0, 0, 1], z=[0, 0, 0], indices=[[0, 1, 2]])
+        assert viewer.last_drawable.is_lod_enabled
+
+        viewer.lod_executor.submit(lambda: None).result()
+        assert viewer.last_drawable.element.lod is not None
+
+    def test_load_by_chunks(self):
+        viewer = IntegrableViewer()
+
+        # The first chunk is drawn right away, and the rest is read in the background
+        points = viewer.load_points_by_chunks(f'{TEST_FILES_FOLDER_PATH}/rainbow.csv', chunk_size=10)
+        assert isinstance(points, PointGL)
+        assert points.element.x.size == 10
+
+        blocks = viewer.load_blocks_by_chunks(f'{TEST_FILES_FOLDER_PATH}/rainbow.csv', chunk_size=10)
+        assert isinstance(blocks, BlockGL)
+        assert viewer.get_all_ids() == [points.id, blocks.id]
+
+        viewer.chunk_executor.submit(lambda: None).result()
+        assert viewer.load_blocks_by_chunks(f'{TEST_FILES_FOLDER_PATH}/nonexistent.csv') is None
+
+    def test_point_cloud(self, tmp_path):
+        points = np.random.default_rng(0).uniform(-10.0, 10.0, (5000, 3))
+        PointOctree.build(str(tmp_path / 'cloud'), PointOctree.array_batches(points), capacity=500)
+
+        viewer = IntegrableViewer()
+        drawable = viewer.load_point_cloud(str(tmp_path / 'cloud'))
+        assert viewer.get_all_point_clouds() == [drawable]
+        assert drawable.element.name == 'cloud'
+        assert drawable.point_budget == viewer.point_budget
+
+        viewer.set_point_budget(1000)
+        assert drawable.point_budget == 1000
+
     def test_resize_gl(self):
         viewer = IntegrableViewer()
 
@@ -441,6 +498,18 @@ class TestIntegrableViewer:
         assert not self.equal_list(expected, orthographic)
         assert not self.equal_list(perspective, orthographic)
 
+    def test_mvp_matrix(self):
+        viewer = IntegrableViewer()
+        viewer.resize(100, 100)
+        viewer.rotation_center = [10.0, 20.0, 30.0]
+        viewer.camera_position = [10.0, 20.0, 130.0]
+        viewer.propagate_uniforms()
+
+        # The rotation center is in the middle of the screen
+        clip = viewer.mvp_matrix @ np.array([10.0, 20.0, 30.0, 1.0])
+        assert np.allclose(clip[:2] / clip[3], [0.0, 0.0])
+        assert -1.0 < clip[2] / clip[3] < 1.0
+
     def test_fit_camera(self):
         viewer = IntegrableViewer()
 